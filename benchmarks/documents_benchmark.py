@@ -0,0 +1,96 @@
+"""
+Compares the construction time and memory usage of the different GoogleDocuments representations
+and the throughput of the DataFrame / Arrow export against building a DataFrame from GoogleDocument objects.
+
+Usage:
+::
+    python benchmarks/documents_benchmark.py [number of documents]
+"""
+import pathlib
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+# The package and the fake Google servers in `tests` are imported from the working tree, no matter where the script is started
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from dash_google_picker.Documents import GoogleDocuments, to_dataframe, to_arrow
+
+def synthetic_documents(count: int) -> List[Dict[str, Any]]:
+    """
+    Creates documents shaped like the ones returned by the Google Picker.
+    """
+    return [
+        {
+            "id": "1{:032d}".format(index),
+            "serviceId": "docs",
+            "mimeType": "application/pdf" if index % 3 else "application/vnd.google-apps.document",
+            "name": "Document {}.pdf".format(index),
+            "description": "",
+            "type": "file",
+            "lastEditedUtc": 1693900000000 + index,
+            "iconUrl": "https://drive-thirdparty.googleusercontent.com/16/type/application/pdf",
+            "url": "https://drive.google.com/file/d/1{:032d}/view?usp=drive_web".format(index),
+            "embedUrl": "https://drive.google.com/file/d/1{:032d}/preview?usp=drive_web".format(index),
+            "sizeBytes": 1024 * index,
+            "parentId": "0AFolder",
+            "isShared": False,
+            "driveSuccess": True,
+            "organizationDisplayName": "Example",
+            "rotation": 0,
+            "rotationDegree": 0,
+        }
+        for index in range(count)
+    ]
+
+def measure(name: str, build: Callable[[], Any], repeat: int = 5) -> None:
+    """
+    Prints the best construction time and the memory retained by the result.
+    """
+    seconds = min(timeit.repeat(build, number=1, repeat=repeat))
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print("{:<10} {:>10.2f} ms {:>12.1f} KiB".format(name, seconds * 1000, retained / 1024))
+
+def dataframe_from_objects(documents: List[Dict[str, Any]]) -> Any:
+    """
+    The per object path: build GoogleDocument objects and convert them row by row.
+    """
+    import pandas
+    frame = pandas.DataFrame([vars(doc) for doc in GoogleDocuments(documents)])
+    frame["lastEditedUtc"] = pandas.to_datetime(frame["lastEditedUtc"], unit="ms", utc=True)
+    frame["sizeBytes"] = frame["sizeBytes"].astype("int64")
+    frame["mimeType"] = frame["mimeType"].astype("category")
+    return frame
+
+def measure_export(name: str, export: Callable[[], Any], count: int, repeat: int = 5) -> None:
+    """
+    Prints the best export time and the throughput in documents per second.
+    """
+    seconds = min(timeit.repeat(export, number=1, repeat=repeat))
+    print("{:<10} {:>10.2f} ms {:>12.0f} docs/s".format(name, seconds * 1000, count / seconds))
+
+def main(count: int) -> None:
+    documents = synthetic_documents(count)
+    print("{} documents".format(count))
+    measure("setattr", lambda: GoogleDocuments(documents))
+    measure("lazy", lambda: GoogleDocuments.lazy(documents))
+    measure("table", lambda: GoogleDocuments.table(documents))
+    try:
+        import pandas  # noqa: F401
+        measure_export("objects", lambda: dataframe_from_objects(documents), count)
+        measure_export("pandas", lambda: to_dataframe(documents), count)
+    except ImportError:
+        print("pandas is not installed, skipping the DataFrame export")
+    try:
+        import pyarrow  # noqa: F401
+        measure_export("arrow", lambda: to_arrow(documents), count)
+    except ImportError:
+        print("pyarrow is not installed, skipping the Arrow export")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
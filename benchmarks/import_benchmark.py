@@ -0,0 +1,104 @@
+"""
+Measures the import time of dash_google_picker and its modules with `python -X importtime`.
+
+Every import runs in a fresh interpreter, the median of several runs is reported. The results can be written to a json file
+and compared with a previous run, the script exits with an error if an import got slower than the allowed regression.
+
+Usage:
+::
+    python benchmarks/import_benchmark.py [--runs 7] [--output import.json] [--baseline previous.json] [--max-regression 0.2]
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+from typing import Dict
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+"""
+The root of the repository, the fresh interpreters run in it so the package is imported from the working tree.
+"""
+
+IMPORTS = {
+    "package": "import dash_google_picker",
+    "Documents": "import dash_google_picker.Documents",
+    "Views": "import dash_google_picker.Views",
+    "Enums": "import dash_google_picker.Enums",
+}
+"""
+The measured statements, the component itself is measured by the `component` entry if it was built.
+"""
+
+COMPONENT_IMPORT = "from dash_google_picker import GooglePicker"
+
+def import_time(statement: str) -> Dict[str, int]:
+    """
+    Runs a statement in a fresh interpreter and returns the cumulative import time in microseconds of every top level import
+    caused by the statement, the imports of the interpreter startup up to `site` are skipped.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], stderr=subprocess.PIPE, universal_newlines=True, check=True,
+                            cwd=str(ROOT))
+    times = {}
+    started = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented, only top level imports contain the time of their children
+        if name.startswith("  "):
+            continue
+        if started:
+            times[name.strip()] = int(cumulative)
+        started = started or name.strip() == "site"
+    return times
+
+def measure(statement: str, runs: int) -> Dict[str, float]:
+    """
+    Returns the median total import time and whether dash was imported.
+    """
+    samples = [import_time(statement) for _ in range(runs)]
+    return {
+        "median_us": statistics.median(sum(times.values()) for times in samples),
+        "imports_dash": "dash" in samples[0],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="The allowed relative slowdown compared to the baseline")
+    args = parser.parse_args()
+
+    statements = dict(IMPORTS)
+    if subprocess.run([sys.executable, "-c", COMPONENT_IMPORT], stderr=subprocess.DEVNULL, cwd=str(ROOT)).returncode == 0:
+        statements["component"] = COMPONENT_IMPORT
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    for name, statement in statements.items():
+        results[name] = measure(statement, args.runs)
+        line = "{:<10} {:>10.1f} ms  imports dash: {}".format(name, results[name]["median_us"] / 1000, results[name]["imports_dash"])
+        if name in baseline:
+            change = results[name]["median_us"] / baseline[name]["median_us"] - 1
+            line += "  ({:+.0%})".format(change)
+            if change > args.max_regression:
+                regressions.append(name)
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    if regressions:
+        sys.exit("Import time regression: {}".format(", ".join(regressions)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark suite for the python hot paths and the path from mounting the GooglePicker to picked documents in a browser.
+
+The python benchmarks construct :class:`~dash_google_picker.Documents.GoogleDocuments` in every representation, serialize shallow and
+deep view trees like dash does and measure the import time. The browser benchmark runs a Dash app in headless Chrome which loads the stand-ins
+for the Google scripts from the local server in `tests/fake_google` with a configurable latency, it needs the built component, `dash[testing]` and a chromedriver.
+
+The results are written as json and can be compared with a previous run, the suite fails if a benchmark got slower than the allowed regression.
+
+Usage:
+::
+    python benchmarks/suite.py [--sizes 10 1000 10000] [--skip-browser] [--latency 0.05] [--output results.json] [--baseline previous.json] [--max-regression 0.2]
+"""
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+# The package and the fake Google servers in `tests` are imported from the working tree, no matter where the script is started
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from plotly.io.json import to_json_plotly
+
+from dash_google_picker.Documents import GoogleDocuments
+from dash_google_picker.Enums import ViewId
+from dash_google_picker.Views import View, ViewGroup
+
+from documents_benchmark import synthetic_documents
+from import_benchmark import IMPORTS, measure as measure_import
+
+SIZES = [10, 1000, 10000]
+"""
+The default number of documents.
+"""
+
+def timing(function: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """
+    Returns the median and minimum time of a single call in seconds, the number of calls per sample is chosen automatically.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    samples = [total / number for total in timer.repeat(repeat, number)]
+    return {"median_s": statistics.median(samples), "min_s": min(samples)}
+
+def view_trees() -> Dict[str, ViewGroup]:
+    """
+    Creates a shallow view tree with many Views in one ViewGroup and a deep view tree of nested ViewGroups.
+    """
+    shallow = ViewGroup(ViewId.DOCS, *[View(ViewId.PDFS, "application/pdf", "report {}".format(index)) for index in range(50)])
+    deep = ViewGroup(ViewId.DOCS, View(ViewId.SPREADSHEETS, "text/csv"))
+    for depth in range(20):
+        deep = ViewGroup(ViewId.DOCS, View(ViewId.PDFS, "application/pdf", "level {}".format(depth)), deep, label="Level {}".format(depth))
+    return {"shallow": shallow, "deep": deep}
+
+def document_benchmarks(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    """
+    Measures the construction of GoogleDocuments in every representation.
+    """
+    results = {}
+    for size in sizes:
+        documents = synthetic_documents(size)
+        for name, create in (
+            ("objects", GoogleDocuments),
+            ("lazy", GoogleDocuments.lazy),
+            ("table", GoogleDocuments.table),
+        ):
+            results["documents.{}[{}]".format(name, size)] = timing(lambda: create(documents))
+    return results
+
+def view_benchmarks() -> Dict[str, Dict[str, float]]:
+    """
+    Measures the serialization of view trees the way dash sends them to the browser.
+    """
+    results = {}
+    for name, tree in view_trees().items():
+        frozen = tree.freeze()
+        results["views.to_json[{}]".format(name)] = timing(lambda: to_json_plotly(tree))
+        results["views.to_json_frozen[{}]".format(name)] = timing(lambda: to_json_plotly(frozen))
+    return results
+
+def import_benchmarks() -> Dict[str, Dict[str, float]]:
+    """
+    Measures the import time of the package and its modules in fresh interpreters.
+    """
+    return {"import.{}".format(name): {"median_s": measure_import(statement, 7)["median_us"] / 1e6} for name, statement in IMPORTS.items()}
+
+def picker_app(script_urls: Dict[str, str]):
+    """
+    Creates a Dash app with a GooglePicker which loads the fake Google scripts from `script_urls`.
+    """
+    from dash import Dash, html, Input, Output
+    from dash_google_picker import GooglePicker
+
+    app = Dash(__name__)
+    app.layout = html.Div([
+        html.Button('Open Google Picker', id='open-picker-button', n_clicks=0),
+        GooglePicker(id='google-picker', client_id='fake-client-id', developer_key='fake-developer-key', script_urls=script_urls),
+        html.Div(id='document-count'),
+    ])
+
+    @app.callback(Output('google-picker', 'open'), Input('open-picker-button', 'n_clicks'), prevent_initial_call=True)
+    def open_picker(n_clicks):
+        return True
+
+    @app.callback(Output('document-count', 'children'), Input('google-picker', 'documents'), prevent_initial_call=True)
+    def count_documents(documents):
+        return str(len(GoogleDocuments(documents)))
+
+    return app
+
+def browser_benchmarks(sizes: List[int], latency: float, runs: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Measures loading the page and the scripts, opening the picker, picking and rendering the picked documents in headless Chrome.
+    """
+    from dash.testing.application_runners import ThreadedRunner
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
+    from tests.fake_google.server import FakeGoogleServer
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    results = {}
+    try:
+        for size in sizes:
+            phases = {}
+            with FakeGoogleServer(latency, size) as server, ThreadedRunner() as runner:
+                runner.start(picker_app(server.script_urls))
+                for _ in range(runs):
+                    driver.get(runner.url)
+                    wait = WebDriverWait(driver, 30, poll_frequency=0.005)
+                    wait.until(lambda driver: driver.execute_script("return window.fakeGoogleTimings && 'api_loaded' in window.fakeGoogleTimings && 'gsi_init' in window.fakeGoogleTimings"))
+                    driver.execute_script("window.fakeGoogleTimings.open = window.performance.now(); document.getElementById('open-picker-button').click();")
+                    wait.until(lambda driver: driver.find_element("id", "document-count").text == str(size))
+                    rendered = driver.execute_script("return window.performance.now()")
+                    timings = driver.execute_script("return window.fakeGoogleTimings")
+                    for phase, duration in (
+                        ("navigation_to_scripts_loaded", max(timings["api_loaded"], timings["gsi_init"])),
+                        ("open_to_picker_visible", timings["picker_visible"] - timings["open"]),
+                        ("picker_visible_to_picked", timings["picked"] - timings["picker_visible"]),
+                        ("picked_to_rendered", rendered - timings["picked"]),
+                    ):
+                        phases.setdefault(phase, []).append(duration / 1000)
+            for phase, samples in phases.items():
+                results["browser.{}[{}]".format(phase, size)] = {"median_s": statistics.median(samples), "min_s": min(samples)}
+    finally:
+        driver.quit()
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], max_regression: float) -> List[str]:
+    """
+    Prints all results with their change to the baseline and returns the names of the benchmarks which got slower than allowed.
+    """
+    regressions = []
+    for name, result in results.items():
+        line = "{:<50} {:>12.3f} ms".format(name, result["median_s"] * 1000)
+        if name in baseline:
+            change = result["median_s"] / baseline[name]["median_s"] - 1
+            line += "  ({:+.0%})".format(change)
+            if change > max_regression:
+                regressions.append(name)
+        print(line)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--skip-browser", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.05, help="The latency of the fake Google scripts in seconds")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="The allowed relative slowdown compared to the baseline")
+    args = parser.parse_args()
+
+    results = {}
+    results.update(document_benchmarks(args.sizes))
+    results.update(view_benchmarks())
+    results.update(import_benchmarks())
+    if not args.skip_browser:
+        results.update(browser_benchmarks(args.sizes, args.latency))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.max_regression)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results}, f, indent=2)
+            f.write("\n")
+    if regressions:
+        sys.exit("Benchmark regression: {}".format(", ".join(regressions)))
+
+if __name__ == "__main__":
+    main()
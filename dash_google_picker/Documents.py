@@ -1,5 +1,37 @@
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Iterator, Sequence, Any, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
+from array import array
+from itertools import chain, repeat
+import importlib
+import sys
+import warnings
+
+from ._instrumentation import instrument_parsing
+
+_DOCUMENT_FIELDS = (
+    'id', 'name', 'mimeType', 'url', 'type', 'serviceId', 'parentId', 'description', 'iconUrl', 'embedUrl', 'organizationDisplayName',
+    'resourceKey', 'uploadState', 'lastEditedUtc', 'sizeBytes', 'rotation', 'rotationDegree', 'isNew', 'isShared', 'driveSuccess', 'thumbnails',
+)
+"""
+The fields of a `Google Picker Document <https://developers.google.com/drive/picker/reference#document>`_ returned for Google Drive files.
+"""
+
+def _closest_field(name: str) -> Optional[str]:
+    import difflib
+    matches = difflib.get_close_matches(name, _DOCUMENT_FIELDS, n=1)
+    return matches[0] if matches else None
+
+class _MissingFieldError(AttributeError):
+    """
+    Raised for a field a document does not have. The closest known field is only looked up when the message is shown,
+    so ``getattr(document, name, None)`` and ``hasattr`` stay as cheap as for any other missing attribute.
+    """
+    def __str__(self) -> str:
+        owner, name = self.args
+        message = "'{}' object has no attribute '{}'".format(owner, name)
+        suggestion = None if name in _DOCUMENT_FIELDS else _closest_field(name)
+        return message + ", did you mean '{}'?".format(suggestion) if suggestion else message
 
 @dataclass
 class GoogleDocument:
@@ -26,6 +58,53 @@ class GoogleDocument:
         for key, value in dict_data.items():
             setattr(self, key, value)
 
+class LazyGoogleDocument(GoogleDocument):
+    """
+    A :class:`~GoogleDocument` which wraps the dictionary returned by the Google Picker without copying it.
+
+    Attributes are resolved from the wrapped dictionary on first access and cached on the object afterwards,
+    so creating the object is independent of the number of fields. Nested values like the `thumbnails` are
+    returned as they were received, exactly like for a regular :class:`~GoogleDocument`. Accessing a missing field raises an
+    :class:`AttributeError` whose message suggests the closest Google document field, e.g. `mimeType` for `mimetype`.
+
+    .. note::
+        This class is not intended to be manually instantiated. Instances of this class are
+        created by :meth:`GoogleDocuments.lazy`.
+
+    :param dict_data: A dictionary representing a Google Document as per the Google Picker API.
+    """
+    __slots__ = ('_payload',)
+
+    def __init__(self, dict_data: Dict[str, Union[str, int, bool]]):
+        self._payload = dict_data
+
+    def __getattr__(self, name: str) -> Any:
+        if name == '_payload':
+            raise AttributeError(name)
+        try:
+            value = self._payload[name]
+        except KeyError:
+            raise _MissingFieldError(type(self).__name__, name) from None
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        names = set(super().__dir__())
+        names.discard('_payload')
+        names.update(self._payload)
+        return sorted(names)
+
+    def __eq__(self, other: Any) -> bool:
+        # The inherited dataclass methods only know the (empty) declared fields, so documents are compared by their data
+        if isinstance(other, LazyGoogleDocument):
+            return self._payload == other._payload
+        if isinstance(other, GoogleDocument):
+            return self._payload == vars(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "LazyGoogleDocument({!r})".format(self._payload)
+
 class GoogleDocuments:
     """
     A class to represent a list of GoogleDocument objects.
@@ -51,8 +130,479 @@ class GoogleDocuments:
         Only data from the Google Picker API returned by the :class:`~GooglePicker` should be passed into this class.
     """
 
+    @instrument_parsing('objects')
     def __new__(cls, documents_data: List[Dict[str, Union[str, int, bool]]]) -> List['GoogleDocument']:
         if documents_data is None:
             return []
         else:
-            return [GoogleDocument(doc) for doc in documents_data]
\ No newline at end of file
+            return [GoogleDocument(doc) for doc in documents_data]
+
+    @staticmethod
+    @instrument_parsing('lazy')
+    def lazy(documents_data: List[Dict[str, Union[str, int, bool]]]) -> List['LazyGoogleDocument']:
+        """
+        Creates a list of :class:`~LazyGoogleDocument` objects which only read the fields that are actually accessed.
+
+        The returned objects behave like :class:`~GoogleDocument` objects, including ``getattr`` and ``dir``.
+
+        :param documents_data: A list of dictionaries as returned by the :class:`~GooglePicker`.
+        :return: A list of :class:`~LazyGoogleDocument` objects.
+        """
+        if documents_data is None:
+            return []
+        return [LazyGoogleDocument(doc) for doc in documents_data]
+
+    @staticmethod
+    @instrument_parsing('table')
+    def table(documents_data: List[Dict[str, Union[str, int, bool]]]) -> 'GoogleDocumentTable':
+        """
+        Creates a columnar :class:`~GoogleDocumentTable` instead of a list of :class:`~GoogleDocument` objects.
+
+        This is recommended for large selections, e.g. when :py:attr:`~Feature.MULTISELECT_ENABLED` is used,
+        since only one container per field is allocated instead of one object per document.
+        Building the table takes longer than creating :class:`~GoogleDocument` objects, about 1.5 times as long for 1000 documents
+        in ``benchmarks/documents_benchmark.py``, so it pays off when memory or whole columns matter, not for a few documents.
+
+        Usage:
+        ::
+            @app.callback(
+                [Input('google-picker', 'documents')],
+                prevent_initial_call=True
+            )
+            def display_output(documents):
+                table = GoogleDocuments.table(documents)
+                pdf_ids = table.filter_mime_type('application/pdf').column('id')
+
+        :param documents_data: A list of dictionaries as returned by the :class:`~GooglePicker`.
+        :return: A :class:`~GoogleDocumentTable` containing all documents.
+        """
+        return GoogleDocumentTable.from_documents(documents_data)
+
+class GoogleDocumentRow:
+    """
+    A lightweight view on a single row of a :class:`~GoogleDocumentTable`.
+
+    Attributes are resolved from the columns of the table on access, nothing is copied.
+    Fields which are missing for this document but present on other documents of the table are returned as `None`,
+    fields which are missing in the whole table raise an :class:`AttributeError` suggesting the closest Google document field.
+
+    .. note::
+        This class is not intended to be manually instantiated. Instances of this class are
+        created by the :class:`~GoogleDocumentTable` class.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'GoogleDocumentTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        # The slots are unset while the row is unpickled or copied, they must not be resolved as columns
+        if name.startswith("_"):
+            raise AttributeError(name)
+        column = self._table._columns.get(name)
+        if column is None:
+            raise _MissingFieldError(type(self).__name__, name)
+        return column[self._index]
+
+    def __dir__(self) -> List[str]:
+        return list(self._table._columns)
+
+    def __repr__(self) -> str:
+        return "GoogleDocumentRow({!r})".format(self.to_dict())
+
+    def __reduce__(self):
+        return GoogleDocumentRow, (self._table, self._index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the row into a dictionary.
+
+        :return: A dictionary with all fields of this row.
+        """
+        return {name: column[self._index] for name, column in self._table._columns.items()}
+
+class GoogleDocumentTable:
+    """
+    A columnar container for documents selected in the Google Picker.
+
+    Every field is stored in a single column. Integer and float fields are stored in compact :class:`array.array` columns,
+    string values are interned so repeated values like the `mimeType` or `serviceId` share the same object.
+    Iterating over the table yields :class:`~GoogleDocumentRow` views.
+
+    .. note::
+        This class is not intended to be manually instantiated. Use :meth:`GoogleDocuments.table` instead.
+
+    :param columns: A dictionary mapping each field name to a column of equal length.
+    :param length: The number of documents in the table.
+    """
+    __slots__ = ('_columns', '_length')
+
+    def __init__(self, columns: Dict[str, Sequence[Any]], length: int):
+        self._columns = columns
+        self._length = length
+
+    @classmethod
+    def from_documents(cls, documents_data: List[Dict[str, Union[str, int, bool]]]) -> 'GoogleDocumentTable':
+        """
+        Builds the table from a list of dictionaries as returned by the :class:`~GooglePicker`.
+
+        :param documents_data: A list of dictionaries representing Google Documents.
+        :return: A new :class:`~GoogleDocumentTable`.
+        """
+        if not documents_data:
+            return cls({}, 0)
+        # map() over dict.get keeps the per document work in C
+        length = len(documents_data)
+        fields = dict.fromkeys(chain.from_iterable(documents_data))
+        columns = {field: _compact_column(list(map(dict.get, documents_data, repeat(field, length)))) for field in fields}
+        return cls(columns, length)
+
+    @property
+    def fields(self) -> List[str]:
+        """
+        The names of all fields present in this table.
+        """
+        return list(self._columns)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        Returns the column of a single field.
+
+        :param name: The name of the field, e.g. `id` or `mimeType`.
+        :return: The column containing the value of this field for every document, missing values are `None`.
+        :raises KeyError: If no document contains this field.
+        """
+        return self._columns[name]
+
+    def select(self, *fields: str) -> 'GoogleDocumentTable':
+        """
+        Projects the table onto the given fields. The columns are shared with this table, nothing is copied.
+
+        :param fields: One or many field names to keep. Fields not present in the table are ignored.
+        :return: A new :class:`~GoogleDocumentTable` containing only the given fields.
+        """
+        return GoogleDocumentTable({field: self._columns[field] for field in fields if field in self._columns}, self._length)
+
+    def filter_mime_type(self, *mime_types: str) -> 'GoogleDocumentTable':
+        """
+        Keeps only the documents with one of the given mimeTypes.
+
+        :param mime_types: One or many mimeTypes, e.g. `application/pdf`.
+        :return: A new :class:`~GoogleDocumentTable` containing only the matching documents.
+        """
+        mime_type_column = self._columns.get('mimeType', ())
+        wanted = frozenset(mime_types)
+        return self._take([index for index, mime_type in enumerate(mime_type_column) if mime_type in wanted])
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Converts the table back into a list of dictionaries.
+
+        :return: A list with one dictionary per document.
+        """
+        return [row.to_dict() for row in self]
+
+    def to_pandas(self) -> 'pandas.DataFrame':
+        """
+        Converts the table into a :class:`pandas.DataFrame`. Requires the optional dependency `pandas`.
+
+        `lastEditedUtc` is converted to a UTC `datetime64` column, `sizeBytes` to `int64` (`Int64` if values are missing)
+        and `mimeType` to a categorical column.
+
+        :return: A DataFrame with one row per document and one column per field.
+        """
+        pandas = _import_optional('pandas', 'pandas')
+        numpy = _import_optional('numpy', 'pandas')
+        data = {}
+        for field, column in self._columns.items():
+            # Array columns contain no missing values and are passed to numpy without copying
+            if isinstance(column, array):
+                column = numpy.asarray(column)
+            if field == 'lastEditedUtc':
+                data[field] = pandas.to_datetime(column, unit='ms', utc=True)
+            elif field == 'sizeBytes':
+                data[field] = pandas.array(column, dtype='int64' if isinstance(column, numpy.ndarray) else 'Int64')
+            elif field == 'mimeType':
+                data[field] = pandas.Categorical(column)
+            else:
+                data[field] = column
+        return pandas.DataFrame(data, index=pandas.RangeIndex(self._length))
+
+    def to_arrow(self) -> 'pyarrow.Table':
+        """
+        Converts the table into a :class:`pyarrow.Table`. Requires the optional dependency `pyarrow`.
+
+        `lastEditedUtc` is converted to a UTC millisecond timestamp column, `sizeBytes` to `int64`
+        and `mimeType` to a dictionary encoded column.
+
+        :return: An Arrow table with one row per document and one column per field.
+        """
+        pyarrow = _import_optional('pyarrow', 'arrow')
+        data = {}
+        for field, column in self._columns.items():
+            if field == 'lastEditedUtc':
+                data[field] = pyarrow.array(column, type=pyarrow.timestamp('ms', tz='UTC'))
+            elif field == 'sizeBytes':
+                data[field] = pyarrow.array(column, type=pyarrow.int64())
+            elif field == 'mimeType':
+                data[field] = pyarrow.array(column, type=pyarrow.string()).dictionary_encode()
+            else:
+                data[field] = pyarrow.array(column)
+        return pyarrow.table(data)
+
+    def _take(self, indices: List[int]) -> 'GoogleDocumentTable':
+        columns = {}
+        for field, column in self._columns.items():
+            if isinstance(column, array):
+                columns[field] = array(column.typecode, [column[index] for index in indices])
+            else:
+                columns[field] = [column[index] for index in indices]
+        return GoogleDocumentTable(columns, len(indices))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[GoogleDocumentRow]:
+        return (GoogleDocumentRow(self, index) for index in range(self._length))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[GoogleDocumentRow, 'GoogleDocumentTable']:
+        if isinstance(index, slice):
+            return self._take(list(range(self._length))[index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("GoogleDocumentTable index out of range")
+        return GoogleDocumentRow(self, index)
+
+    def __repr__(self) -> str:
+        return "GoogleDocumentTable(fields={!r}, length={})".format(self.fields, self._length)
+
+class DocumentChunkAccumulator:
+    """
+    Reassembles the chunks sent by a :class:`~GooglePicker` with a `chunk_size`.
+
+    Every chunk has to be acknowledged by returning :meth:`ack` to the `documents_chunk_ack` property, otherwise
+    the picker does not send the next chunk. Chunks can also be processed incrementally without this class.
+
+    Usage:
+    ::
+        accumulator = DocumentChunkAccumulator()
+
+        @app.callback(
+            [Output('google-picker', 'documents_chunk_ack'), Output('display-documents', 'children')],
+            [Input('google-picker', 'documents_chunk')],
+            prevent_initial_call=True
+        )
+        def receive_chunk(chunk):
+            documents = accumulator.add(chunk)
+            if documents is None:
+                return DocumentChunkAccumulator.ack(chunk), no_update
+            return DocumentChunkAccumulator.ack(chunk), f"Picked {len(documents)} documents"
+
+    .. note::
+        Chunks are kept in the memory of the current process. If the dash app runs with several worker processes,
+        the chunks of a selection might be received by different workers.
+
+    :param max_pending: The maximum number of incomplete selections to keep, the oldest one is dropped first.
+    """
+    def __init__(self, max_pending: int = 16):
+        self.max_pending = max_pending
+        self._selections = OrderedDict()
+
+    @staticmethod
+    def ack(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Creates the acknowledgement for a chunk which has to be returned to the `documents_chunk_ack` property.
+
+        :param chunk: The chunk received from the `documents_chunk` property.
+        :return: The acknowledgement for this chunk.
+        """
+        return {"selection_id": chunk["selection_id"], "sequence": chunk["sequence"]}
+
+    def add(self, chunk: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Adds a chunk to its selection.
+
+        :param chunk: The chunk received from the `documents_chunk` property.
+        :return: All documents of the selection in their original order once every chunk was received, otherwise `None`.
+        """
+        selection_id = chunk["selection_id"]
+        chunks = self._selections.get(selection_id)
+        if chunks is None:
+            chunks = self._selections[selection_id] = {}
+            while len(self._selections) > self.max_pending:
+                self._selections.popitem(last=False)
+        chunks[chunk["sequence"]] = chunk["documents"]
+        if len(chunks) < chunk["total"]:
+            return None
+        del self._selections[selection_id]
+        return [document for sequence in sorted(chunks) for document in chunks[sequence]]
+
+    def discard(self, selection_id: str):
+        """
+        Drops all received chunks of a selection.
+
+        :param selection_id: The `selection_id` of the chunks.
+        """
+        self._selections.pop(selection_id, None)
+
+    @property
+    def pending(self) -> List[str]:
+        """
+        The ids of all selections which are not complete yet.
+        """
+        return list(self._selections)
+
+class DocumentSelection:
+    """
+    A server side selection of documents keyed by their id, which is kept up to date with the changes sent
+    by a :class:`~GooglePicker` with `track_changes` enabled.
+
+    Usage:
+    ::
+        selection = DocumentSelection()
+
+        @app.callback(
+            Output('display-documents', 'children'),
+            [Input('google-picker', 'documents_added'), Input('google-picker', 'documents_removed')],
+            prevent_initial_call=True
+        )
+        def update_selection(documents_added, documents_removed):
+            selection.apply_delta(documents_added, documents_removed)
+            for doc in GoogleDocuments(documents_added):
+                parse_file(doc.id)
+            return f"{len(selection)} documents selected"
+
+    :param documents_data: The documents of the initial selection.
+    """
+    def __init__(self, documents_data: Optional[List[Dict[str, Any]]] = None):
+        self._documents = OrderedDict()
+        self.apply_delta(documents_data, None)
+
+    def apply_delta(self, added: Optional[List[Dict[str, Any]]], removed: Optional[List[Dict[str, Any]]]) -> 'DocumentSelection':
+        """
+        Applies the changes of a pick to this selection. Removed documents are removed before added documents are added.
+
+        :param added: The documents from the `documents_added` property.
+        :param removed: The documents from the `documents_removed` property.
+        :return: This selection.
+        """
+        for document in removed or ():
+            self._documents.pop(document['id'], None)
+        for document in added or ():
+            self._documents[document['id']] = document
+        return self
+
+    @property
+    def documents(self) -> List[Dict[str, Any]]:
+        """
+        All documents of the selection in the order they were added.
+        """
+        return list(self._documents.values())
+
+    @property
+    def ids(self) -> List[str]:
+        """
+        The ids of all documents of the selection.
+        """
+        return list(self._documents)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._documents.values())
+
+def document_fields(*fields: str) -> List[str]:
+    """
+    Declares which fields of the picked documents should be sent from the browser to dash.
+
+    Pass the result to the `document_fields` parameter of the :class:`~GooglePicker`. All other fields, e.g. the
+    thumbnails or embed urls, are dropped in the browser which shrinks the callback payload considerably for large selections.
+
+    Usage:
+    ::
+        DOCUMENT_FIELDS = document_fields('id', 'name', 'mimeType')
+
+        GooglePicker(
+            id='google-picker',
+            client_id='GOOGLE_CLIENT_ID',
+            developer_key='GOOGLE_DEVELOPER_KEY',
+            document_fields=DOCUMENT_FIELDS
+            )
+
+    :param fields: One or many field names of a Google Document, duplicates are removed.
+    :return: A list of field names to pass to the :class:`~GooglePicker`.
+    :raises ValueError: If no field is passed.
+    """
+    if not fields:
+        raise ValueError("At least one document field is required")
+    for field in fields:
+        if field not in _DOCUMENT_FIELDS:
+            suggestion = _closest_field(field)
+            warnings.warn("'{}' is not a known Google document field{}".format(
+                field, ", did you mean '{}'?".format(suggestion) if suggestion else ""), stacklevel=2)
+    return list(dict.fromkeys(fields))
+
+def to_dataframe(documents_data: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> 'pandas.DataFrame':
+    """
+    Converts the documents returned by the :class:`~GooglePicker` into a :class:`pandas.DataFrame` in a single columnar pass.
+    Requires the optional dependency `pandas`, which can be installed with ``pip install dash-google-picker[pandas]``.
+
+    Usage:
+    ::
+        @app.callback(
+            Output('documents-grid', 'rowData'),
+            [Input('google-picker', 'documents')],
+            prevent_initial_call=True
+        )
+        def display_output(documents):
+            return to_dataframe(documents, fields=['name', 'mimeType', 'sizeBytes']).to_dict('records')
+
+    :param documents_data: A list of dictionaries as returned by the :class:`~GooglePicker`.
+    :param fields: Only include these fields. If None is passed, all fields are included.
+    :return: A DataFrame with one row per document, see :meth:`GoogleDocumentTable.to_pandas` for the column types.
+    """
+    table = GoogleDocumentTable.from_documents(documents_data)
+    return (table if fields is None else table.select(*fields)).to_pandas()
+
+def to_arrow(documents_data: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> 'pyarrow.Table':
+    """
+    Converts the documents returned by the :class:`~GooglePicker` into a :class:`pyarrow.Table` in a single columnar pass.
+    Requires the optional dependency `pyarrow`, which can be installed with ``pip install dash-google-picker[arrow]``.
+
+    :param documents_data: A list of dictionaries as returned by the :class:`~GooglePicker`.
+    :param fields: Only include these fields. If None is passed, all fields are included.
+    :return: An Arrow table with one row per document, see :meth:`GoogleDocumentTable.to_arrow` for the column types.
+    """
+    table = GoogleDocumentTable.from_documents(documents_data)
+    return (table if fields is None else table.select(*fields)).to_arrow()
+
+def _import_optional(module: str, extra: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError as error:
+        raise ImportError("{} is required for this function, install it with 'pip install dash-google-picker[{}]'".format(module, extra)) from error
+
+def _compact_column(values: List[Any]) -> Sequence[Any]:
+    """
+    Stores a column as compact as possible: numeric columns without missing values become arrays, strings get interned.
+    """
+    value_types = set(map(type, values))
+    if value_types == {int}:
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if value_types == {float} or value_types == {int, float}:
+        return array('d', values)
+    if value_types == {str}:
+        return list(map(sys.intern, values))
+    if str in value_types:
+        intern = sys.intern
+        return [intern(value) if type(value) is str else value for value in values]
+    return values
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+Concurrent downloads of the files picked in the :class:`~GooglePicker`.
+
+The files are fetched from the Google Drive API with the access token of the user, which needs a scope that allows reading the file contents,
+e.g. `https://www.googleapis.com/auth/drive.readonly`. Usage:
+::
+
+    @app.callback(Output('status', 'children'), Input('google-picker', 'documents'), State('token', 'data'), prevent_initial_call=True)
+    def download(documents, access_token):
+        for result in download_documents(GoogleDocuments(documents), access_token, directory="downloads"):
+            if result.error:
+                print("Failed to download {}: {}".format(result.name, result.error))
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+from urllib.parse import quote
+import os
+import re
+
+from ._http import DRIVE_API_URL, RETRY_EXCEPTIONS, ConnectionPool, HTTPError, authorization, request, wait_for_retry
+from .Scheduler import RequestScheduler, default_scheduler, token_hash
+
+GOOGLE_APPS_MIME_TYPE_PREFIX = "application/vnd.google-apps."
+"""
+Google Docs, Sheets, Slides and other Google Workspace files can not be downloaded, they have to be exported.
+"""
+
+@dataclass
+class DownloadResult:
+    """
+    The result of downloading a single file.
+
+    :param document_id: The id of the file.
+    :param name: The name of the file.
+    :param path: The path of the downloaded file, None if the content was passed to a callback.
+    :param size: The number of downloaded bytes.
+    :param error: The exception if the download failed.
+    """
+    document_id: str
+    name: str
+    path: Optional[str] = None
+    size: int = 0
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        If the file was downloaded completely.
+        """
+        return self.error is None
+
+def document_info(document: Any) -> Tuple[str, str, Optional[str]]:
+    """
+    Returns the id, name and mimeType of a document.
+
+    :param document: A :class:`~GoogleDocument` or any other object with the same attributes, a dictionary as returned by the :class:`~GooglePicker` or an id.
+    """
+    if isinstance(document, str):
+        return document, document, None
+    if isinstance(document, dict):
+        get = document.get
+    else:
+        get = lambda name: getattr(document, name, None)
+    document_id = get("id")
+    if not document_id:
+        raise ValueError("The document {!r} has no id".format(document))
+    return document_id, get("name") or document_id, get("mimeType")
+
+def _safe_filename(name: str, document_id: str) -> str:
+    filename = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip(" .")
+    return filename or document_id
+
+class Downloader:
+    """
+    Downloads files concurrently from Google Drive over a pool of keep-alive connections.
+
+    Failed requests and responses with the statuses 429 and 5xx are retried with exponential backoff, interrupted downloads are resumed with
+    range requests. Downloads into a directory are written to a `.part` file per user first, which is also resumed by later downloads.
+    Concurrent downloads of the same file to the same destination with the same access token are only downloaded once.
+
+    :param access_token: The OAuth access token of the user.
+    :param max_workers: The maximum number of concurrent downloads.
+    :param retries: How often a file is requested again after failed requests and interrupted downloads, in total.
+    :param backoff: The base delay between retries in seconds.
+    :param chunk_size: The size of the chunks which are written in bytes.
+    :param timeout: The timeout of connecting and reading in seconds.
+    :param api_url: The base url of the Google Drive API.
+    :param scheduler: The scheduler of the requests, defaults to :func:`~dash_google_picker.Scheduler.default_scheduler`.
+    """
+    def __init__(self, access_token: str, max_workers: int = 8, retries: int = 3, backoff: float = 0.5, chunk_size: int = 1 << 20,
+                 timeout: float = 60, api_url: str = DRIVE_API_URL, scheduler: Optional[RequestScheduler] = None):
+        self.access_token = access_token
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.api_url = api_url
+        self.scheduler = scheduler or default_scheduler()
+        self.pool = ConnectionPool(max_connections=max_workers, timeout=timeout)
+
+    def download(self, documents: Iterable[Any], directory: Optional[str] = None,
+                 callback: Optional[Callable[[str, bytes], None]] = None) -> Iterator[DownloadResult]:
+        """
+        Downloads the files and yields the result of every file as soon as it finished, in the order they finished.
+
+        :param documents: The documents to download, see :func:`~document_info`.
+        :param directory: The directory the files are written to, named after the files. Existing files are replaced.
+        :param callback: Called with the id of the file and every downloaded chunk instead of writing to a directory.
+                         It is called from multiple threads, but never concurrently for the same file.
+        :raises ValueError: If neither or both of a directory and a callback are given.
+        """
+        if (directory is None) == (callback is None):
+            raise ValueError("Either a directory or a callback is needed")
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._download, document, directory, callback) for document in documents]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Do not start the remaining downloads if the results are no longer consumed
+                for future in futures:
+                    future.cancel()
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        self.pool.close()
+
+    def _download(self, document: Any, directory: Optional[str], callback: Optional[Callable[[str, bytes], None]]) -> DownloadResult:
+        try:
+            document_id, name, mime_type = document_info(document)
+        except ValueError as error:
+            return DownloadResult(str(document), str(document), error=error)
+        result = DownloadResult(document_id, name)
+        try:
+            if mime_type and mime_type.startswith(GOOGLE_APPS_MIME_TYPE_PREFIX):
+                raise ValueError("{} is a Google Workspace file of type {} and has to be exported".format(name, mime_type))
+            if directory is None:
+                result.size = self.scheduler.coalesce(("download", token_hash(self.access_token), document_id, id(callback)),
+                                                      lambda: self._fetch(document_id, lambda chunk: callback(document_id, chunk), None, 0))
+            else:
+                result.path = os.path.join(directory, _safe_filename(name, document_id))
+                result.size = self.scheduler.coalesce(("download", token_hash(self.access_token), document_id, os.path.abspath(result.path)),
+                                                      lambda: self._fetch_to_file(document_id, result.path))
+        except Exception as error:
+            result.error = error
+        return result
+
+    def _fetch_to_file(self, document_id: str, path: str) -> int:
+        # Every user resumes their own part file, concurrent downloads of other users to the same path do not interfere
+        part = "{}.{}.part".format(path, token_hash(self.access_token))
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        try:
+            with open(part, "ab") as f:
+                def restart():
+                    f.seek(0)
+                    f.truncate()
+                size = self._fetch(document_id, f.write, restart, offset)
+        except BaseException:
+            # Only keep the part file if a later download can resume it
+            if os.path.getsize(part) == 0:
+                os.remove(part)
+            raise
+        os.replace(part, path)
+        return size
+
+    def _fetch(self, document_id: str, write: Callable[[bytes], Any], restart: Optional[Callable[[], None]], offset: int) -> int:
+        """
+        Streams a file into `write` starting at `offset`, interrupted downloads are resumed where they stopped.
+        Failed requests and interrupted downloads share the same retries.
+        If the server sends the complete file again, `restart` is called and the download starts again. Without `restart`,
+        e.g. for callbacks which can not take back the bytes they already received, the bytes which were already written are skipped.
+        """
+        url = "{}/files/{}?alt=media&supportsAllDrives=true".format(self.api_url, quote(document_id, safe=""))
+        # Bytes which were already written are skipped if the server sends the complete file again
+        skip = 0
+        attempt = 0
+        while True:
+            headers = authorization(self.access_token)
+            if offset:
+                headers["Range"] = "bytes={}-".format(offset)
+            try:
+                response = request(self.pool, "GET", url, headers, retries=0, expected=(200, 206, 416), scheduler=self.scheduler)
+                with response:
+                    if response.status == 416:
+                        body = response.read()
+                        if response.headers.get("content-range") == "bytes */{}".format(offset):
+                            return offset
+                        # The file is shorter than the part which was already written, it changed in between
+                        if restart is None:
+                            raise HTTPError(response.status, response.reason, body, response.headers)
+                        restart()
+                        offset = 0
+                        continue
+                    if response.status == 206:
+                        content_range = response.headers.get("content-range", "")
+                        if not content_range.startswith("bytes {}-".format(offset)):
+                            raise ValueError("The download of {} was resumed at {!r} instead of byte {}".format(document_id, content_range, offset))
+                    elif offset:
+                        if restart is None:
+                            # The callback received everything up to `offset` plus the bytes which were still to be skipped
+                            skip += offset
+                        else:
+                            restart()
+                        offset = 0
+                    for chunk in response.iter_chunks(self.chunk_size):
+                        offset += len(chunk)
+                        if skip >= len(chunk):
+                            skip -= len(chunk)
+                            continue
+                        write(chunk[skip:] if skip else chunk)
+                        skip = 0
+                return offset
+            except RETRY_EXCEPTIONS + (HTTPError,) as error:
+                wait_for_retry(error, attempt, self.retries, self.backoff, self.scheduler, self.access_token)
+                attempt += 1
+
+def download_documents(documents: Iterable[Any], access_token: str, directory: Optional[str] = None,
+                       callback: Optional[Callable[[str, bytes], None]] = None, **options: Any) -> Iterator[DownloadResult]:
+    """
+    Downloads the files of the picked documents concurrently and yields the results in the order they finished.
+
+    :param documents: The documents to download, see :func:`~document_info`.
+    :param access_token: The OAuth access token of the user.
+    :param directory: The directory the files are written to.
+    :param callback: Called with the id of the file and every downloaded chunk instead of writing to a directory.
+    :param options: Further options of the :class:`~Downloader`.
+    """
+    downloader = Downloader(access_token, **options)
+    try:
+        yield from downloader.download(documents, directory, callback)
+    finally:
+        downloader.close()
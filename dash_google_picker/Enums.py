@@ -260,4 +260,102 @@ class Feature(str, Enum):
     waa = "odv"
     """
     Changes the picker window to a more old school design with non-uniform thumbnails, thicker borders and moving the tabs from the top to the left side.
-    """
\ No newline at end of file
+    """
+
+_FEATURE_BITS = {feature.value: 1 << index for index, feature in enumerate(Feature)}
+_FEATURES_BY_BIT = {bit: value for value, bit in _FEATURE_BITS.items()}
+
+class FeatureSet:
+    """
+    An immutable and canonical set of enabled and disabled features.
+
+    Aliases of :class:`~Feature` share the same wire value, so they are stored only once as a bit in a bitmask. Unknown features are kept as strings,
+    since Google adds features without documentation. A feature which is both enabled and disabled is only disabled, since the Google Picker applies
+    the disabled features last. Identical configurations are equal and have the same hash, no matter how they were written.
+    ::
+
+        FeatureSet([Feature.MULTISELECT_ENABLED, Feature.daa, "navHidden"], [Feature.iaa]).enabled_features  # ['multiselectEnabled']
+
+    :param enabled: A single or a list of :class:`~Feature` or their string values to enable.
+    :param disabled: A single or a list of :class:`~Feature` or their string values to disable.
+    """
+    __slots__ = ('_enabled', '_disabled', '_enabled_extra', '_disabled_extra')
+
+    def __init__(self, enabled = None, disabled = None):
+        disabled_bits, self._disabled_extra = FeatureSet._encode(disabled)
+        enabled_bits, enabled_extra = FeatureSet._encode(enabled)
+        self._disabled = disabled_bits
+        self._enabled = enabled_bits & ~disabled_bits
+        self._enabled_extra = enabled_extra - self._disabled_extra
+
+    @staticmethod
+    def _encode(features):
+        if features is None:
+            return 0, frozenset()
+        if isinstance(features, str):
+            features = (features,)
+        bits = 0
+        extra = set()
+        for feature in features:
+            value = getattr(feature, 'value', feature)
+            bit = _FEATURE_BITS.get(value)
+            if bit is None:
+                extra.add(value)
+            else:
+                bits |= bit
+        return bits, frozenset(extra)
+
+    @staticmethod
+    def _decode(bits, extra):
+        values = list(extra)
+        while bits:
+            bit = bits & -bits
+            values.append(_FEATURES_BY_BIT[bit])
+            bits ^= bit
+        return sorted(values)
+
+    @property
+    def enabled_features(self):
+        """
+        The sorted wire values of all enabled features, to be used as `enabled_features` of the :class:`~GooglePicker`.
+        """
+        return FeatureSet._decode(self._enabled, self._enabled_extra)
+
+    @property
+    def disabled_features(self):
+        """
+        The sorted wire values of all disabled features, to be used as `disabled_features` of the :class:`~GooglePicker`.
+        """
+        return FeatureSet._decode(self._disabled, self._disabled_extra)
+
+    def is_enabled(self, feature) -> bool:
+        """
+        Checks if a feature or one of its aliases is enabled.
+
+        :param feature: A :class:`~Feature` or its string value.
+        """
+        value = getattr(feature, 'value', feature)
+        bit = _FEATURE_BITS.get(value)
+        return bool(self._enabled & bit) if bit is not None else value in self._enabled_extra
+
+    def _key(self):
+        return (self._enabled, self._disabled, self._enabled_extra, self._disabled_extra)
+
+    def __eq__(self, other):
+        if not isinstance(other, FeatureSet):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __setattr__(self, name, value):
+        if hasattr(self, '_enabled_extra'):
+            raise AttributeError("FeatureSet is immutable")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return (FeatureSet, (self.enabled_features, self.disabled_features))
+
+    def __repr__(self):
+        return "FeatureSet(enabled={!r}, disabled={!r})".format(self.enabled_features, self.disabled_features)
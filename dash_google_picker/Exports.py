@@ -0,0 +1,306 @@
+"""
+Cached exports of the Google Docs, Sheets, Slides and Drawings picked in the :class:`~GooglePicker`.
+
+Google Workspace files have no binary content, they are exported into a format like PDF or XLSX. The exports are cached on disk by the id of the
+file, its `lastEditedUtc` and the exported mimeType, so a file is only exported again once it was edited. Usage:
+::
+
+    cache = ExportCache("exports", max_bytes=1 << 30)
+
+    @app.callback(Output('status', 'children'), Input('google-picker', 'documents'), State('token', 'data'), prevent_initial_call=True)
+    def export(documents, access_token):
+        for result in export_documents(GoogleDocuments(documents), access_token, cache):
+            if result.ok:
+                print("Exported {} to {}".format(result.name, result.path))
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import quote, urlencode
+import hashlib
+import os
+import threading
+
+from ._http import DRIVE_API_URL, ConnectionPool, authorization, request
+from .Downloads import GOOGLE_APPS_MIME_TYPE_PREFIX, document_info
+from .Scheduler import RequestScheduler, default_scheduler, token_hash
+
+EXPORT_MIME_TYPES = {
+    "application/vnd.google-apps.document": "application/pdf",
+    "application/vnd.google-apps.spreadsheet": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.google-apps.presentation": "application/pdf",
+    "application/vnd.google-apps.drawing": "image/png",
+    "application/vnd.google-apps.script": "application/vnd.google-apps.script+json",
+}
+"""
+The mimeType every type of Google Workspace file is exported to by default.
+"""
+
+ExportKey = Tuple[str, Optional[int], str]
+
+class ExportCache:
+    """
+    A size bounded cache of exports on disk, the least recently used exports are removed first.
+
+    Every export is stored in a file named after the hash of its key, the order of use is kept in the modification times,
+    so the cache can be shared by subsequent processes. It is thread safe, but not safe to be written by multiple processes at the same time.
+
+    :param directory: The directory of the cache, it is created if it does not exist.
+    :param max_bytes: The maximum total size of the cached exports. The most recent export is kept even if it is larger.
+    """
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".tmp"):
+                # Left over by an interrupted write
+                os.remove(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._size += size
+
+    @staticmethod
+    def filename(key: ExportKey) -> str:
+        """
+        Returns the name of the file an export is stored in.
+
+        :param key: The id, `lastEditedUtc` and exported mimeType of the file.
+        """
+        return hashlib.sha256("\0".join(map(str, key)).encode()).hexdigest()
+
+    def get(self, key: ExportKey) -> Optional[str]:
+        """
+        Returns the path of a cached export and marks it as recently used or None if it is not cached.
+
+        :param key: The id, `lastEditedUtc` and exported mimeType of the file.
+        """
+        name = self.filename(key)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self._size -= self._entries.pop(name)
+                return None
+            self._entries.move_to_end(name)
+        return path
+
+    def put(self, key: ExportKey, content: bytes) -> str:
+        """
+        Stores an export, removes the least recently used exports if the cache is full and returns the path of the export.
+
+        :param key: The id, `lastEditedUtc` and exported mimeType of the file.
+        :param content: The exported content.
+        """
+        name = self.filename(key)
+        path = os.path.join(self.directory, name)
+        temporary = "{}.{}.tmp".format(path, threading.get_ident())
+        with open(temporary, "wb") as f:
+            f.write(content)
+        os.replace(temporary, path)
+        with self._lock:
+            self._size += len(content) - self._entries.pop(name, 0)
+            self._entries[name] = len(content)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                evicted, size = self._entries.popitem(last=False)
+                self._size -= size
+                try:
+                    os.remove(os.path.join(self.directory, evicted))
+                except FileNotFoundError:
+                    pass
+        return path
+
+    def clear(self):
+        """
+        Removes all cached exports.
+        """
+        with self._lock:
+            for name in self._entries:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """
+        The total size of the cached exports in bytes.
+        """
+        return self._size
+
+    def __contains__(self, key: ExportKey) -> bool:
+        return self.filename(key) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+@dataclass
+class ExportResult:
+    """
+    The result of exporting a single file.
+
+    :param document_id: The id of the file.
+    :param name: The name of the file.
+    :param mime_type: The mimeType the file was exported to.
+    :param path: The path of the export in the cache. It can be removed by later exports once the cache is full.
+    :param cached: If the export was taken from the cache.
+    :param error: The exception if the export failed.
+    """
+    document_id: str
+    name: str
+    mime_type: Optional[str] = None
+    path: Optional[str] = None
+    cached: bool = False
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        If the file was exported.
+        """
+        return self.error is None
+
+    def read(self) -> bytes:
+        """
+        Returns the exported content.
+        """
+        with open(self.path, "rb") as f:
+            return f.read()
+
+class Exporter:
+    """
+    Exports Google Workspace files concurrently through a cache, every version of a file is only exported once per mimeType,
+    even if it is requested by concurrent exports.
+
+    Files without `lastEditedUtc`, e.g. given by their id, can not be versioned and are exported every time.
+    Since the picked documents are sent by the browser, the access of the user to a file is checked with a small metadata request
+    before a cached export is returned, so users can share a cache without getting exports of files they can not read.
+
+    :param access_token: The OAuth access token of the user.
+    :param cache: The cache of the exports.
+    :param max_workers: The maximum number of concurrent exports.
+    :param retries: How often a failed request is retried.
+    :param backoff: The base delay between retries in seconds.
+    :param timeout: The timeout of connecting and reading in seconds.
+    :param api_url: The base url of the Google Drive API.
+    :param scheduler: The scheduler of the requests, defaults to :func:`~dash_google_picker.Scheduler.default_scheduler`.
+    """
+    def __init__(self, access_token: str, cache: ExportCache, max_workers: int = 8, retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 60, api_url: str = DRIVE_API_URL, scheduler: Optional[RequestScheduler] = None):
+        self.access_token = access_token
+        self.cache = cache
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.api_url = api_url
+        self.scheduler = scheduler or default_scheduler()
+        self.pool = ConnectionPool(max_connections=max_workers, timeout=timeout)
+
+    def export(self, documents: Iterable[Any], mime_type: Union[str, Dict[str, str], None] = None) -> Iterator[ExportResult]:
+        """
+        Exports the files and yields the result of every file as soon as it finished, in the order they finished.
+
+        :param documents: The documents to export, see :func:`~dash_google_picker.Downloads.document_info`.
+        :param mime_type: The mimeType all files are exported to or a dictionary of the mimeType of the files to the exported mimeType.
+                          Defaults to :py:data:`~EXPORT_MIME_TYPES`.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._export, document, mime_type) for document in documents]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        self.pool.close()
+
+    def _export(self, document: Any, mime_type: Union[str, Dict[str, str], None]) -> ExportResult:
+        try:
+            document_id, name, source_mime_type = document_info(document)
+        except ValueError as error:
+            return ExportResult(str(document), str(document), error=error)
+        result = ExportResult(document_id, name)
+        try:
+            if source_mime_type and not source_mime_type.startswith(GOOGLE_APPS_MIME_TYPE_PREFIX):
+                raise ValueError("{} is not a Google Workspace file and can be downloaded instead".format(name))
+            if isinstance(mime_type, str):
+                result.mime_type = mime_type
+            else:
+                result.mime_type = (mime_type or EXPORT_MIME_TYPES).get(source_mime_type)
+                if result.mime_type is None:
+                    raise ValueError("No mimeType to export {} of type {} to".format(name, source_mime_type))
+            last_edited = document.get("lastEditedUtc") if isinstance(document, dict) else getattr(document, "lastEditedUtc", None)
+            if last_edited is None:
+                result.path = self.cache.put((document_id, None, result.mime_type), self._fetch(document_id, result.mime_type))
+            else:
+                # The documents come from the browser, so the cache may only be used once Drive confirmed the access of this user
+                self._check_access(document_id)
+                result.path, result.cached = self._cached((document_id, last_edited, result.mime_type))
+        except Exception as error:
+            result.error = error
+        return result
+
+    def _cached(self, key: ExportKey) -> Tuple[str, bool]:
+        """
+        Returns the path of the export and if it was cached, concurrent exports of the same key wait for a single request.
+        """
+        path = self.cache.get(key)
+        if path is not None:
+            return path, True
+        exported = []
+        def export():
+            # The export may have finished since the cache was checked
+            path = self.cache.get(key)
+            if path is None:
+                path = self.cache.put(key, self._fetch(key[0], key[2]))
+                exported.append(True)
+            return path
+        return self.scheduler.coalesce(("export", token_hash(self.access_token)) + key, export), not exported
+
+    def _check_access(self, document_id: str):
+        """
+        Raises an :class:`~dash_google_picker._http.HTTPError` if the file can not be read with the access token.
+        """
+        url = "{}/files/{}?fields=id&supportsAllDrives=true".format(self.api_url, quote(document_id, safe=""))
+        request(self.pool, "GET", url, authorization(self.access_token), retries=self.retries, backoff=self.backoff,
+                scheduler=self.scheduler).read()
+
+    def _fetch(self, document_id: str, mime_type: str) -> bytes:
+        url = "{}/files/{}/export?{}".format(self.api_url, quote(document_id, safe=""), urlencode({"mimeType": mime_type}))
+        return request(self.pool, "GET", url, authorization(self.access_token), retries=self.retries, backoff=self.backoff,
+                       scheduler=self.scheduler).read()
+
+def export_documents(documents: Iterable[Any], access_token: str, cache: ExportCache, mime_type: Union[str, Dict[str, str], None] = None,
+                     **options: Any) -> Iterator[ExportResult]:
+    """
+    Exports the picked Google Workspace files concurrently through the cache and yields the results in the order they finished.
+
+    :param documents: The documents to export, see :func:`~dash_google_picker.Downloads.document_info`.
+    :param access_token: The OAuth access token of the user.
+    :param cache: The cache of the exports.
+    :param mime_type: The mimeType all files are exported to or a dictionary of the mimeType of the files to the exported mimeType.
+    :param options: Further options of the :class:`~Exporter`.
+    """
+    exporter = Exporter(access_token, cache, **options)
+    try:
+        yield from exporter.export(documents, mime_type)
+    finally:
+        exporter.close()
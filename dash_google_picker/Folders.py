@@ -0,0 +1,208 @@
+"""
+Expansion of the folders picked in the :class:`~GooglePicker` into the files they contain.
+
+The picker only returns the picked folders, their contents are listed with the Google Drive API. The folders are listed concurrently
+page by page and the files are yielded while the listing continues, so processing can start before large trees are walked. Usage:
+::
+
+    @app.callback(Output('files', 'children'), Input('google-picker', 'documents'), State('token', 'data'), prevent_initial_call=True)
+    def list_files(documents, access_token):
+        pdfs = expand_folders(GoogleDocuments(documents), access_token, mime_types=["application/pdf"], max_files=500)
+        return [html.Li(document.name) for document in pdfs]
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from ._http import DRIVE_API_URL, ConnectionPool, authorization, request
+from .Documents import GoogleDocument
+from .Downloads import document_info
+from .Scheduler import RequestScheduler, default_scheduler, token_hash
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+"""
+The mimeType of folders.
+"""
+
+SHORTCUT_MIME_TYPE = "application/vnd.google-apps.shortcut"
+"""
+The mimeType of shortcuts, they are replaced by the file or folder they point to.
+"""
+
+LIST_FIELDS = "nextPageToken,files(id,name,mimeType,parents,modifiedTime,size,shortcutDetails)"
+"""
+The fields requested for the files of a folder.
+"""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _parse_timestamp(value: str) -> int:
+    """
+    Converts an RFC 3339 timestamp of the Drive API in UTC, with or without fractional seconds, into milliseconds since the epoch.
+    """
+    # datetime.fromisoformat is not available in Python 3.6
+    timestamp_format = "%Y-%m-%dT%H:%M:%S.%fZ" if "." in value else "%Y-%m-%dT%H:%M:%SZ"
+    modified = datetime.strptime(value, timestamp_format).replace(tzinfo=timezone.utc)
+    return (modified - _EPOCH) // timedelta(milliseconds=1)
+
+def _as_document(document: Any) -> GoogleDocument:
+    """
+    Converts a picked document into a :class:`~GoogleDocument`, so all yielded files have the same type.
+    """
+    if isinstance(document, GoogleDocument):
+        return document
+    if isinstance(document, str):
+        return GoogleDocument({"id": document})
+    if isinstance(document, dict):
+        return GoogleDocument(document)
+    if hasattr(document, "to_dict"):
+        return GoogleDocument(document.to_dict())
+    return GoogleDocument(vars(document))
+
+def _to_document(resource: Dict[str, Any]) -> GoogleDocument:
+    """
+    Converts a file resource of the Drive API into a :class:`~GoogleDocument` with the keys of the Google Picker.
+    """
+    data = {"id": resource["id"], "name": resource.get("name"), "mimeType": resource.get("mimeType")}
+    if resource.get("parents"):
+        data["parentId"] = resource["parents"][0]
+    if resource.get("modifiedTime"):
+        data["lastEditedUtc"] = _parse_timestamp(resource["modifiedTime"])
+    if resource.get("size") is not None:
+        data["sizeBytes"] = int(resource["size"])
+    return GoogleDocument(data)
+
+class FolderExpander:
+    """
+    Lists the contents of folders concurrently.
+
+    :param access_token: The OAuth access token of the user.
+    :param max_workers: The maximum number of concurrently listed pages.
+    :param page_size: The number of files per page, at most 1000.
+    :param retries: How often a failed request is retried.
+    :param backoff: The base delay between retries in seconds.
+    :param timeout: The timeout of connecting and reading in seconds.
+    :param api_url: The base url of the Google Drive API.
+    :param scheduler: The scheduler of the requests, defaults to :func:`~dash_google_picker.Scheduler.default_scheduler`.
+    """
+    def __init__(self, access_token: str, max_workers: int = 8, page_size: int = 1000, retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 60, api_url: str = DRIVE_API_URL, scheduler: Optional[RequestScheduler] = None):
+        self.access_token = access_token
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.retries = retries
+        self.backoff = backoff
+        self.api_url = api_url
+        self.scheduler = scheduler or default_scheduler()
+        self.pool = ConnectionPool(max_connections=max_workers, timeout=timeout)
+
+    def expand(self, documents: Iterable[Any], max_depth: Optional[int] = None, max_files: Optional[int] = None,
+               mime_types: Optional[Iterable[str]] = None, follow_shortcuts: bool = True) -> Iterator[GoogleDocument]:
+        """
+        Yields the files in the picked folders and their subfolders in the order they are listed as :class:`~GoogleDocument` objects.
+        Picked documents which are not folders are yielded first, converted into :class:`~GoogleDocument` objects unless they already are one,
+        the files in the folders only have the fields `id`, `name`, `mimeType`, `parentId`, `lastEditedUtc` and `sizeBytes`. Every file is only yielded once, even if it has multiple parents or is reached through shortcuts.
+
+        :param documents: The picked documents, see :func:`~dash_google_picker.Downloads.document_info`.
+        :param max_depth: How deep subfolders are listed, 1 only lists the files directly in the picked folders. Unlimited by default.
+        :param max_files: The maximum number of yielded files. Unlimited by default.
+        :param mime_types: Only files of these mimeTypes are yielded, folders are listed nevertheless.
+        :param follow_shortcuts: If shortcuts are replaced by the files and folders they point to, otherwise they are skipped.
+        :raises HTTPError: If a folder can not be listed.
+        """
+        mime_types = frozenset(mime_types) if mime_types is not None else None
+        seen = set()
+        yielded = 0
+        folders = []
+        for document in documents:
+            document_id, _, mime_type = document_info(document)
+            if document_id in seen:
+                continue
+            seen.add(document_id)
+            if mime_type == FOLDER_MIME_TYPE:
+                folders.append(document_id)
+            elif mime_types is None or mime_type in mime_types:
+                yield _as_document(document)
+                yielded += 1
+                if max_files is not None and yielded >= max_files:
+                    return
+        if max_depth is not None and max_depth < 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._list, folder, None): (folder, 1) for folder in folders}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        folder, depth = pending.pop(future)
+                        resources, page_token = future.result()
+                        if page_token:
+                            pending[executor.submit(self._list, folder, page_token)] = (folder, depth)
+                        for resource in resources:
+                            resource_id, mime_type = resource["id"], resource.get("mimeType")
+                            if mime_type == SHORTCUT_MIME_TYPE:
+                                target = resource.get("shortcutDetails") or {}
+                                if not follow_shortcuts or not target.get("targetId"):
+                                    continue
+                                resource = dict(resource, id=target["targetId"], mimeType=target.get("targetMimeType"))
+                                resource_id, mime_type = resource["id"], resource["mimeType"]
+                            if resource_id in seen:
+                                continue
+                            seen.add(resource_id)
+                            if mime_type == FOLDER_MIME_TYPE:
+                                if max_depth is None or depth < max_depth:
+                                    pending[executor.submit(self._list, resource_id, None)] = (resource_id, depth + 1)
+                            elif mime_types is None or mime_type in mime_types:
+                                yield _to_document(resource)
+                                yielded += 1
+                                if max_files is not None and yielded >= max_files:
+                                    return
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        self.pool.close()
+
+    def _list(self, folder_id: str, page_token: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lists a page of the files in a folder and returns them with the token of the next page.
+        """
+        query = {
+            "q": "'{}' in parents and trashed = false".format(folder_id.replace("\\", "\\\\").replace("'", "\\'")),
+            "fields": LIST_FIELDS,
+            "pageSize": self.page_size,
+            "supportsAllDrives": "true",
+            "includeItemsFromAllDrives": "true",
+        }
+        if page_token:
+            query["pageToken"] = page_token
+        url = "{}/files?{}".format(self.api_url, urlencode(query))
+        # Concurrent expansions of the same folder share the pages, they are not changed
+        page = self.scheduler.coalesce(("list", token_hash(self.access_token), url), lambda: request(
+            self.pool, "GET", url, authorization(self.access_token), retries=self.retries, backoff=self.backoff, scheduler=self.scheduler).json())
+        return page.get("files", []), page.get("nextPageToken")
+
+def expand_folders(documents: Iterable[Any], access_token: str, max_depth: Optional[int] = None, max_files: Optional[int] = None,
+                   mime_types: Optional[Iterable[str]] = None, follow_shortcuts: bool = True, **options: Any) -> Iterator[GoogleDocument]:
+    """
+    Yields the files in the picked folders and their subfolders while the folders are listed concurrently, see :meth:`~FolderExpander.expand`.
+
+    :param documents: The picked documents, see :func:`~dash_google_picker.Downloads.document_info`.
+    :param access_token: The OAuth access token of the user.
+    :param max_depth: How deep subfolders are listed, 1 only lists the files directly in the picked folders. Unlimited by default.
+    :param max_files: The maximum number of yielded files. Unlimited by default.
+    :param mime_types: Only files of these mimeTypes are yielded, folders are listed nevertheless.
+    :param follow_shortcuts: If shortcuts are replaced by the files and folders they point to, otherwise they are skipped.
+    :param options: Further options of the :class:`~FolderExpander`.
+    """
+    expander = FolderExpander(access_token, **options)
+    try:
+        yield from expander.expand(documents, max_depth, max_files, mime_types, follow_shortcuts)
+    finally:
+        expander.close()
@@ -0,0 +1,282 @@
+"""
+Memoization of callbacks which take the `documents` of the :class:`~GooglePicker`.
+
+Dash fires the callbacks again on page reloads, duplicate picks and for multiple outputs. The decorated callback is only called once per
+set of picked files, identified by their ids and `lastEditedUtc` regardless of the order, and the other arguments. Usage:
+::
+
+    @app.callback(Output('summary', 'children'), Input('google-picker', 'documents'), prevent_initial_call=True)
+    @memoize_documents(MemoryCache(max_entries=256, ttl=600))
+    def summarize(documents):
+        ...
+
+    summarize.cache_info()  # CacheInfo(hits=..., misses=..., coalesced=..., size=...)
+"""
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from itertools import repeat
+from typing import Any, Callable, Iterable, Optional, Tuple, Union
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "coalesced", "size"])
+"""
+The statistics of a memoized callback, like :func:`functools.lru_cache`. Calls which waited for an identical call in flight are coalesced,
+they are neither counted as hits nor as misses.
+"""
+
+def documents_key(documents: Optional[Iterable[Any]]) -> str:
+    """
+    Returns a key of the picked documents which only depends on their ids and `lastEditedUtc`, not on their order or other fields.
+
+    :param documents: The documents as returned by the :class:`~GooglePicker`, :class:`~GoogleDocuments` or a :class:`~GoogleDocumentTable`.
+    """
+    if documents is None:
+        versions = []
+    elif hasattr(documents, "column"):
+        # Tables only have the columns of the picked document fields
+        fields = documents.fields
+        ids = documents.column("id") if "id" in fields else [None] * len(documents)
+        last_edited = documents.column("lastEditedUtc") if "lastEditedUtc" in fields else repeat(None)
+        versions = list(zip(ids, last_edited))
+    else:
+        versions = []
+        for document in documents:
+            if isinstance(document, dict):
+                versions.append((document.get("id"), document.get("lastEditedUtc")))
+            else:
+                versions.append((getattr(document, "id", None), getattr(document, "lastEditedUtc", None)))
+    digest = hashlib.sha256()
+    for document_id, last_edited in sorted(set(versions), key=repr):
+        digest.update("{}\0{}\n".format(document_id, last_edited).encode())
+    return digest.hexdigest()
+
+class CacheBackend:
+    """
+    Base class of the storages of memoized results.
+    """
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns if a result is stored and the result.
+
+        :param key: The key of the call.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any):
+        """
+        Stores a result.
+
+        :param key: The key of the call.
+        :param value: The result of the call.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Removes all stored results.
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+class MemoryCache(CacheBackend):
+    """
+    Keeps results in memory, the least recently used results are removed first.
+
+    :param max_entries: The maximum number of results.
+    :param ttl: The seconds a result is kept, forever by default.
+    """
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskCache(CacheBackend):
+    """
+    Keeps pickled results in a directory, so they are shared by processes and survive restarts.
+    The least recently used results are removed first.
+
+    :param directory: The directory of the results, it is created if it does not exist.
+    :param max_entries: The maximum number of results.
+    :param ttl: The seconds a result is kept, forever by default.
+    """
+    def __init__(self, directory: str, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pickle")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_at, value = pickle.load(f)
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                os.remove(path)
+                return False, None
+            # The modification time keeps the order of use
+            os.utime(path)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # A truncated pickle or one referencing code which changed since it was stored is a miss
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return False, None
+        return True, value
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        temporary = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        with open(temporary, "wb") as f:
+            pickle.dump((time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        entries = self._entries()
+        for _, evicted in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(evicted)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        return sorted(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+def _arguments_key(args: Tuple[Any, ...], kwargs: dict) -> str:
+    """
+    Returns a key of the arguments besides the documents, e.g. the states of the callback.
+    """
+    arguments = (args, sorted(kwargs.items()))
+    try:
+        serialized = pickle.dumps(arguments, protocol=4)
+    except Exception:
+        serialized = repr(arguments).encode()
+    return hashlib.sha256(serialized).hexdigest()
+
+def memoize_documents(backend: Optional[CacheBackend] = None, argument: Union[int, str] = 0) -> Callable[[Callable], Callable]:
+    """
+    Decorator which caches the results of a callback by the picked documents and its other arguments.
+
+    Identical calls which are made while the first one is running wait for its result instead of computing it again.
+    Exceptions, e.g. :class:`dash.exceptions.PreventUpdate`, are raised to all waiting calls but not cached.
+    The decorated function has the methods `cache_info()`, which returns a :py:data:`~CacheInfo`, and `cache_clear()`.
+
+    :param backend: The storage of the results, defaults to a :class:`~MemoryCache`. It can be shared by several callbacks,
+                    their results are kept apart by the module and qualified name of the callback.
+    :param argument: The position or the name of the argument with the documents.
+    """
+    backend = backend if backend is not None else MemoryCache()
+
+    def decorator(function: Callable) -> Callable:
+        # Callbacks sharing a backend must not return each other's results
+        name = "{}.{}".format(function.__module__, function.__qualname__)
+        lock = threading.Lock()
+        in_flight = {}
+        counters = {"hits": 0, "misses": 0, "coalesced": 0}
+
+        def count(name: str):
+            with lock:
+                counters[name] += 1
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if isinstance(argument, str):
+                documents = kwargs.get(argument)
+                others = (args, {name: value for name, value in kwargs.items() if name != argument})
+            else:
+                documents = args[argument] if argument < len(args) else None
+                others = (args[:argument] + args[argument + 1:], kwargs)
+            key = hashlib.sha256((name + documents_key(documents) + _arguments_key(*others)).encode()).hexdigest()
+
+            found, value = backend.get(key)
+            if found:
+                count("hits")
+                return value
+            with lock:
+                future = in_flight.get(key)
+                owner = future is None
+                if owner:
+                    future = in_flight[key] = Future()
+            if not owner:
+                count("coalesced")
+                return future.result()
+            count("misses")
+            try:
+                value = function(*args, **kwargs)
+                backend.set(key, value)
+                future.set_result(value)
+                return value
+            except BaseException as error:
+                future.set_exception(error)
+                raise
+            finally:
+                with lock:
+                    del in_flight[key]
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(counters["hits"], counters["misses"], counters["coalesced"], len(backend))
+
+        def cache_clear():
+            backend.clear()
+            with lock:
+                counters.update(hits=0, misses=0, coalesced=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,324 @@
+"""
+Metrics of the GooglePicker.
+
+:class:`~TimingHistogram` aggregates the durations the GooglePicker measures in the browser, see the `measure_timings` and `timings` properties.
+The server side metrics of the documents payloads and the actions of the picker are recorded into pluggable sinks, without any sink the
+instrumentation only costs a single check per call, so it can stay enabled in production:
+::
+
+    sink = PrometheusSink()
+    add_sink(sink)
+
+    @server.route('/metrics')
+    def metrics():
+        return sink.exposition(), 200, {'Content-Type': PrometheusSink.CONTENT_TYPE}
+"""
+from bisect import bisect_left
+from collections import deque
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from ._instrumentation import add_sink, remove_sink, record, document_metrics, instrument_parsing
+
+DEFAULT_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+"""
+The default upper bounds of the histogram buckets in milliseconds.
+"""
+
+class _Phase:
+    __slots__ = ('counts', 'count', 'sum', 'max', 'samples')
+
+    def __init__(self, buckets: int, max_samples: int):
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+class TimingHistogram:
+    """
+    Aggregates the `timings` of GooglePickers into one histogram per phase, e.g. to chart the p50 and p95 latency of opening the picker.
+
+    Besides the bucket counts, the most recent durations of every phase are kept to compute exact percentiles. The histogram is thread safe,
+    so one instance can be shared by all callbacks of an app.
+    ::
+
+        histogram = TimingHistogram()
+
+        @app.callback(Output('timings', 'children'), Input('google-picker', 'timings'), prevent_initial_call=True)
+        def collect_timings(timings):
+            histogram.observe(timings)
+            return "p95 open latency: {} ms".format(histogram.percentile('open', 95))
+
+    :param buckets: The upper bounds of the buckets in milliseconds.
+    :param max_samples: How many recent durations of every phase are kept for the percentiles.
+    """
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, max_samples: int = 1000):
+        self.buckets = tuple(sorted(buckets))
+        self.max_samples = max_samples
+        self._phases = {}
+        self._lock = threading.Lock()
+
+    def observe(self, timings: Optional[Dict[str, float]], received_at: Optional[float] = None):
+        """
+        Records all durations of a `timings` property. Its `sent_at` is recorded as the `dash_request` phase,
+        the time from sending the update in the browser until it was received, which depends on the clocks of both being in sync.
+
+        :param timings: The `timings` property of a :class:`~GooglePicker`, None is ignored.
+        :param received_at: The time in milliseconds since the epoch when the timings were received, defaults to now.
+        """
+        if not timings:
+            return
+        for phase, duration in timings.items():
+            if phase == 'sent_at':
+                now = received_at if received_at is not None else time.time() * 1000
+                self.record('dash_request', max(0.0, now - duration))
+            else:
+                self.record(phase, duration)
+
+    def record(self, phase: str, duration: float):
+        """
+        Records a single duration.
+
+        :param phase: The name of the phase.
+        :param duration: The duration in milliseconds.
+        """
+        with self._lock:
+            entry = self._phases.get(phase)
+            if entry is None:
+                entry = self._phases[phase] = _Phase(len(self.buckets), self.max_samples)
+            entry.counts[bisect_left(self.buckets, duration)] += 1
+            entry.count += 1
+            entry.sum += duration
+            entry.max = max(entry.max, duration)
+            entry.samples.append(duration)
+
+    def phases(self) -> List[str]:
+        """
+        Returns the names of all recorded phases.
+        """
+        with self._lock:
+            return sorted(self._phases)
+
+    def count(self, phase: str) -> int:
+        """
+        Returns how many durations of a phase were recorded.
+
+        :param phase: The name of the phase.
+        """
+        with self._lock:
+            entry = self._phases.get(phase)
+            return entry.count if entry else 0
+
+    def percentile(self, phase: str, percentile: float) -> Optional[float]:
+        """
+        Returns a percentile of the recent durations of a phase.
+
+        :param phase: The name of the phase.
+        :param percentile: The percentile between 0 and 100, e.g. 95.
+        :return: The duration in milliseconds or None if the phase was not recorded.
+        """
+        with self._lock:
+            entry = self._phases.get(phase)
+            if not entry:
+                return None
+            samples = sorted(entry.samples)
+        return samples[max(0, ceil(percentile / 100 * len(samples)) - 1)]
+
+    def bucket_counts(self, phase: str) -> List[Tuple[float, int]]:
+        """
+        Returns the cumulative count of every bucket of a phase, the last bucket has the upper bound infinity.
+
+        :param phase: The name of the phase.
+        """
+        with self._lock:
+            entry = self._phases.get(phase)
+            counts = list(entry.counts) if entry else [0] * (len(self.buckets) + 1)
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the count, sum, p50, p95 and maximum of every phase.
+        """
+        summary = {}
+        for phase in self.phases():
+            with self._lock:
+                entry = self._phases[phase]
+                summary[phase] = {"count": entry.count, "sum": entry.sum, "max": entry.max}
+            summary[phase]["p50"] = self.percentile(phase, 50)
+            summary[phase]["p95"] = self.percentile(phase, 95)
+        return summary
+
+METRICS = {
+    "documents_payload_bytes": ("histogram", "Size of the documents payloads serialized as json in bytes", (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)),
+    "documents_count": ("histogram", "Number of documents per payload", (1, 10, 100, 1000, 10000, 100000)),
+    "documents_parse_seconds": ("histogram", "Time to create GoogleDocuments from a payload in seconds", (0.0001, 0.001, 0.01, 0.1, 1, 10)),
+    "picker_actions_total": ("counter", "Number of actions of the Google Picker, e.g. loaded, picked or cancel", None),
+}
+"""
+The recorded metrics with their type, description and the upper bounds of the histogram buckets.
+"""
+
+PICKER_ACTIONS = frozenset(("loaded", "picked", "cancel"))
+"""
+The actions of the Google Picker which are counted with their name, all other actions are counted as `other`.
+"""
+
+def record_action(action: Optional[str]):
+    """
+    Counts an action of the :class:`~GooglePicker` in `picker_actions_total`, e.g. in the callback of its `action` property:
+    ::
+
+        @app.callback(Output('status', 'children'), Input('google-picker', 'action'), prevent_initial_call=True)
+        def count_action(action):
+            record_action(action)
+
+    :param action: The `action` property of the :class:`~GooglePicker`, an empty action is not counted.
+    """
+    if not action:
+        return
+    # Unknown actions share one label, so values sent by the browser can not create arbitrarily many series
+    record("picker_actions_total", 1, {"action": action if action in PICKER_ACTIONS else "other"})
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(labels.items()))
+
+class MetricsSink:
+    """
+    Base class of all sinks, a sink receives every recorded value.
+    """
+    def record(self, name: str, value: float, labels: Dict[str, str]):
+        """
+        Receives a recorded value.
+
+        :param name: The name of the metric, see :py:data:`~METRICS`.
+        :param value: The observed value or the increment of a counter.
+        :param labels: The labels of the value.
+        """
+        raise NotImplementedError
+
+class InMemorySink(MetricsSink):
+    """
+    Keeps the count, sum and maximum of every metric and label combination in memory, e.g. for tests or a debug page.
+    """
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, value: float, labels: Dict[str, str]):
+        key = (name, _label_key(labels))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                self._values[key] = {"count": 1, "sum": value, "max": value}
+            else:
+                entry["count"] += 1
+                entry["sum"] += value
+                entry["max"] = max(entry["max"], value)
+
+    def get(self, name: str, **labels: str) -> Dict[str, float]:
+        """
+        Returns the count, sum and maximum of a metric, summed over all label combinations which contain the given labels.
+
+        :param name: The name of the metric.
+        :param labels: The labels to filter by.
+        """
+        result = {"count": 0, "sum": 0, "max": 0}
+        with self._lock:
+            for (metric, key), entry in self._values.items():
+                if metric == name and all(item in key for item in labels.items()):
+                    result["count"] += entry["count"]
+                    result["sum"] += entry["sum"]
+                    result["max"] = max(result["max"], entry["max"])
+        return result
+
+    def clear(self):
+        """
+        Removes all recorded values.
+        """
+        with self._lock:
+            self._values.clear()
+
+class PrometheusSink(MetricsSink):
+    """
+    Keeps counters and histograms of all metrics and renders them in the Prometheus text exposition format.
+    The metric names are prefixed with `dash_google_picker_`.
+
+    :param buckets: Upper bounds of the histogram buckets per metric, overriding the defaults of :py:data:`~METRICS`.
+    """
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+    PREFIX = "dash_google_picker_"
+
+    def __init__(self, buckets: Optional[Dict[str, Tuple[float, ...]]] = None):
+        self.buckets = {name: tuple(sorted((buckets or {}).get(name) or definition[2] or ())) for name, definition in METRICS.items()}
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, value: float, labels: Dict[str, str]):
+        key = (name, _label_key(labels))
+        bounds = self.buckets.get(name, ())
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * (len(bounds) + 1), "sum": 0}
+            entry["counts"][bisect_left(bounds, value)] += 1
+            entry["sum"] += value
+
+    def exposition(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            values = {key: {"counts": list(entry["counts"]), "sum": entry["sum"]} for key, entry in self._values.items()}
+        lines = []
+        for name, (kind, description, _) in METRICS.items():
+            series = sorted((key[1], entry) for key, entry in values.items() if key[0] == name)
+            if not series:
+                continue
+            metric = self.PREFIX + name
+            lines.append("# HELP {} {}".format(metric, description))
+            lines.append("# TYPE {} {}".format(metric, kind))
+            for labels, entry in series:
+                if kind == "counter":
+                    lines.append("{}{} {}".format(metric, _format_labels(labels), _format_value(entry["sum"])))
+                    continue
+                total = 0
+                for bound, count in zip(self.buckets[name] + (float("inf"),), entry["counts"]):
+                    total += count
+                    lines.append("{}_bucket{} {}".format(metric, _format_labels(labels + (("le", _format_value(bound)),)), total))
+                lines.append("{}_sum{} {}".format(metric, _format_labels(labels), _format_value(entry["sum"])))
+                lines.append("{}_count{} {}".format(metric, _format_labels(labels), total))
+        return "\n".join(lines) + "\n" if lines else ""
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class LoggingSink(MetricsSink):
+    """
+    Logs every recorded value.
+
+    :param logger: The logger, defaults to the `dash_google_picker.metrics` logger.
+    :param level: The log level of the records.
+    """
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("dash_google_picker.metrics")
+        self.level = level
+
+    def record(self, name: str, value: float, labels: Dict[str, str]):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s %s %s", name, value, labels)
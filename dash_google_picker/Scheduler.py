@@ -0,0 +1,222 @@
+"""
+Scheduling of the Google Drive API requests made by :mod:`~dash_google_picker.Downloads`, :mod:`~dash_google_picker.Exports`
+and :mod:`~dash_google_picker.Folders`, so concurrent callbacks stay within the quotas per user and per project.
+
+Every request takes a token from the bucket of its access token and from the bucket of the project. Once a request is rate limited,
+the rate of the bucket is halved and all requests of the bucket wait for the backoff, afterwards the rate recovers linearly.
+Duplicate requests which are in flight at the same time share one response.
+
+By default all helpers share :func:`~default_scheduler` within a process. The state of the buckets can be shared by multiple processes,
+e.g. the workers of gunicorn, with a state file:
+::
+
+    set_default_scheduler(RequestScheduler(state_file="/tmp/dash_google_picker_quota.json"))
+
+The environment variable `DASH_GOOGLE_PICKER_SCHEDULER_STATE` sets the state file of the default scheduler.
+"""
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+USER = "user"
+"""
+The scope of the quota per access token.
+"""
+
+PROJECT = "project"
+"""
+The scope of the quota of the project.
+"""
+
+def token_hash(access_token: str) -> str:
+    """
+    Returns a short hash which identifies an access token, e.g. in the keys of coalesced requests, so requests of different users are never
+    shared and the token itself is not stored.
+
+    :param access_token: The OAuth access token.
+    """
+    return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+class _MemoryState:
+    """
+    The state of the buckets within a process.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Dict[str, float]]]:
+        with self._lock:
+            yield self._state
+
+class _FileState:
+    """
+    The state of the buckets in a json file which is locked while it is changed, so it can be shared by multiple processes.
+    """
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("Sharing the state of a RequestScheduler through a file is only supported on POSIX systems")
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Dict[str, float]]]:
+        with self._lock, open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                state = json.loads(content) if content else {}
+                yield state
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class RequestScheduler:
+    """
+    Limits the rate of requests with token buckets per access token and per project and coalesces duplicate requests.
+
+    :param user_rate: The requests per second per access token.
+    :param user_burst: The number of requests per access token which can be sent at once.
+    :param project_rate: The requests per second of all access tokens.
+    :param project_burst: The number of requests of all access tokens which can be sent at once.
+    :param recovery: The seconds a throttled rate needs to recover completely.
+    :param state_file: A file to share the state of the buckets with other processes, only supported on POSIX systems.
+    """
+    def __init__(self, user_rate: float = 20, user_burst: float = 100, project_rate: float = 200, project_burst: float = 400,
+                 recovery: float = 60, state_file: Optional[str] = None):
+        self.limits = {USER: (user_rate, user_burst), PROJECT: (project_rate, project_burst)}
+        self.recovery = recovery
+        self._state = _FileState(state_file) if state_file else _MemoryState()
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    @staticmethod
+    def _bucket(scope: str, access_token: str) -> str:
+        # Access tokens are never stored, only a hash identifies their bucket
+        if scope == PROJECT:
+            return PROJECT
+        return "{}:{}".format(USER, token_hash(access_token))
+
+    def _refill(self, state: Dict[str, Dict[str, float]], scope: str, access_token: str, now: float) -> Dict[str, float]:
+        rate, burst = self.limits[scope]
+        bucket = state.get(self._bucket(scope, access_token))
+        if bucket is None:
+            bucket = state[self._bucket(scope, access_token)] = {"tokens": burst, "updated": now, "rate": rate, "blocked_until": 0}
+        elapsed = max(0.0, now - bucket["updated"])
+        bucket["rate"] = min(rate, bucket["rate"] + elapsed * rate / self.recovery)
+        bucket["tokens"] = min(burst, bucket["tokens"] + elapsed * bucket["rate"])
+        bucket["updated"] = now
+        return bucket
+
+    def acquire(self, access_token: str):
+        """
+        Waits until a request of the access token can be sent within the quotas.
+
+        :param access_token: The OAuth access token of the request.
+        """
+        while True:
+            with self._state.transaction() as state:
+                now = time.time()
+                buckets = [self._refill(state, scope, access_token, now) for scope in (USER, PROJECT)]
+                delay = max(max(bucket["blocked_until"] - now, (1 - bucket["tokens"]) / bucket["rate"]) for bucket in buckets)
+                if delay <= 0:
+                    for bucket in buckets:
+                        bucket["tokens"] -= 1
+                    self._prune(state, now)
+                    return
+            time.sleep(delay)
+
+    def throttle(self, access_token: str, delay: float, scope: str = USER):
+        """
+        Halves the rate of a bucket after a rate limited response and blocks its requests for the delay.
+
+        :param access_token: The OAuth access token of the request.
+        :param delay: The seconds the requests wait.
+        :param scope: :py:data:`~USER` or :py:data:`~PROJECT`.
+        """
+        with self._state.transaction() as state:
+            now = time.time()
+            bucket = self._refill(state, scope, access_token, now)
+            bucket["rate"] = max(self.limits[scope][0] / 64, bucket["rate"] / 2)
+            bucket["tokens"] = min(bucket["tokens"], 0)
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + delay)
+
+    def rate(self, access_token: str, scope: str = USER) -> float:
+        """
+        Returns the current requests per second of a bucket.
+
+        :param access_token: The OAuth access token.
+        :param scope: :py:data:`~USER` or :py:data:`~PROJECT`.
+        """
+        with self._state.transaction() as state:
+            return self._refill(state, scope, access_token, time.time())["rate"]
+
+    def coalesce(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Calls the function unless a call with the same key is in flight, then its result is returned instead.
+        Only calls within the process are coalesced.
+
+        :param key: The key of the request, e.g. the id of the file and the kind of the request. Requests which depend on the access of the user
+                    have to include the :func:`~token_hash` of the access token.
+        :param function: Sends the request and returns a result which can be shared.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = function()
+            future.set_result(result)
+            return result
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _prune(self, state: Dict[str, Dict[str, float]], now: float):
+        # Forget the buckets of access tokens which have expired long ago
+        for name in [name for name, bucket in state.items() if name != PROJECT and now - bucket["updated"] > 3600]:
+            del state[name]
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+def default_scheduler() -> RequestScheduler:
+    """
+    Returns the scheduler shared by all helpers of the process, it is created on first use.
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler(state_file=os.environ.get("DASH_GOOGLE_PICKER_SCHEDULER_STATE"))
+        return _default_scheduler
+
+def set_default_scheduler(scheduler: RequestScheduler):
+    """
+    Replaces the scheduler shared by all helpers of the process.
+
+    :param scheduler: The new scheduler.
+    """
+    global _default_scheduler
+    with _default_lock:
+        _default_scheduler = scheduler
@@ -0,0 +1,143 @@
+"""
+Validation of view ids, features and mimeTypes before they are sent to the Google Picker.
+
+Mistakes like deprecated views would otherwise only show up after the user logged in and the Google Picker
+returned an error. All lookups use precomputed tables, the same tables are shipped to the react component.
+
+Running this module writes the tables as json for the react component:
+::
+    python -m dash_google_picker.Validation src/lib/validationTable.json
+"""
+from typing import Any, Dict, Iterable, List, Union
+import json
+import re
+import sys
+import warnings
+
+from .Enums import ViewId, Feature
+
+class PickerConfigurationWarning(UserWarning):
+    """
+    Warning for a configuration which is accepted but will most likely not work, e.g. deprecated views.
+    """
+
+DEPRECATED_VIEW_IDS = frozenset(view_id.value for view_id in (
+    ViewId.IMAGE_SEARCH, ViewId.MAPS, ViewId.PHOTOS, ViewId.PHOTO_ALBUMS,
+    ViewId.PHOTO_UPLOAD, ViewId.VIDEO_SEARCH, ViewId.WEBCAM, ViewId.YOUTUBE,
+))
+"""
+View ids which return a 403 error.
+"""
+
+KNOWN_VIEW_IDS = frozenset(view_id.value for view_id in ViewId)
+"""
+All view ids, any other view id returns a 500 error.
+"""
+
+DEPRECATED_FEATURES = frozenset(feature.value for feature in (Feature.Uaa, Feature.V_DOLLAR))
+"""
+Features which return a 403 error if enabled.
+"""
+
+BROKEN_FEATURES = frozenset(feature.value for feature in (Feature.U_DOLLAR, Feature.G_DOLLAR))
+"""
+Features which prevent the picker from opening or make it unusable if enabled.
+"""
+
+MIME_TYPE_PATTERN = r'^[A-Za-z0-9_.+-]+/[A-Za-z0-9_.+*-]+$'
+"""
+The pattern every mimeType has to match, e.g. `application/pdf` or `image/*`.
+"""
+
+_mime_type_regex = re.compile(MIME_TYPE_PATTERN)
+
+def validate_view_id(view_id: str) -> str:
+    """
+    Validates a single view id.
+
+    :param view_id: A :class:`~ViewId` or its string value.
+    :return: The view id.
+    :raises ValueError: If the view id does not exist.
+    """
+    value = getattr(view_id, 'value', view_id)
+    if value not in KNOWN_VIEW_IDS:
+        raise ValueError("'{}' is not a valid view id and would return a 500 error, valid view ids can be found in ViewId".format(value))
+    if value in DEPRECATED_VIEW_IDS:
+        warnings.warn("The view id '{}' is deprecated and will return a 403 error".format(value), PickerConfigurationWarning, stacklevel=3)
+    return view_id
+
+def validate_mime_types(mime_types: Union[str, Iterable[str], None]) -> Union[str, Iterable[str], None]:
+    """
+    Validates the mimeTypes of a View.
+
+    :param mime_types: A single or a list of mimeTypes or None.
+    :return: The mimeTypes.
+    :raises ValueError: If a mimeType is malformed.
+    """
+    if mime_types is None:
+        return None
+    for mime_type in ((mime_types,) if isinstance(mime_types, str) else mime_types):
+        if not isinstance(mime_type, str) or not _mime_type_regex.match(mime_type):
+            raise ValueError("'{}' is not a valid mimeType, mimeTypes have to look like 'application/pdf'".format(mime_type))
+    return mime_types
+
+def validate_features(features: Union[str, Iterable[str], None], enabled: bool = True) -> Union[str, Iterable[str], None]:
+    """
+    Validates features which are enabled or disabled. Unknown features are accepted since Google adds new features without documentation.
+
+    :param features: A single or a list of :class:`~Feature` or their string values.
+    :param enabled: If the features are enabled. Disabling broken or deprecated features is always accepted.
+    :return: The features.
+    :raises ValueError: If a feature would break the picker if enabled.
+    """
+    if features is None or not enabled:
+        return features
+    for feature in ((features,) if isinstance(features, str) else features):
+        value = getattr(feature, 'value', feature)
+        if value in BROKEN_FEATURES:
+            raise ValueError("Enabling the feature '{}' breaks the Google Picker".format(value))
+        if value in DEPRECATED_FEATURES:
+            warnings.warn("The feature '{}' is deprecated and will return a 403 error if enabled".format(value), PickerConfigurationWarning, stacklevel=3)
+    return features
+
+def validate_view_ids(view_ids: Any) -> Any:
+    """
+    Validates the `view_ids` of a :class:`~GooglePicker`, which can be view ids, Views, ViewGroups or a list of them.
+    Views and ViewGroups are already validated when they are created.
+
+    :param view_ids: The `view_ids` of a :class:`~GooglePicker`.
+    :return: The view ids.
+    :raises ValueError: If a view id does not exist.
+    """
+    for view_id in (view_ids if isinstance(view_ids, (list, tuple)) else (view_ids,)):
+        if isinstance(view_id, str):
+            validate_view_id(view_id)
+    return view_ids
+
+def validate_picker_props(props: Dict[str, Any]):
+    """
+    Validates the properties of a :class:`~GooglePicker` before it is created.
+
+    :param props: The keyword arguments of the :class:`~GooglePicker`.
+    :raises ValueError: If the configuration can not work.
+    """
+    if props.get('view_ids') is not None:
+        validate_view_ids(props['view_ids'])
+    validate_features(props.get('enabled_features'))
+
+def validation_table() -> Dict[str, List[str]]:
+    """
+    Returns all validation tables as json serializable dictionary for the react component.
+    """
+    return {
+        "knownViewIds": sorted(KNOWN_VIEW_IDS),
+        "deprecatedViewIds": sorted(DEPRECATED_VIEW_IDS),
+        "deprecatedFeatures": sorted(DEPRECATED_FEATURES),
+        "brokenFeatures": sorted(BROKEN_FEATURES),
+        "mimeTypePattern": MIME_TYPE_PATTERN,
+    }
+
+if __name__ == '__main__':
+    with open(sys.argv[1], 'w') as f:
+        json.dump(validation_table(), f, indent=2)
+        f.write("\n")
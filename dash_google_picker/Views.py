@@ -1,4 +1,10 @@
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple
+from enum import Enum
+import hashlib
+import json
+import weakref
+
+from .Validation import validate_view_id, validate_mime_types
 
 class View:
     """
@@ -9,8 +15,8 @@ class View:
     :param query: A query string to prefill the search bar in the Google Picker window. The user can edit or remove this text freely.
     """
     def __init__(self, viewId : str, mimeTypes : Union[str, List[str]] = None, query : str = None):
-        self.viewId = viewId
-        self.mimeTypes = mimeTypes
+        self.viewId = validate_view_id(viewId)
+        self.mimeTypes = validate_mime_types(mimeTypes)
         self.query = query
 
     def getId() -> str:
@@ -42,6 +48,12 @@ class View:
         """
         return {"type": "View", "viewId" : self.viewId, "mimeTypes" : self.mimeTypes, "query" : self.query}
 
+    def freeze(self) -> "FrozenView":
+        """
+        Returns an immutable :class:`~FrozenView` with the same configuration.
+        """
+        return FrozenView(self.viewId, self.mimeTypes, self.query)
+
 class ViewGroup():
     """
     A ViewGroup is a collection of one or many Views. It can be used to group Views into a separate tab in the :class:`~GooglePicker`.
@@ -52,6 +64,9 @@ class ViewGroup():
     def __init__(self, *args : List[str], label : Union[str, None] = None):
         if not args or (not isinstance(args[0], str) and not isinstance(args[0], View)):
             raise ValueError("A ViewGroup needs one ViewID as root item")
+        for view in args:
+            if isinstance(view, str):
+                validate_view_id(view)
         
         self.views = list(args)
         self.label = label
@@ -62,6 +77,8 @@ class ViewGroup():
 
         :param view: A :class:`~ViewId` or :class:`~ViewGroup` to add to this ViewGroup.
         """
+        if isinstance(view, str):
+            validate_view_id(view)
         self.views.append(view)
 
     def remove(self, view : Union[str, "ViewGroup"]):
@@ -80,3 +97,137 @@ class ViewGroup():
         :return: A dictionary representing the ViewGroup.
         """
         return {"type": "ViewGroup", "views": self.views, "label": self.label}
+
+    def freeze(self) -> "FrozenViewGroup":
+        """
+        Returns an immutable :class:`~FrozenViewGroup` with the same configuration, all nested Views and ViewGroups are frozen as well.
+        """
+        return FrozenViewGroup(*self.views, label=self.label)
+
+def _plain(value):
+    """
+    Converts enum members like :class:`~ViewId` to their plain string value.
+    """
+    return value.value if isinstance(value, Enum) else value
+
+def _structural_hash(data: Dict) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()[:16]
+
+class FrozenView:
+    """
+    An immutable and hashable variant of :class:`~View`.
+
+    Identical FrozenViews are interned, creating the same View twice returns the same object. The serialized
+    representation is computed once, so serializing the View in a layout or callback is only a lookup.
+
+    :param viewId: The :class:`~ViewId` that gets used to create the View.
+    :param mimeTypes: A single or a list of mimeTypes which are allowed to be shown in this View. If None is passed, no filtering is applied.
+    :param query: A query string to prefill the search bar in the Google Picker window.
+    """
+    __slots__ = ('viewId', 'mimeTypes', 'query', 'structural_hash', '_json', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, viewId: str, mimeTypes: Union[str, List[str], Tuple[str, ...]] = None, query: str = None) -> 'FrozenView':
+        if isinstance(mimeTypes, str):
+            mimeTypes = (mimeTypes,)
+        elif mimeTypes is not None:
+            mimeTypes = tuple(mimeTypes)
+        key = (_plain(viewId), mimeTypes, query)
+        view = cls._interned.get(key)
+        if view is None:
+            validate_view_id(key[0])
+            validate_mime_types(mimeTypes)
+            view = object.__new__(cls)
+            data = {"type": "View", "viewId": key[0], "mimeTypes": list(mimeTypes) if mimeTypes else None, "query": query}
+            structural_hash = _structural_hash(data)
+            data["hash"] = structural_hash
+            for name, value in zip(cls.__slots__, key + (structural_hash, data)):
+                object.__setattr__(view, name, value)
+            cls._interned[key] = view
+        return view
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenView is immutable")
+
+    def __reduce__(self):
+        return (FrozenView, (self.viewId, self.mimeTypes, self.query))
+
+    def __repr__(self) -> str:
+        return "FrozenView({!r}, mimeTypes={!r}, query={!r})".format(self.viewId, self.mimeTypes, self.query)
+
+    def getId(self) -> str:
+        """
+        Returns the ViewId of this View.
+
+        :return: The ViewId of this View.
+        """
+        return self.viewId
+
+    def to_plotly_json(self) -> Dict[str, Union[str, List[str], None]]:
+        """
+        Returns the cached dictionary for plotly. This is used internally by dash to pass the View to the react frontend.
+        The dictionary additionally contains the structural `hash` of the View and must not be modified.
+        """
+        return self._json
+
+class FrozenViewGroup:
+    """
+    An immutable and hashable variant of :class:`~ViewGroup`.
+
+    Identical FrozenViewGroups are interned, so identical subtrees of large view trees are only stored and
+    serialized once. Mutable :class:`~View` and :class:`~ViewGroup` arguments are converted with :meth:`View.freeze`
+    and :meth:`ViewGroup.freeze`.
+
+    :param args: One or many :class:`~ViewId`, :class:`~FrozenView` or :class:`~FrozenViewGroup`. The first argument needs to be a :class:`~ViewId` or a View which is the root view for this group.
+    :param label: The label shown only on the root view of this group.
+    """
+    __slots__ = ('views', 'label', 'structural_hash', '_json', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args: Union[str, FrozenView, 'FrozenViewGroup'], label: Union[str, None] = None) -> 'FrozenViewGroup':
+        views = tuple(_freeze(view) for view in args)
+        if not views or not isinstance(views[0], (str, FrozenView)):
+            raise ValueError("A ViewGroup needs one ViewID as root item")
+        # Children are interned themselves, so their identity describes their structure
+        key = (views, label)
+        group = cls._interned.get(key)
+        if group is None:
+            for view in views:
+                if isinstance(view, str):
+                    validate_view_id(view)
+            group = object.__new__(cls)
+            children = [view if isinstance(view, str) else view.to_plotly_json() for view in views]
+            structural_hash = _structural_hash({"type": "ViewGroup", "views": [child if isinstance(child, str) else child["hash"] for child in children], "label": label})
+            data = {"type": "ViewGroup", "views": children, "label": label, "hash": structural_hash}
+            for name, value in zip(cls.__slots__, key + (structural_hash, data)):
+                object.__setattr__(group, name, value)
+            cls._interned[key] = group
+        return group
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenViewGroup is immutable")
+
+    def __reduce__(self):
+        return (_frozen_view_group, (self.views, self.label))
+
+    def __repr__(self) -> str:
+        return "FrozenViewGroup({}, label={!r})".format(", ".join(map(repr, self.views)), self.label)
+
+    def to_plotly_json(self) -> Dict[str, Union[str, List[Union[str, Dict]]]]:
+        """
+        Returns the cached dictionary for plotly. This is used internally by dash to pass the ViewGroup to the react frontend.
+        The dictionary additionally contains the structural `hash` of the ViewGroup and must not be modified.
+
+        :return: A dictionary representing the ViewGroup.
+        """
+        return self._json
+
+def _frozen_view_group(views: Tuple, label: Union[str, None]) -> FrozenViewGroup:
+    return FrozenViewGroup(*views, label=label)
+
+def _freeze(view: Union[str, View, ViewGroup, FrozenView, FrozenViewGroup]) -> Union[str, FrozenView, FrozenViewGroup]:
+    if isinstance(view, (View, ViewGroup)):
+        return view.freeze()
+    return _plain(view)
@@ -1,28 +1,23 @@
+"""
+The component, the submodules and the package info are only imported on first access, so importing this package
+does not import dash or read any file. Python 3.6 does not support a module level `__getattr__`, so everything
+is imported eagerly there.
+"""
 from __future__ import print_function as _
 
 import os as _os
 import sys as _sys
-import json
+import functools as _functools
+import importlib as _importlib
 
-import dash as _dash
+from ._version import __version__
 
-# noinspection PyUnresolvedReferences
-from ._imports_ import *
-from ._imports_ import __all__
+_components = ["GooglePicker"]
+_submodules = ["Documents", "Downloads", "Enums", "Exports", "Folders", "Memoize", "Metrics", "Scheduler", "Validation", "Views"]
 
-if not hasattr(_dash, '__plotly_dash') and not hasattr(_dash, 'development'):
-    print('Dash was not successfully imported. '
-          'Make sure you don\'t have a file '
-          'named \n"dash.py" in your current directory.', file=_sys.stderr)
-    _sys.exit(1)
+__all__ = list(_components)
 
-_basepath = _os.path.dirname(__file__)
-_filepath = _os.path.abspath(_os.path.join(_basepath, 'package-info.json'))
-with open(_filepath) as f:
-    package = json.load(f)
-
-package_name = package['name'].replace(' ', '_').replace('-', '_')
-__version__ = package['version']
+package_name = 'dash_google_picker'
 
 _current_path = _os.path.dirname(_os.path.abspath(__file__))
 
@@ -73,6 +68,17 @@ _js_dist.extend(
         {
             'relative_package_path': 'dash_google_picker.min.js.map',
     
+            'namespace': package_name,
+            'dynamic': True
+        },
+        {
+            'relative_package_path': '{}-shared.js'.format(package_name),
+
+            'namespace': package_name
+        },
+        {
+            'relative_package_path': '{}-shared.js.map'.format(package_name),
+
             'namespace': package_name,
             'dynamic': True
         }
@@ -82,6 +88,84 @@ _js_dist.extend(
 _css_dist = []
 
 
-for _component in __all__:
-    setattr(locals()[_component], '_js_dist', _js_dist)
-    setattr(locals()[_component], '_css_dist', _css_dist)
+def _normalize_features(props):
+    # Aliased, duplicated and conflicting features are reduced to the minimal lists of a FeatureSet
+    from .Enums import FeatureSet
+    enabled = props.get('enabled_features')
+    disabled = props.get('disabled_features')
+    if isinstance(disabled, FeatureSet):
+        # A FeatureSet already holds both lists, it is unclear which of them should be disabled
+        raise TypeError("A FeatureSet can only be passed as enabled_features, it contains the disabled features as well")
+    if isinstance(enabled, FeatureSet):
+        # Explicitly disabled features are added to those of the set instead of replacing them
+        features = enabled if disabled is None else FeatureSet(
+            enabled.enabled_features, enabled.disabled_features + FeatureSet(disabled=disabled).disabled_features)
+    elif enabled is not None or disabled is not None:
+        features = FeatureSet(enabled, disabled)
+    else:
+        return
+    props['enabled_features'] = features.enabled_features
+    props['disabled_features'] = features.disabled_features
+
+def _apply_script_base(props):
+    # Allows tests and load tests to redirect all pickers to a local stand-in for the Google scripts without changing the app
+    base = _os.environ.get('DASH_GOOGLE_PICKER_SCRIPT_BASE')
+    if base and props.get('script_urls') is None:
+        base = base.rstrip('/')
+        props['script_urls'] = {'api': base + '/js/api.js', 'gsi_client': base + '/gsi/client'}
+
+def _validated_init(_init):
+    # The component class is generated, so the validation is added to its constructor here
+    from .Validation import validate_picker_props
+
+    @_functools.wraps(_init)
+    def __init__(self, *args, **kwargs):
+        _normalize_features(kwargs)
+        _apply_script_base(kwargs)
+        validate_picker_props(kwargs)
+        _init(self, *args, **kwargs)
+    return __init__
+
+def _load_components():
+    import dash
+
+    if not hasattr(dash, '__plotly_dash') and not hasattr(dash, 'development'):
+        print('Dash was not successfully imported. '
+              'Make sure you don\'t have a file '
+              'named \n"dash.py" in your current directory.', file=_sys.stderr)
+        _sys.exit(1)
+
+    from . import _imports_
+    for _component in _imports_.__all__:
+        component = getattr(_imports_, _component)
+        setattr(component, '_js_dist', _js_dist)
+        setattr(component, '_css_dist', _css_dist)
+        globals()[_component] = component
+
+    GooglePicker.__init__ = _validated_init(GooglePicker.__init__)
+
+def _read_package_info():
+    import json
+
+    with open(_os.path.join(_current_path, 'package-info.json')) as f:
+        return json.load(f)
+
+def __getattr__(name):
+    if name in _components:
+        _load_components()
+    elif name in _submodules:
+        globals()[name] = _importlib.import_module('.' + name, __name__)
+    elif name == 'package':
+        globals()[name] = _read_package_info()
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals()) | set(_components) | set(_submodules) | {'package'})
+
+if _sys.version_info < (3, 7):
+    _load_components()
+    for _name in _submodules:
+        globals()[_name] = _importlib.import_module('.' + _name, __name__)
+    package = _read_package_info()
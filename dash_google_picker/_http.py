@@ -0,0 +1,279 @@
+"""
+Minimal pooled HTTP client for the Google Drive API, based on `http.client` so no additional dependency is needed.
+"""
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+"""
+The base url of the Google Drive API.
+"""
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+"""
+Statuses of responses which are retried.
+"""
+
+RETRY_EXCEPTIONS = (ConnectionError, socket.timeout, http.client.HTTPException)
+"""
+Exceptions of failed connections which are retried.
+"""
+
+class HTTPError(Exception):
+    """
+    Raised for a response with an unexpected status.
+
+    :param status: The status of the response.
+    :param reason: The reason of the response.
+    :param body: The body of the response.
+    :param headers: The headers of the response.
+    """
+    def __init__(self, status: int, reason: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        super().__init__("{} {}: {}".format(status, reason, body[:200].decode(errors="replace")))
+        self.status = status
+        self.reason = reason
+        self.body = body
+        self.headers = headers or {}
+
+class Response:
+    """
+    A response of the :class:`~ConnectionPool`, the connection is returned to the pool once the body was read completely or the response is closed.
+    """
+    def __init__(self, pool: "ConnectionPool", key: Tuple[str, str, int], connection: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        self._pool = pool
+        self._key = key
+        self._connection = connection
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = {name.lower(): value for name, value in response.getheaders()}
+
+    def read(self, amount: Optional[int] = None) -> bytes:
+        """
+        Reads the body or a part of it.
+
+        :param amount: The maximum number of bytes to read, everything by default.
+        """
+        try:
+            data = self._response.read(amount)
+            # http.client only detects a connection dropped before the announced length when reading everything at once
+            if amount and not data and self._response.length:
+                raise http.client.IncompleteRead(b"", self._response.length)
+        except BaseException:
+            self.close(reuse=False)
+            raise
+        if amount is None or not data:
+            self.close()
+        return data
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """
+        Yields the body in chunks.
+
+        :param chunk_size: The maximum size of a chunk in bytes.
+        """
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def json(self):
+        """
+        Reads and parses the body as json.
+        """
+        return json.loads(self.read().decode())
+
+    def close(self, reuse: bool = True):
+        """
+        Returns the connection to the pool, a partially read connection can not be reused.
+
+        :param reuse: If the connection can be reused.
+        """
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        if reuse and self._response.isclosed() and not self._response.will_close:
+            self._pool._release(self._key, connection)
+        else:
+            self._response.close()
+            connection.close()
+            self._pool._release(self._key, None)
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close(reuse=exc_info[0] is None)
+
+class ConnectionPool:
+    """
+    Keeps idle keep-alive connections per host and limits the number of open connections.
+
+    :param max_connections: The maximum number of connections open at the same time per host.
+    :param timeout: The timeout of connecting and reading in seconds.
+    """
+    def __init__(self, max_connections: int = 10, timeout: float = 60):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle = {}
+        self._open = {}
+        self._condition = threading.Condition()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Optional[bytes] = None) -> Response:
+        """
+        Sends a request and returns the response once its headers were received.
+
+        :param method: The HTTP method.
+        :param url: The absolute url.
+        :param headers: The request headers.
+        :param body: The request body.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path + ("?" + parts.query if parts.query else "")
+        connection = self._acquire(key)
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+        except BaseException:
+            connection.close()
+            self._release(key, None)
+            raise
+        return Response(self, key, connection, response)
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        with self._condition:
+            for key, connections in self._idle.items():
+                for connection in connections:
+                    connection.close()
+                self._open[key] -= len(connections)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    def _acquire(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        with self._condition:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop()
+                if self._open.get(key, 0) < self.max_connections:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    break
+                self._condition.wait()
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout)
+
+    def _release(self, key: Tuple[str, str, int], connection: Optional[http.client.HTTPConnection]):
+        with self._condition:
+            if connection is None:
+                self._open[key] -= 1
+            else:
+                self._idle.setdefault(key, []).append(connection)
+            self._condition.notify()
+
+def backoff_delay(attempt: int, backoff: float, maximum: float = 32.0, retry_after: Optional[str] = None) -> float:
+    """
+    Returns the delay before a retry, exponential with full jitter or the `Retry-After` of the response.
+
+    :param attempt: The number of the retry starting at 0.
+    :param backoff: The base delay in seconds.
+    :param maximum: The maximum delay in seconds.
+    :param retry_after: The `Retry-After` header of the response.
+    """
+    if retry_after is not None:
+        try:
+            return min(maximum, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(maximum, backoff * 2 ** attempt))
+
+def rate_limit_scope(status: int, body: bytes) -> Optional[str]:
+    """
+    Returns if a response was rate limited per user or per project, None if it was not rate limited.
+
+    :param status: The status of the response.
+    :param body: The body of the response.
+    """
+    if status == 429 or (status == 403 and b"userRateLimitExceeded" in body):
+        return "user"
+    if status == 403 and b"rateLimitExceeded" in body:
+        return "project"
+    return None
+
+def wait_for_retry(error: Exception, attempt: int, retries: int, backoff: float, scheduler=None, access_token: str = ""):
+    """
+    Waits before the next attempt of a failed request, or raises the error again if it is not retried.
+    Failed connections, rate limited responses and responses with a status in :py:data:`~RETRY_STATUSES` are retried.
+
+    :param error: The exception of the failed attempt, an :class:`~HTTPError` or one of :py:data:`~RETRY_EXCEPTIONS`.
+    :param attempt: The number of the failed attempt starting at 0.
+    :param retries: How often a request is retried.
+    :param backoff: The base delay between retries in seconds.
+    :param scheduler: The :class:`~dash_google_picker.Scheduler.RequestScheduler` which is throttled for rate limited responses.
+    :param access_token: The OAuth access token of the request.
+    """
+    if attempt >= retries:
+        raise error
+    if isinstance(error, HTTPError):
+        scope = rate_limit_scope(error.status, error.body)
+        if error.status not in RETRY_STATUSES and scope is None:
+            raise error
+        delay = backoff_delay(attempt, backoff, retry_after=error.headers.get("retry-after"))
+        if scheduler is not None and scope is not None:
+            # The scheduler makes every request of the user or project wait, not just this one
+            scheduler.throttle(access_token, delay, scope)
+            return
+    elif isinstance(error, RETRY_EXCEPTIONS):
+        delay = backoff_delay(attempt, backoff)
+    else:
+        raise error
+    time.sleep(delay)
+
+def request(pool: ConnectionPool, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Optional[bytes] = None,
+            retries: int = 3, backoff: float = 0.5, expected: Tuple[int, ...] = (200,), scheduler=None) -> Response:
+    """
+    Sends a request and retries it as described in :func:`~wait_for_retry`.
+
+    :param pool: The connection pool.
+    :param method: The HTTP method.
+    :param url: The absolute url.
+    :param headers: The request headers.
+    :param body: The request body.
+    :param retries: How often a request is retried.
+    :param backoff: The base delay between retries in seconds.
+    :param expected: The statuses which are returned, all others raise an :class:`~HTTPError`.
+    :param scheduler: The :class:`~dash_google_picker.Scheduler.RequestScheduler` every attempt waits for, rate limits throttle all requests of the scheduler.
+    :raises HTTPError: If the response has an unexpected status, after all retries.
+    """
+    access_token = (headers or {}).get("Authorization", "").replace("Bearer ", "", 1)
+    attempt = 0
+    while True:
+        if scheduler is not None:
+            scheduler.acquire(access_token)
+        try:
+            response = pool.request(method, url, headers, body)
+            if response.status in expected:
+                return response
+            raise HTTPError(response.status, response.reason, response.read(), response.headers)
+        except RETRY_EXCEPTIONS + (HTTPError,) as error:
+            wait_for_retry(error, attempt, retries, backoff, scheduler, access_token)
+        attempt += 1
+
+def authorization(access_token: str) -> Dict[str, str]:
+    """
+    Returns the headers to authorize a request with an access token.
+
+    :param access_token: The OAuth access token of the user.
+    """
+    return {"Authorization": "Bearer " + access_token}
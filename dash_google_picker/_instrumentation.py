@@ -0,0 +1,115 @@
+"""
+The registry of the metrics sinks and the instrumentation of parsing documents, kept apart from :mod:`~dash_google_picker.Metrics`
+so :mod:`~dash_google_picker.Documents` can be instrumented without importing the sinks. Without any sink a call only costs one check.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import functools
+import time
+
+_sinks = ()
+
+def add_sink(sink: "MetricsSink"):
+    """
+    Starts recording metrics into a sink.
+
+    :param sink: The sink, e.g. an :class:`~InMemorySink`, :class:`~PrometheusSink` or :class:`~LoggingSink`.
+    """
+    global _sinks
+    _sinks = _sinks + (sink,)
+
+def remove_sink(sink: "MetricsSink"):
+    """
+    Stops recording metrics into a sink.
+
+    :param sink: A sink which was added by :func:`~add_sink`.
+    """
+    global _sinks
+    _sinks = tuple(added for added in _sinks if added is not sink)
+
+def record(name: str, value: float, labels: Optional[Dict[str, str]] = None):
+    """
+    Records a value of a metric into all sinks.
+
+    :param name: The name of the metric, see :py:data:`~METRICS`.
+    :param value: The observed value or the increment of a counter.
+    :param labels: The labels of the value.
+    """
+    for sink in _sinks:
+        sink.record(name, value, labels or {})
+
+def _payload_size(documents_data: Optional[List[Dict[str, Any]]]) -> int:
+    """
+    Returns the size of the documents serialized as compact json, as they are sent by dash.
+    """
+    import json
+    return len(json.dumps(documents_data, separators=(",", ":"), default=str).encode())
+
+class _DocumentMetrics:
+    __slots__ = ('documents_data', 'representation', 'payload_size', 'start')
+
+    def __init__(self, documents_data: Optional[List[Dict[str, Any]]], representation: str, payload_size: Optional[int]):
+        self.documents_data = documents_data
+        self.representation = representation
+        self.payload_size = payload_size
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            return
+        labels = {"representation": self.representation}
+        record("documents_parse_seconds", duration, labels)
+        record("documents_count", len(self.documents_data or ()), labels)
+        payload_size = self.payload_size if self.payload_size is not None else _payload_size(self.documents_data)
+        record("documents_payload_bytes", payload_size, labels)
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_null_context = _NullContext()
+
+def document_metrics(documents_data: Optional[List[Dict[str, Any]]], representation: str = "custom", payload_size: Optional[int] = None):
+    """
+    Context manager which records the parse duration, the number of documents and the payload size of the block.
+    ::
+
+        with document_metrics(documents, "dataframe"):
+            frame = to_dataframe(documents)
+
+    :param documents_data: The documents as returned by the :class:`~GooglePicker`.
+    :param representation: The label of what is created from the documents.
+    :param payload_size: The size of the documents in bytes, defaults to the size of the documents serialized as json.
+    """
+    if not _sinks:
+        return _null_context
+    return _DocumentMetrics(documents_data, representation, payload_size)
+
+def instrument_parsing(representation: str, argument: str = "documents_data") -> Callable[[Callable], Callable]:
+    """
+    Decorator for functions which create objects from the documents of the :class:`~GooglePicker`.
+    All constructors of :class:`~dash_google_picker.Documents.GoogleDocuments` are instrumented.
+
+    :param representation: The label of what is created from the documents.
+    :param argument: The name of the parameter with the documents, it can be passed by position or by keyword.
+    """
+    def decorator(function: Callable) -> Callable:
+        position = function.__code__.co_varnames[:function.__code__.co_argcount].index(argument)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return function(*args, **kwargs)
+            documents_data = args[position] if position < len(args) else kwargs.get(argument)
+            with _DocumentMetrics(documents_data, representation, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
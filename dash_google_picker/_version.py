@@ -0,0 +1,2 @@
+# Generated by scripts/write-version.js from package.json, do not edit
+__version__ = '1.1.0'
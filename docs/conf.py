@@ -13,7 +13,7 @@ import sys
 
 # Add the path to your module folder
 sys.path.insert(0, os.path.abspath('..'))
-js_source_path = '../src/lib/components/'
+js_source_path = ['../src/lib/components/', '../src/lib/fragments/']
 
 project = 'Dash Google Picker documentation'
 copyright = '2023, lpawlick'
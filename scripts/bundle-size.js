@@ -0,0 +1,98 @@
+/**
+ * Reports the size of the built javascript bundles.
+ *
+ * Bundles which are loaded synchronously by dash are on the critical path, the async chunks are only
+ * loaded when a component needs them. The report can be written to a json file and compared with the
+ * report of a previous release.
+ *
+ * Usage:
+ *     node scripts/bundle-size.js [--output bundle-size.json] [--baseline previous-bundle-size.json]
+ */
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const packagejson = require('../package.json');
+
+const dashLibraryName = packagejson.name.replace(/-/g, '_');
+const distPath = path.resolve(__dirname, '..', dashLibraryName);
+const KIB = 1024;
+
+function parseArgs(argv)
+{
+    const args = {};
+    for (let i = 0; i < argv.length; i += 2)
+    {
+        args[argv[i].replace(/^--/, '')] = argv[i + 1];
+    }
+    return args;
+}
+
+function measure()
+{
+    const bundles = fs.readdirSync(distPath)
+        .filter(file => file.endsWith('.js'))
+        .sort()
+        .map(file =>
+        {
+            const content = fs.readFileSync(path.join(distPath, file));
+            return {
+                file: file,
+                critical: !file.startsWith('async-'),
+                bytes: content.length,
+                gzip: zlib.gzipSync(content, {level: zlib.constants.Z_BEST_COMPRESSION}).length,
+            };
+        });
+    const total = (critical, key) => bundles
+        .filter(bundle => bundle.critical === critical)
+        .reduce((sum, bundle) => sum + bundle[key], 0);
+    return {
+        version: packagejson.version,
+        bundles: bundles,
+        critical: {bytes: total(true, 'bytes'), gzip: total(true, 'gzip')},
+        async: {bytes: total(false, 'bytes'), gzip: total(false, 'gzip')},
+    };
+}
+
+function format(bytes, baseline)
+{
+    let text = `${(bytes / KIB).toFixed(1)} KiB`;
+    if (typeof baseline === 'number')
+    {
+        const difference = bytes - baseline;
+        text += ` (${difference >= 0 ? '+' : ''}${(difference / KIB).toFixed(1)} KiB)`;
+    }
+    return text;
+}
+
+function main()
+{
+    const args = parseArgs(process.argv.slice(2));
+    const report = measure();
+    const baseline = args.baseline ? JSON.parse(fs.readFileSync(args.baseline)) : null;
+    const baselineBundles = {};
+    if (baseline)
+    {
+        baseline.bundles.forEach(bundle =>
+        {
+            baselineBundles[bundle.file] = bundle;
+        });
+    }
+
+    report.bundles.forEach(bundle =>
+    {
+        const previous = baselineBundles[bundle.file] || {};
+        console.log(`${bundle.critical ? 'critical' : 'async   '}  ${bundle.file.padEnd(40)} ${format(bundle.bytes, previous.bytes).padEnd(24)} gzip ${format(bundle.gzip, previous.gzip)}`);
+    });
+    ['critical', 'async'].forEach(kind =>
+    {
+        const previous = baseline ? baseline[kind] : {};
+        console.log(`total ${kind.padEnd(44)} ${format(report[kind].bytes, previous.bytes).padEnd(24)} gzip ${format(report[kind].gzip, previous.gzip)}`);
+    });
+
+    if (args.output)
+    {
+        fs.writeFileSync(args.output, `${JSON.stringify(report, null, 2)}\n`);
+    }
+}
+
+main();
@@ -0,0 +1,16 @@
+/**
+ * Writes the version from package.json into `dash_google_picker/_version.py`.
+ *
+ * The python package imports the version from this file instead of reading package-info.json on import.
+ *
+ * Usage:
+ *     node scripts/write-version.js
+ */
+const fs = require('fs');
+const path = require('path');
+const packagejson = require('../package.json');
+
+const dashLibraryName = packagejson.name.replace(/-/g, '_');
+const versionPath = path.resolve(__dirname, '..', dashLibraryName, '_version.py');
+
+fs.writeFileSync(versionPath, `# Generated by scripts/write-version.js from package.json, do not edit\n__version__ = '${packagejson.version}'\n`);
@@ -19,6 +19,10 @@ setup(
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     install_requires=["dash"],
+    extras_require={
+        'pandas': ["pandas"],
+        'arrow': ["pyarrow"],
+    },
     classifiers = [
         'Framework :: Dash',
         'Programming Language :: Python :: 3.6',
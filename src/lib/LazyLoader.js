@@ -1 +1,3 @@
-export const GooglePicker = React.lazy(() => import(/* webpackChunkName: "GooglePicker" */ './fragments/GooglePicker.react'));
\ No newline at end of file
+import React from 'react';
+
+export const GooglePicker = React.lazy(() => import(/* webpackChunkName: "GooglePicker" */ './fragments/GooglePicker.react'));
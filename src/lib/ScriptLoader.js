@@ -0,0 +1,164 @@
+/**
+ * Page wide loader for the Google scripts used by the GooglePicker.
+ *
+ * Every script and the `picker` module of gapi is only loaded once per page, all GooglePicker
+ * instances share the same promises. The time needed for every step is recorded for diagnostics.
+ */
+
+export const GOOGLE_API_URL = 'https://apis.google.com/js/api.js';
+export const GOOGLE_GSI_CLIENT_URL = 'https://accounts.google.com/gsi/client';
+
+const PRECONNECT_ORIGINS = ['https://apis.google.com', 'https://accounts.google.com'];
+const IDLE_TIMEOUT = 2000;
+
+const scripts = {};
+const timings = {};
+let pickerModule = null;
+
+/**
+ * Records how long a step took
+ * @param {string} name - The name of the step
+ * @param {number} start - The start time of the step from `performance.now()`
+ */
+function recordTiming(name, start)
+{
+    const end = window.performance.now();
+    timings[name] = { start: start, end: end, duration: end - start };
+}
+
+/**
+ * Loads a script into the HTML body, every url is only loaded once
+ * @param {string} src - The url of the script
+ * @returns {Promise} Promise object which resolves once the script is loaded
+ */
+export function loadScript(src)
+{
+    if (!scripts[src])
+    {
+        scripts[src] = new Promise((resolve, reject) =>
+        {
+            const start = window.performance.now();
+            const script = document.createElement('script');
+            script.src = src;
+            script.async = true;
+            script.defer = true;
+            script.onload = () =>
+            {
+                recordTiming(src, start);
+                resolve();
+            };
+            script.onerror = () =>
+            {
+                // Allow a later retry instead of caching the failure
+                delete scripts[src];
+                script.remove();
+                reject(new Error(`Failed to load script ${src}`));
+            };
+            document.body.appendChild(script);
+        });
+    }
+    return scripts[src];
+}
+
+/**
+ * Loads the Google API script and the `picker` module of gapi
+ * @param {string} url - The url of the Google API script
+ * @returns {Promise} Promise object which resolves once `window.google.picker` is available
+ */
+export function loadGoogleApi(url = GOOGLE_API_URL)
+{
+    if (!pickerModule)
+    {
+        // The script might already be included by the page, e.g. by another library or a test stand-in
+        const script = window.gapi ? Promise.resolve() : loadScript(url);
+        pickerModule = script.then(() => new Promise((resolve, reject) =>
+        {
+            const start = window.performance.now();
+            window.gapi.load('picker',
+            {
+                callback: () =>
+                {
+                    recordTiming('gapi.load(picker)', start);
+                    resolve();
+                },
+                onerror: () =>
+                {
+                    reject(new Error('Failed to load the Google Picker API'));
+                },
+            });
+        }));
+        // Allow a later retry instead of caching the failure
+        pickerModule.catch(() =>
+        {
+            pickerModule = null;
+        });
+    }
+    return pickerModule;
+}
+
+/**
+ * Loads the Google Identity Services client script
+ * @param {string} url - The url of the Google Identity Services client script
+ * @returns {Promise} Promise object which resolves once `window.google.accounts` is available
+ */
+export function loadGoogleGsiClient(url = GOOGLE_GSI_CLIENT_URL)
+{
+    if (window.google && window.google.accounts)
+    {
+        return Promise.resolve();
+    }
+    return loadScript(url);
+}
+
+/**
+ * Adds preconnect hints for the Google origins so that loading the scripts later skips the connection setup
+ */
+export function preconnectGoogle()
+{
+    PRECONNECT_ORIGINS.forEach(origin =>
+    {
+        if (!document.head.querySelector(`link[rel="preconnect"][href="${origin}"]`))
+        {
+            const link = document.createElement('link');
+            link.rel = 'preconnect';
+            link.href = origin;
+            document.head.appendChild(link);
+        }
+    });
+}
+
+/**
+ * Runs a function once the page was loaded and the browser is idle
+ * @param {Function} callback - The function to run
+ */
+export function runWhenIdle(callback)
+{
+    const schedule = () =>
+    {
+        if (window.requestIdleCallback)
+        {
+            window.requestIdleCallback(callback, { timeout: IDLE_TIMEOUT });
+        }
+        else
+        {
+            setTimeout(callback, 0);
+        }
+    };
+    if (document.readyState === 'complete')
+    {
+        schedule();
+    }
+    else
+    {
+        window.addEventListener('load', schedule, { once: true });
+    }
+}
+
+/**
+ * Returns the recorded load timings
+ * @returns {Object} The start, end and duration in milliseconds of every loaded script and of `gapi.load('picker')`
+ */
+export function getLoadTimings()
+{
+    return JSON.parse(JSON.stringify(timings));
+}
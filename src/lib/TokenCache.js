@@ -0,0 +1,129 @@
+/**
+ * Cache for the access tokens of the Google Identity Services, keyed by client id and scope.
+ *
+ * Tokens are kept in memory for the whole page and can optionally be stored in the
+ * sessionStorage or localStorage, so they survive reloads, remounts and, for the localStorage, other tabs.
+ */
+
+const STORAGE_PREFIX = 'dash_google_picker:token:';
+const memory = new Map();
+
+/**
+ * Returns the web storage for a storage name
+ * @param {string} storage - `session`, `local` or anything else for no web storage
+ * @returns {Storage} The web storage or null if it is not used or not available
+ */
+function webStorage(storage)
+{
+    try
+    {
+        if (storage === 'session')
+        {
+            return window.sessionStorage;
+        }
+        if (storage === 'local')
+        {
+            return window.localStorage;
+        }
+    }
+    catch (e)
+    {
+        // Accessing the storage throws if it is disabled by the browser
+    }
+    return null;
+}
+
+/**
+ * Creates the cache key for a client id and scope
+ * @param {string} clientId - The client id of the Google Cloud application
+ * @param {string} scope - The scope of the token
+ * @returns {string} The cache key
+ */
+export function tokenKey(clientId, scope)
+{
+    return `${clientId} ${scope}`;
+}
+
+/**
+ * Returns a cached token which is still valid for at least `margin` milliseconds
+ * @param {string} key - The cache key from `tokenKey`
+ * @param {string} storage - `memory`, `session` or `local`
+ * @param {number} margin - The minimum remaining lifetime in milliseconds
+ * @returns {Object} The token with `access_token` and `expires_at` or null
+ */
+export function readToken(key, storage, margin)
+{
+    let token = memory.get(key);
+    const store = webStorage(storage);
+    if (!token && store)
+    {
+        try
+        {
+            token = JSON.parse(store.getItem(STORAGE_PREFIX + key));
+        }
+        catch (e)
+        {
+            token = null;
+        }
+    }
+    if (token && token.expires_at - margin > Date.now())
+    {
+        return token;
+    }
+    return null;
+}
+
+/**
+ * Stores a token in the cache
+ * @param {string} key - The cache key from `tokenKey`
+ * @param {string} storage - `memory`, `session` or `local`
+ * @param {Object} token - The token with `access_token` and `expires_at`
+ */
+export function storeToken(key, storage, token)
+{
+    memory.set(key, token);
+    const store = webStorage(storage);
+    if (store)
+    {
+        try
+        {
+            store.setItem(STORAGE_PREFIX + key, JSON.stringify(token));
+        }
+        catch (e)
+        {
+            // The storage might be full, the token is still cached in memory
+        }
+    }
+}
+
+const refreshes = new Map();
+
+/**
+ * Requests a new token unless a request for the same key is already in flight, then the callback waits for its result
+ * @param {*} key - The cache key from `tokenKey`, or any other key if the token is not shared
+ * @param {Function} request - Requests the token, it is called at most once per key until `completeRefresh` is called
+ * @param {Function} callback - Called with the token or null if the request failed
+ */
+export function refreshToken(key, request, callback)
+{
+    const waiting = refreshes.get(key);
+    if (waiting)
+    {
+        waiting.push(callback);
+        return;
+    }
+    refreshes.set(key, [callback]);
+    request();
+}
+
+/**
+ * Completes the request of a key and passes the result to all waiting callbacks
+ * @param {*} key - The key passed to `refreshToken`
+ * @param {Object} token - The token with `access_token` and `expires_at` or null if the request failed
+ */
+export function completeRefresh(key, token)
+{
+    const waiting = refreshes.get(key) || [];
+    refreshes.delete(key);
+    waiting.forEach(callback => callback(token));
+}
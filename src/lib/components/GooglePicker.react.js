@@ -1,5 +1,7 @@
 import React, {Component} from 'react';
 import PropTypes from 'prop-types';
+import {GooglePicker as RealGooglePicker} from '../LazyLoader';
+import {preconnectGoogle} from '../ScriptLoader';
 
 /**
  * Dash Google Picker
@@ -17,13 +19,14 @@ import PropTypes from 'prop-types';
  * @prop {(string|array)} enabled_features - Features to enable in the picker
  * @prop {(string|array)} disabled_features - Features to disable in the picker
  * @prop {string} locale - The locale/language to be used by the picker
- *
- * State:
- * @state {bool} pickerInited - Indicates if the Google Picker API has been loaded
- * @state {bool} gisInited - Indicates if the Google Sign-in API has been loaded
- * @state {string} accessToken - The access token received from Google Sign-in
- * @state {bool} open - Determines if the picker is opened or not
- * @state {bool} pendingPicker - Indicates if there is a pending picker creation
+ * @prop {array} document_fields - Only these fields of the picked documents are sent to dash
+ * @prop {number} chunk_size - Send the picked documents in chunks of this size through `documents_chunk`
+ * @prop {object} documents_chunk_ack - Acknowledges the last received chunk so the next one gets sent
+ * @prop {bool} track_changes - Additionally send the documents added and removed since the previous pick
+ * @prop {string} load_strategy - When the Google scripts are loaded: `eager`, `idle` or `on_open`
+ * @prop {string} token_storage - Share access tokens between components: `memory`, `session` or `local`
+ * @prop {object} script_urls - Load the Google scripts from these urls instead, e.g. from a local stand-in for tests
+ * @prop {bool} measure_timings - Send the durations of loading and opening the picker through `timings`
  *
  * Default Props:
  * @default {bool} open - false
@@ -32,14 +35,16 @@ import PropTypes from 'prop-types';
  * @default {array} enabled_features - []
  * @default {array} disabled_features - []
  * @default {string} locale - null
+ * @default {array} document_fields - null
+ * @default {number} chunk_size - null
+ * @default {bool} track_changes - false
+ * @default {string} load_strategy - 'eager'
+ * @default {string} token_storage - null
+ * @default {object} script_urls - null
+ * @default {bool} measure_timings - false
  *
- * Methods:
- * @method loadGoogleApi - Loads Google API script
- * @method loadGoogleGsiClient - Loads Google Sign-in script
- * @method onApiLoad - Callback for Google API load
- * @method gisLoaded - Callback for Google Sign-in load
- * @method createPicker - Creates the Google Picker
- * @method pickerCallback - Callback for Google Picker actions
+ * The implementation is loaded lazily from a separate chunk when the component is mounted,
+ * or with the `on_open` load strategy when the picker is opened for the first time.
  */
 class GooglePicker extends Component 
 {
@@ -52,278 +57,35 @@ class GooglePicker extends Component
         super(props);
         this.state = 
         {
-            pickerInited: false,
-            gisInited: false,
-            accessToken: null,
-            open: props.open,
-            pendingPicker: false,
-        }
-        this.pickerCallback = this.pickerCallback.bind(this);
-    }
-
-    /**
-   * A lifecycle method that gets called immediately after a component is mounted
-   * This method is used to load Google API scripts and initialize the Google Picker
-   */
-    async componentDidMount() 
-    {
-        try 
-        {
-            await Promise.all([this.loadGoogleApi(), this.loadGoogleGsiClient()]);
-            if (this.state.pendingPicker) 
-            {
-                this.createPicker();
-            }
-        } 
-        catch (error)
-        {
-            console.error(error);
-        }
-    }
-    
-
-    /**
-   * This function is used to dynamically load Google API script into the HTML body
-   * @returns {Promise} Promise object represents the eventual completion or failure of loading Google API script
-   */
-    loadGoogleApi() 
-    {
-        return new Promise((resolve, reject) => 
-        {
-            const script = document.createElement('script');
-            script.src = 'https://apis.google.com/js/api.js';
-            script.async = true;
-            script.defer = true;
-            script.onload = () => resolve(this.onApiLoad());
-            script.onerror = () => reject(new Error('Failed to load Google API script'));
-            document.body.appendChild(script);
-        });
-    }
-    
-    /**
-   * This function is used to dynamically load Google gsi client script into the HTML body
-   * @returns {Promise} Promise object represents the eventual completion or failure of loading Google gsi client
-   */
-    loadGoogleGsiClient() 
-    {
-        return new Promise((resolve, reject) => 
-        {
-            const script = document.createElement('script');
-            script.src = 'https://accounts.google.com/gsi/client';
-            script.async = true;
-            script.defer = true;
-            script.onload = () => resolve(this.gisLoaded());
-            script.onerror = () => reject(new Error('Failed to load Google GSI Client script'));
-            document.body.appendChild(script);
-        });
-    }
-
-    /**
-   * This function is called after Google API script is loaded successfully
-   */
-    onApiLoad() 
-    {
-        window.gapi.load('picker', () => this.setState({ pickerInited: true }));
-    }
-
-    /**
-   * This function is called after Google One Tap script is loaded successfully
-   */
-    gisLoaded() 
-    {
-        this.tokenClient = window.google.accounts.oauth2.initTokenClient(
-        {
-            client_id: this.props.client_id,
-            scope: this.props.scope,
-            callback: '', // defined later
-        });
-        this.setState({ gisInited: true });
-    }
-
-    /**
-   * This function is used to create and display the Google Picker
-   * It also handles the access token needed for authorizing Google Drive access
-   */
-    createPicker() 
-    {
-        if(!this.state.pickerInited || !this.state.gisInited) 
-        {
-            this.setState({ shouldShowPicker: true });
-            return;
-        }
-
-        const showPicker = () => 
-        {
-            const pickerBuilder = new window.google.picker.PickerBuilder()
-                .setOAuthToken(this.state.accessToken)
-                .setDeveloperKey(this.props.developer_key)
-                .setCallback(this.pickerCallback);
-        
-            // Generate real viewgroups from the converted python data
-            const create_view_group = (view_group) =>
-            {
-                var viewGroup = new window.google.picker.ViewGroup(create_view(view_group.views[0]))
-                for (var i = 1; i < view_group.views.length; i++) 
-                {
-                    var viewToAdd = view_group.views[i];
-                    if (typeof viewToAdd === 'string')
-                    {
-                        viewGroup.addView(viewToAdd);
-                    }
-                    else if (typeof viewToAdd === 'object')
-                    {
-                        console.log(viewToAdd)
-                        if (viewToAdd.type === "ViewGroup") 
-                        {
-                            viewGroup.addView(create_view_group(viewToAdd));
-                        }
-                        if (viewToAdd.type === "View") 
-                        {
-                            viewGroup.addView(create_view(viewToAdd));
-                        }
-                    }
-                }
-                if (view_group.label)
-                {
-                    viewGroup.addLabel(view_group.label)
-                }
-                return viewGroup;
-            }
-
-            // Generate a real view from the converted python data
-            const create_view = (view_struct) =>
-            {
-                // Check if view_struct is actually a viewId
-                if (typeof view_struct === 'string')
-                {
-                    return new window.google.picker.View(view_struct)
-                }
-                var view = new window.google.picker.View(view_struct.viewId)
-                if (view_struct.mimeTypes)
-                {
-                    if (typeof view_struct.mimeTypes === 'string')
-                    {
-                        view_struct.mimeTypes = view_struct.mimeTypes
-                    }
-                    else
-                    {
-                        view.setMimeTypes(view_struct.mimeTypes.join(','));
-                    }
-                }
-                if (view_struct.query)
-                {
-                    view.setQuery(view_struct.query);
-                }
-                return view;
-            }
-
-            // Views can either be a viewid or a viewgroup, or an array containing any combination of the two
-            const views = Array.isArray(this.props.view_ids) ? this.props.view_ids : [this.props.view_ids];
-            views.forEach(view => 
-            {
-                if (typeof view === 'string') 
-                {
-                    pickerBuilder.addView(view);
-                } 
-                else if (typeof view === 'object')
-                {
-                    if (view.type === "View") 
-                    {
-                        pickerBuilder.addView(create_view(view));
-                    }
-                    if (view.type === "ViewGroup") 
-                    {
-                        pickerBuilder.addViewGroup(create_view_group(view));
-                    }
-                }
-            });
-        
-            // Enable features
-            const enabledFeatures = Array.isArray(this.props.enabled_features) ? this.props.enabled_features : [this.props.enabled_features];
-            enabledFeatures.forEach(feature => 
-            {
-                pickerBuilder.enableFeature(feature);
-            });
-
-            // Disable features
-            const disabledFeatures = Array.isArray(this.props.disabled_features) ? this.props.disabled_features : [this.props.disabled_features];
-            disabledFeatures.forEach(feature => 
-            {
-                pickerBuilder.disableFeature(feature);
-            });
-
-            // Set locale if provided
-            if (this.props.locale) 
-            {
-                pickerBuilder.setLocale(this.props.locale);
-            }
-
-            const picker = pickerBuilder.build();
-            picker.setVisible(true);
-        }
-        
-
-        // Request an access token
-        this.tokenClient.callback = async (response) => 
-        {
-            if (response.error !== undefined) 
-            {
-                throw (response);
-            }
-            this.setState({ accessToken: response.access_token });
-            showPicker();
-        };
-
-        if (this.state.accessToken === null) 
-        {
-            // Prompt the user to select a Google Account and ask for consent to share their data
-            // when establishing a new session
-            this.tokenClient.requestAccessToken({prompt: 'consent'});
-        } 
-        else 
-        {
-            // Skip display of account chooser and consent dialog for an existing session
-            this.tokenClient.requestAccessToken({prompt: ''});
+            requested: false,
         }
     }
 
     /**
-   * A lifecycle method that gets called when a component's props have been changed
-   * This method is used to update the component state and create Google Picker Popup if the `open` prop is changed
-   * @param {Object} prevProps - A collection of properties of the component before update
+   * Decides if the implementation should be loaded
+   * With the `on_open` load strategy it is only loaded once the picker is opened for the first time
+   * @param {Object} props - The current properties of the component
+   * @param {Object} state - The current state of the component
+   * @returns {Object} The state update or null if nothing changed
    */
-    componentDidUpdate(prevProps) 
+    static getDerivedStateFromProps(props, state) 
     {
-        if(this.props.open !== prevProps.open) 
+        if (!state.requested && (props.load_strategy !== 'on_open' || props.open))
         {
-            this.setState({ open: this.props.open }, () => 
-            {
-                this.createPicker();
-            });
+            return { requested: true };
         }
+        return null;
     }
 
     /**
-   * This function is a callback that gets called after the user selects any file/folder in Google Picker
-   * It updates the component state based on the selected files/folders
-   * @param {Object} data - The response data from Google Picker after user selection
+   * A lifecycle method that gets called immediately after a component is mounted
+   * This method is used to add preconnect hints for the `on_open` load strategy before the implementation is loaded
    */
-    pickerCallback(data) 
+    componentDidMount() 
     {
-        let action = data[window.google.picker.Response.ACTION];
-        let documents = null;
-
-        if (action === window.google.picker.Action.PICKED) 
-        {
-            documents = data[window.google.picker.Response.DOCUMENTS];
-        }
-        if (this.props.setProps) 
-        {
-            this.props.setProps({ action: action, ...(documents && {documents: documents}) });
-        } 
-        else 
+        if (this.props.load_strategy === 'on_open')
         {
-            this.setState({ action: action, ...(documents && {documents: documents}) });
+            preconnectGoogle();
         }
     }
 
@@ -332,9 +94,13 @@ class GooglePicker extends Component
    */
     render() 
     {
+        if (!this.state.requested)
+        {
+            return null;
+        }
         return (
             <React.Suspense fallback={null}>
-                
+                <RealGooglePicker {...this.props} />
             </React.Suspense>
         );
     }
@@ -369,6 +135,34 @@ GooglePicker.defaultProps =
      * No default locale set
      */
     locale: null,
+    /**
+     * All fields of the documents are sent by default
+     */
+    document_fields: null,
+    /**
+     * The documents are sent at once by default
+     */
+    chunk_size: null,
+    /**
+     * Changes are not tracked by default
+     */
+    track_changes: false,
+    /**
+     * The Google scripts are loaded immediately by default
+     */
+    load_strategy: 'eager',
+    /**
+     * Access tokens are only kept by the component itself by default
+     */
+    token_storage: null,
+    /**
+     * The Google scripts are loaded from Google by default
+     */
+    script_urls: null,
+    /**
+     * Timings are only measured in the browser by default
+     */
+    measure_timings: false,
     action: '',
     documents: null
 };
@@ -421,7 +215,7 @@ GooglePicker.propTypes =
     developer_key: PropTypes.string.isRequired,
 
     /**
-     * Features to enable in the picker
+     * Features to enable in the picker, a python FeatureSet sets both enabled and disabled features
      */
     enabled_features: PropTypes.oneOfType([
         PropTypes.string,
@@ -441,6 +235,93 @@ GooglePicker.propTypes =
      */
     locale: PropTypes.string,
 
+    /**
+     * Only these fields of the picked documents are sent to dash, all other fields are dropped in the browser
+     */
+    document_fields: PropTypes.arrayOf(PropTypes.string),
+
+    /**
+     * If set, the picked documents are not sent through `documents` but in chunks of this size through `documents_chunk`
+     */
+    chunk_size: PropTypes.number,
+
+    /**
+     * The last chunk of a chunked selection, contains the `selection_id`, the `sequence` number starting at 0,
+     * the `total` number of chunks, a `final` marker and the `documents` of this chunk
+     */
+    documents_chunk: PropTypes.shape({
+        selection_id: PropTypes.string,
+        sequence: PropTypes.number,
+        total: PropTypes.number,
+        final: PropTypes.bool,
+        documents: PropTypes.arrayOf(PropTypes.object),
+    }),
+
+    /**
+     * Acknowledges a chunk by its `selection_id` and `sequence`, the next chunk is sent once the previous one was acknowledged
+     */
+    documents_chunk_ack: PropTypes.shape({
+        selection_id: PropTypes.string,
+        sequence: PropTypes.number,
+    }),
+
+    /**
+     * If enabled, `documents_added` and `documents_removed` are sent in addition to the full selection
+     */
+    track_changes: PropTypes.bool,
+
+    /**
+     * The documents which were picked but not part of the previous selection, only set if `track_changes` is enabled
+     */
+    documents_added: PropTypes.arrayOf(PropTypes.object),
+
+    /**
+     * The documents of the previous selection which were not picked again, only set if `track_changes` is enabled
+     */
+    documents_removed: PropTypes.arrayOf(PropTypes.object),
+
+    /**
+     * When the Google scripts are loaded. `eager` loads them when the component is mounted, `idle` once the browser
+     * is idle after the page was loaded and `on_open` only when the picker is opened for the first time
+     */
+    load_strategy: PropTypes.oneOf(['eager', 'idle', 'on_open']),
+
+    /**
+     * Where valid access tokens are shared, keyed by `client_id` and `scope`. `memory` shares them with all pickers
+     * on the page, `session` additionally keeps them across reloads and `local` across tabs.
+     * If not set, every picker keeps its own token until the component is removed.
+     * Pickers sharing their tokens send at most one token request at a time, tokens are refreshed when a picker is opened.
+     * Tokens in the `session` and `local` storage can be read by any script on the page, so an XSS vulnerability exposes
+     * access to the Google Drive of the user. `local` additionally keeps them on disk until they expire, only use it with a
+     * strict Content Security Policy and the narrowest scope.
+     */
+    token_storage: PropTypes.oneOf(['memory', 'session', 'local']),
+
+    /**
+     * The urls of the Google API script (`api`) and the Google Identity Services client (`gsi_client`),
+     * by default they are loaded from Google. This allows loading a local stand-in for offline tests,
+     * in python the environment variable `DASH_GOOGLE_PICKER_SCRIPT_BASE` sets both at once.
+     * All pickers on a page share the scripts, so the urls of the picker which loads them first are used.
+     */
+    script_urls: PropTypes.shape({
+        api: PropTypes.string,
+        gsi_client: PropTypes.string,
+    }),
+
+    /**
+     * If enabled, the durations of loading and opening the picker are sent through `timings`.
+     * The phases are always visible in the performance panel of the browser.
+     */
+    measure_timings: PropTypes.bool,
+
+    /**
+     * The durations in milliseconds of the phases since the previous update, only set if `measure_timings` is enabled:
+     * `scripts`, `api_download`, `gsi_client_download`, `gapi_load`, `init_token_client`, `token` (including the consent popup),
+     * `build`, `render` and `open` from opening until the picker is loaded. `sent_at` is the time in milliseconds since the epoch
+     * when the update was sent, see `dash_google_picker.Metrics.TimingHistogram`.
+     */
+    timings: PropTypes.objectOf(PropTypes.number),
+
     /**
      * The current action performed in the picker
      */
@@ -0,0 +1,33 @@
+/**
+ * Canonical form of the enabled and disabled features, mirrors `FeatureSet` of the python package.
+ */
+
+/**
+ * Returns the features as sorted array without duplicates
+ * @param {(string|Array)} features - A single feature, an array of features or null
+ * @returns {Array} The sorted and unique features
+ */
+function uniqueFeatures(features)
+{
+    if (features === null || features === undefined)
+    {
+        return [];
+    }
+    return Array.from(new Set(Array.isArray(features) ? features : [features])).sort();
+}
+
+/**
+ * Removes duplicated features and features which are enabled and disabled, the disabled ones win
+ * @param {(string|Array)} enabled - The enabled features
+ * @param {(string|Array)} disabled - The disabled features
+ * @returns {Object} The sorted `enabled` and `disabled` features
+ */
+export function normalizeFeatures(enabled, disabled)
+{
+    const disabledFeatures = uniqueFeatures(disabled);
+    const disabledSet = new Set(disabledFeatures);
+    return {
+        enabled: uniqueFeatures(enabled).filter(feature => !disabledSet.has(feature)),
+        disabled: disabledFeatures,
+    };
+}
@@ -0,0 +1,714 @@
+import {Component} from 'react';
+import {GOOGLE_API_URL, GOOGLE_GSI_CLIENT_URL, getLoadTimings, loadGoogleApi, loadGoogleGsiClient, preconnectGoogle, runWhenIdle} from '../ScriptLoader';
+import {completeRefresh, readToken, refreshToken, storeToken, tokenKey} from '../TokenCache';
+import {validatePickerProps} from '../validation';
+import {normalizeFeatures} from '../features';
+import {PhaseTimer} from '../timings';
+import {propTypes, defaultProps} from '../components/GooglePicker.react';
+
+const MILLISECONDS = 1000;
+// A token is only reused if it is valid for at least another five minutes, otherwise a new one is requested when the picker is opened
+const TOKEN_REFRESH_MARGIN = 5 * 60 * MILLISECONDS;
+
+/**
+ * The implementation of the Dash Google Picker, loaded lazily by the GooglePicker component
+ * All props are documented in the GooglePicker component.
+ *
+ * State:
+ * @state {bool} pickerInited - Indicates if the Google Picker API has been loaded
+ * @state {bool} gisInited - Indicates if the Google Sign-in API has been loaded
+ * @state {string} accessToken - The access token received from Google Sign-in
+ * @state {bool} open - Determines if the picker is opened or not
+ * @state {bool} pendingPicker - Indicates if there is a pending picker creation
+ *
+ * Methods:
+ * @method loadScripts - Loads all Google scripts once
+ * @method recordScriptTimings - Records the load timings of the Google scripts
+ * @method loadGoogleApi - Loads Google API script
+ * @method loadGoogleGsiClient - Loads Google Sign-in script
+ * @method onApiLoad - Callback for Google API load
+ * @method gisLoaded - Callback for Google Sign-in load
+ * @method createPicker - Creates the Google Picker
+ * @method showPicker - Builds and shows the Google Picker, or shows the previously built one
+ * @method features - Returns the canonical enabled and disabled features
+ * @method pickerConfigKey - Serializes the picker configuration
+ * @method validAccessToken - Returns the access token if it is still valid
+ * @method tokenRequestKey - Returns the key which shares token requests between pickers
+ * @method onTokenResponse - Callback for the token client
+ * @method receiveToken - Uses a requested token and shows the picker if it was waiting for it
+ * @method useToken - Uses a token for this component
+ * @method pickerCallback - Callback for Google Picker actions
+ * @method sendNextChunk - Sends the next chunk of a chunked selection
+ * @method diffSelection - Compares the picked documents with the previous selection
+ */
+class RealGooglePicker extends Component 
+{
+    /**
+   * Creates the React/Dash component.
+   * @param {Object} props - A collection of properties passed to the component
+   */
+    constructor(props) 
+    {
+        super(props);
+        this.state = 
+        {
+            pickerInited: false,
+            gisInited: false,
+            accessToken: null,
+            open: props.open,
+            pendingPicker: false,
+        }
+        this.pickerCallback = this.pickerCallback.bind(this);
+        this.timer = new PhaseTimer(props.id);
+        this.pendingSelection = null;
+        this.selectionCount = 0;
+        this.previousSelection = new Map();
+    }
+
+    /**
+   * A lifecycle method that gets called immediately after a component is mounted
+   * This method is used to load Google API scripts according to the `load_strategy` and to open the picker if `open` is set
+   */
+    componentDidMount() 
+    {
+        switch (this.props.load_strategy)
+        {
+            case 'on_open':
+                preconnectGoogle();
+                break;
+            case 'idle':
+                preconnectGoogle();
+                runWhenIdle(() => this.loadScripts());
+                break;
+            default:
+                this.loadScripts();
+        }
+        if (this.props.open)
+        {
+            this.createPicker();
+        }
+    }
+
+    /**
+   * This function is used to load all Google scripts, it only starts loading once per component
+   * A picker which was requested while the scripts were loading is created afterwards
+   * @returns {Promise} Promise object represents the eventual completion or failure of loading all scripts
+   */
+    loadScripts() 
+    {
+        if (!this.scriptsLoaded)
+        {
+            this.timer.start('scripts');
+            const requestedAt = window.performance.now();
+            this.scriptsLoaded = Promise.all([this.loadGoogleApi(), this.loadGoogleGsiClient()])
+                .then(() => 
+                {
+                    this.timer.end('scripts');
+                    this.recordScriptTimings(requestedAt);
+                    if (this.state.pendingPicker && !this.unmounted) 
+                    {
+                        this.setState({ pendingPicker: false });
+                        this.createPicker();
+                    }
+                })
+                .catch(error => 
+                {
+                    this.scriptsLoaded = null;
+                    this.timer.cancel('scripts');
+                    this.timer.cancel('open');
+                    if (!this.unmounted)
+                    {
+                        this.setState({ pendingPicker: false });
+                    }
+                    console.error(error);
+                });
+        }
+        return this.scriptsLoaded;
+    }
+
+    /**
+   * Records how long downloading the scripts and loading the picker module took,
+   * unless they were already loaded by another picker before this one requested them
+   * @param {number} requestedAt - The time from `performance.now()` when this picker requested the scripts
+   */
+    recordScriptTimings(requestedAt) 
+    {
+        const urls = this.props.script_urls || {};
+        const loadTimings = getLoadTimings();
+        [
+            ['api_download', urls.api || GOOGLE_API_URL],
+            ['gsi_client_download', urls.gsi_client || GOOGLE_GSI_CLIENT_URL],
+            ['gapi_load', 'gapi.load(picker)'],
+        ].forEach(([phase, name]) => 
+        {
+            const timing = loadTimings[name];
+            if (timing && timing.end >= requestedAt)
+            {
+                this.timer.record(phase, timing.duration);
+            }
+        });
+    }
+
+    /**
+   * This function is used to load the Google API script and the picker module
+   * The script is shared by all GooglePicker components and only loaded once per page
+   * @returns {Promise} Promise object represents the eventual completion or failure of loading Google API script
+   */
+    loadGoogleApi() 
+    {
+        const urls = this.props.script_urls || {};
+        return loadGoogleApi(urls.api || undefined).then(() => this.onApiLoad());
+    }
+    
+    /**
+   * This function is used to load the Google gsi client script
+   * The script is shared by all GooglePicker components and only loaded once per page
+   * @returns {Promise} Promise object represents the eventual completion or failure of loading Google gsi client
+   */
+    loadGoogleGsiClient() 
+    {
+        const urls = this.props.script_urls || {};
+        return loadGoogleGsiClient(urls.gsi_client || undefined).then(() => this.gisLoaded());
+    }
+
+    /**
+   * This function is called after Google API script and the picker module are loaded successfully
+   */
+    onApiLoad() 
+    {
+        if (!this.unmounted)
+        {
+            this.setState({ pickerInited: true });
+        }
+    }
+
+    /**
+   * This function is called after Google One Tap script is loaded successfully
+   */
+    gisLoaded() 
+    {
+        if (this.unmounted)
+        {
+            return;
+        }
+        this.timer.start('init_token_client');
+        this.tokenClient = window.google.accounts.oauth2.initTokenClient(
+        {
+            client_id: this.props.client_id,
+            scope: this.props.scope,
+            callback: (response) => this.onTokenResponse(response),
+            error_callback: (error) => 
+            {
+                console.error(error);
+                completeRefresh(this.tokenRequestKey(), null);
+            },
+        });
+        this.timer.end('init_token_client');
+        this.setState({ gisInited: true });
+    }
+
+    /**
+   * This function is used to create and display the Google Picker
+   * It also handles the access token needed for authorizing Google Drive access,
+   * a cached token is reused as long as it is valid instead of requesting a new one
+   */
+    createPicker()
+    {
+        // Fail before loading scripts or asking the user for consent if the configuration can not work
+        const validation = validatePickerProps({ ...this.props, enabled_features: this.features().enabled });
+        validation.warnings.forEach(warning => console.warn(warning));
+        if (validation.errors.length)
+        {
+            // Only report the errors, changing `open` here would trigger another attempt through componentDidUpdate
+            validation.errors.forEach(error => console.error(error));
+            this.timer.cancel('open');
+            return;
+        }
+
+        this.timer.start('open');
+        if(!this.state.pickerInited || !this.state.gisInited)
+        {
+            // Queue the request until the scripts are loaded, this also starts loading them for `on_open` and `idle`
+            this.setState({ pendingPicker: true });
+            this.loadScripts();
+            return;
+        }
+
+        const accessToken = this.validAccessToken();
+        if (accessToken)
+        {
+            this.showPicker(accessToken);
+            return;
+        }
+
+        // Tokens are only requested while the picker is opened, so the popup of the request is not blocked by the browser.
+        // Pickers sharing their tokens wait for a request which is already in flight instead of opening another popup
+        this.timer.start('token');
+        refreshToken(this.tokenRequestKey(), () => 
+        {
+            if (this.state.accessToken === null) 
+            {
+                // Prompt the user to select a Google Account and ask for consent to share their data
+                // when establishing a new session
+                this.tokenClient.requestAccessToken({prompt: 'consent'});
+            } 
+            else 
+            {
+                // Skip display of account chooser and consent dialog for an existing session
+                this.tokenClient.requestAccessToken({prompt: ''});
+            }
+        }, (token) => this.receiveToken(token));
+    }
+
+    /**
+   * This function is used to build and display the Google Picker
+   * The built picker is kept and shown again as long as the configuration did not change
+   * @param {string} accessToken - A valid access token
+   */
+    showPicker(accessToken) 
+    {
+        // Reuse the previously built picker as long as its configuration did not change
+        const configKey = this.pickerConfigKey(accessToken);
+        if (this.picker && this.pickerConfigKeyOfBuilt === configKey)
+        {
+            this.timer.start('render');
+            this.picker.setVisible(true);
+            return;
+        }
+        if (this.picker)
+        {
+            this.picker.dispose();
+        }
+
+        this.timer.start('build');
+        const pickerBuilder = new window.google.picker.PickerBuilder()
+            .setOAuthToken(accessToken)
+            .setDeveloperKey(this.props.developer_key)
+            .setCallback(this.pickerCallback);
+    
+        // Generate real viewgroups from the converted python data
+        const create_view_group = (view_group) =>
+        {
+            var viewGroup = new window.google.picker.ViewGroup(create_view(view_group.views[0]))
+            for (var i = 1; i < view_group.views.length; i++) 
+            {
+                var viewToAdd = view_group.views[i];
+                if (typeof viewToAdd === 'string')
+                {
+                    viewGroup.addView(viewToAdd);
+                }
+                else if (typeof viewToAdd === 'object')
+                {
+                    console.log(viewToAdd)
+                    if (viewToAdd.type === "ViewGroup") 
+                    {
+                        viewGroup.addView(create_view_group(viewToAdd));
+                    }
+                    if (viewToAdd.type === "View") 
+                    {
+                        viewGroup.addView(create_view(viewToAdd));
+                    }
+                }
+            }
+            if (view_group.label)
+            {
+                viewGroup.addLabel(view_group.label)
+            }
+            return viewGroup;
+        }
+
+        // Generate a real view from the converted python data
+        const create_view = (view_struct) =>
+        {
+            // Check if view_struct is actually a viewId
+            if (typeof view_struct === 'string')
+            {
+                return new window.google.picker.View(view_struct)
+            }
+            var view = new window.google.picker.View(view_struct.viewId)
+            if (view_struct.mimeTypes)
+            {
+                if (typeof view_struct.mimeTypes === 'string')
+                {
+                    view_struct.mimeTypes = view_struct.mimeTypes
+                }
+                else
+                {
+                    view.setMimeTypes(view_struct.mimeTypes.join(','));
+                }
+            }
+            if (view_struct.query)
+            {
+                view.setQuery(view_struct.query);
+            }
+            return view;
+        }
+
+        // Views can either be a viewid or a viewgroup, or an array containing any combination of the two
+        const views = Array.isArray(this.props.view_ids) ? this.props.view_ids : [this.props.view_ids];
+        views.forEach(view => 
+        {
+            if (typeof view === 'string') 
+            {
+                pickerBuilder.addView(view);
+            } 
+            else if (typeof view === 'object')
+            {
+                if (view.type === "View") 
+                {
+                    pickerBuilder.addView(create_view(view));
+                }
+                if (view.type === "ViewGroup") 
+                {
+                    pickerBuilder.addViewGroup(create_view_group(view));
+                }
+            }
+        });
+    
+        // Enable and disable features, every feature is only set once
+        const features = this.features();
+        features.enabled.forEach(feature => 
+        {
+            pickerBuilder.enableFeature(feature);
+        });
+        features.disabled.forEach(feature => 
+        {
+            pickerBuilder.disableFeature(feature);
+        });
+
+        // Set locale if provided
+        if (this.props.locale) 
+        {
+            pickerBuilder.setLocale(this.props.locale);
+        }
+
+        this.picker = pickerBuilder.build();
+        this.pickerConfigKeyOfBuilt = configKey;
+        this.timer.end('build');
+        this.timer.start('render');
+        this.picker.setVisible(true);
+    }
+
+    /**
+   * Returns the canonical enabled and disabled features
+   * They are only normalized again if one of the feature props was replaced, so the result can be compared by identity
+   * @returns {Object} The sorted `enabled` and `disabled` features
+   */
+    features() 
+    {
+        if (this.featureInputs !== this.props.enabled_features || this.disabledFeatureInputs !== this.props.disabled_features)
+        {
+            this.featureInputs = this.props.enabled_features;
+            this.disabledFeatureInputs = this.props.disabled_features;
+            this.normalizedFeatures = normalizeFeatures(this.props.enabled_features, this.props.disabled_features);
+        }
+        return this.normalizedFeatures;
+    }
+
+    /**
+   * Serializes everything a built picker depends on, so configurations are compared exactly
+   * It is only serialized again if one of the props or the token was replaced
+   * @param {string} accessToken - The access token used by the picker
+   * @returns {string} The serialized configuration
+   */
+    pickerConfigKey(accessToken) 
+    {
+        const inputs = [
+            this.props.view_ids,
+            this.features(),
+            this.props.locale,
+            this.props.developer_key,
+            accessToken,
+        ];
+        const previous = this.pickerConfigInputs;
+        if (!previous || inputs.some((input, index) => input !== previous[index]))
+        {
+            this.pickerConfigInputs = inputs;
+            this.pickerConfigKeyValue = JSON.stringify(inputs);
+        }
+        return this.pickerConfigKeyValue;
+    }
+
+    /**
+   * Returns the access token if it is still valid, also considers the shared token cache if `token_storage` is set
+   * @returns {string} A valid access token or null
+   */
+    validAccessToken() 
+    {
+        if (this.state.accessToken && this.tokenExpiresAt - TOKEN_REFRESH_MARGIN > Date.now())
+        {
+            return this.state.accessToken;
+        }
+        if (this.props.token_storage)
+        {
+            const token = readToken(tokenKey(this.props.client_id, this.props.scope), this.props.token_storage, TOKEN_REFRESH_MARGIN);
+            if (token)
+            {
+                this.useToken(token);
+                return token.access_token;
+            }
+        }
+        return null;
+    }
+
+    /**
+   * Returns the key which shares token requests, the cache key if `token_storage` is set and the component itself otherwise
+   * @returns {*} The key of the token requests
+   */
+    tokenRequestKey() 
+    {
+        return this.props.token_storage ? tokenKey(this.props.client_id, this.props.scope) : this;
+    }
+
+    /**
+   * This function is called with the response of the token client
+   * It stores the token with its expiry time and passes it to all pickers waiting for it
+   * @param {Object} response - The token response of the Google Identity Services
+   */
+    onTokenResponse(response) 
+    {
+        if (response.error !== undefined) 
+        {
+            console.error(response);
+            completeRefresh(this.tokenRequestKey(), null);
+            return;
+        }
+        const token = 
+        {
+            access_token: response.access_token,
+            expires_at: Date.now() + Number(response.expires_in) * MILLISECONDS,
+        };
+        if (this.props.token_storage)
+        {
+            storeToken(tokenKey(this.props.client_id, this.props.scope), this.props.token_storage, token);
+        }
+        completeRefresh(this.tokenRequestKey(), token);
+    }
+
+    /**
+   * This function is called with the result of a token request made by this or another picker
+   * @param {Object} token - The token with `access_token` and `expires_at` or null if the request failed
+   */
+    receiveToken(token) 
+    {
+        if (this.unmounted)
+        {
+            return;
+        }
+        if (token === null)
+        {
+            this.timer.cancel('token');
+            this.timer.cancel('open');
+            return;
+        }
+        this.timer.end('token');
+        this.useToken(token);
+        this.showPicker(token.access_token);
+    }
+
+    /**
+   * Uses a token for this component until it expires, it is not refreshed in the background
+   * but only once the picker is opened again
+   * @param {Object} token - The token with `access_token` and `expires_at`
+   */
+    useToken(token) 
+    {
+        this.tokenExpiresAt = token.expires_at;
+        this.setState({ accessToken: token.access_token });
+    }
+
+    /**
+   * A lifecycle method that gets called before the component is removed
+   * The shared scripts stay loaded for other GooglePicker components
+   */
+    componentWillUnmount() 
+    {
+        this.unmounted = true;
+        if (this.picker)
+        {
+            this.picker.dispose();
+        }
+    }
+
+    /**
+   * A lifecycle method that gets called when a component's props have been changed
+   * This method is used to update the component state and create Google Picker Popup if the `open` prop is changed
+   * @param {Object} prevProps - A collection of properties of the component before update
+   */
+    componentDidUpdate(prevProps) 
+    {
+        if(this.props.open !== prevProps.open) 
+        {
+            this.setState({ open: this.props.open }, () => 
+            {
+                this.createPicker();
+            });
+        }
+        if(this.props.documents_chunk_ack !== prevProps.documents_chunk_ack) 
+        {
+            const ack = this.props.documents_chunk_ack;
+            const selection = this.pendingSelection;
+            if (ack && selection && ack.selection_id === selection.selection_id && ack.sequence === selection.sequence)
+            {
+                this.sendNextChunk();
+            }
+        }
+    }
+
+    /**
+   * Updates the props through dash or the local state if the component is used without dash
+   * @param {Object} props - The props to update
+   */
+    updateProps(props) 
+    {
+        if (this.props.setProps) 
+        {
+            this.props.setProps(props);
+        } 
+        else 
+        {
+            this.setState(props);
+        }
+    }
+
+    /**
+   * Sends the next chunk of the pending selection through `documents_chunk`
+   * The following chunk is only sent once dash acknowledged this one through `documents_chunk_ack`,
+   * so at most one chunk is in flight and the server processes the selection batch by batch
+   * @param {Object} extraProps - Additional props to update together with the chunk
+   */
+    sendNextChunk(extraProps = {}) 
+    {
+        const selection = this.pendingSelection;
+        const sequence = selection.sequence + 1;
+        const start = sequence * this.props.chunk_size;
+        const final = sequence === selection.total - 1;
+        selection.sequence = sequence;
+        if (final)
+        {
+            this.pendingSelection = null;
+        }
+        this.updateProps({
+            ...extraProps,
+            documents_chunk: 
+            {
+                selection_id: selection.selection_id,
+                sequence: sequence,
+                total: selection.total,
+                final: final,
+                documents: selection.documents.slice(start, start + this.props.chunk_size),
+            }
+        });
+    }
+
+    /**
+   * This function is a callback that gets called after the user selects any file/folder in Google Picker
+   * It updates the component state based on the selected files/folders
+   * @param {Object} data - The response data from Google Picker after user selection
+   */
+    pickerCallback(data) 
+    {
+        let action = data[window.google.picker.Response.ACTION];
+        let documents = null;
+        let changes = null;
+
+        if (action === window.google.picker.Action.LOADED)
+        {
+            this.timer.end('render');
+            this.timer.end('open');
+        }
+        // The time it was sent at lets the server measure the way back to dash
+        const timings = this.props.measure_timings ? { timings: { ...this.timer.take(), sent_at: Date.now() } } : null;
+
+        if (action === window.google.picker.Action.PICKED) 
+        {
+            const picked = data[window.google.picker.Response.DOCUMENTS];
+            documents = picked;
+            // Drop unused fields before they get serialized and sent to the server
+            let fields = this.props.document_fields;
+            if (fields && fields.length > 0)
+            {
+                // The id is needed to apply the changes on the server
+                if (this.props.track_changes && !fields.includes('id'))
+                {
+                    fields = ['id', ...fields];
+                }
+                documents = picked.map(doc => 
+                {
+                    const projected = {};
+                    fields.forEach(field => 
+                    {
+                        if (field in doc)
+                        {
+                            projected[field] = doc[field];
+                        }
+                    });
+                    return projected;
+                });
+            }
+            if (this.props.track_changes)
+            {
+                changes = this.diffSelection(picked, documents);
+            }
+        }
+        if (documents && this.props.chunk_size > 0)
+        {
+            this.selectionCount += 1;
+            this.pendingSelection = 
+            {
+                selection_id: `${Date.now().toString(36)}-${this.selectionCount}`,
+                documents: documents,
+                sequence: -1,
+                total: Math.max(1, Math.ceil(documents.length / this.props.chunk_size)),
+            };
+            this.sendNextChunk({ action: action, ...changes, ...timings });
+            return;
+        }
+        this.updateProps({ action: action, ...(documents && {documents: documents}), ...changes, ...timings });
+    }
+
+    /**
+   * Compares the picked documents with the previous selection by their id
+   * @param {Array} picked - The documents returned by the Google Picker
+   * @param {Array} documents - The documents which are sent to dash, in the same order as `picked`
+   * @returns {Object} The `documents_added` and `documents_removed` since the previous selection
+   */
+    diffSelection(picked, documents) 
+    {
+        const previous = this.previousSelection;
+        const current = new Map();
+        const added = [];
+        picked.forEach((doc, index) => 
+        {
+            current.set(doc.id, documents[index]);
+            if (!previous.has(doc.id))
+            {
+                added.push(documents[index]);
+            }
+        });
+        const removed = [];
+        previous.forEach((doc, id) => 
+        {
+            if (!current.has(id))
+            {
+                removed.push(doc);
+            }
+        });
+        this.previousSelection = current;
+        return { documents_added: added, documents_removed: removed };
+    }
+
+    /**
+   * A lifecycle method that defines the render output of the component
+   * The Google Picker is opened in its own window, so nothing is rendered
+   */
+    render() 
+    {
+        return null;
+    }
+}
+
+RealGooglePicker.defaultProps = defaultProps;
+RealGooglePicker.propTypes = propTypes;
+
+export default RealGooglePicker;
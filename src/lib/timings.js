@@ -0,0 +1,96 @@
+/**
+ * Measures the phases of loading and opening a GooglePicker with `performance.mark` and `performance.measure`.
+ *
+ * The measures are visible in the performance panel of the browser as `dash_google_picker:<id>:<phase>`,
+ * the durations are collected until they are sent to dash.
+ */
+
+/**
+ * Checks if the User Timing API is available
+ * @returns {bool} If `performance.mark` and `performance.measure` can be used
+ */
+function userTimingAvailable()
+{
+    return Boolean(window.performance && window.performance.mark && window.performance.measure);
+}
+
+export class PhaseTimer
+{
+    /**
+     * Creates a timer for one component
+     * @param {string} id - The id of the component, used to distinguish the marks of multiple pickers
+     */
+    constructor(id)
+    {
+        this.prefix = `dash_google_picker:${id}:`;
+        this.running = new Set();
+        this.durations = {};
+    }
+
+    /**
+     * Starts a phase, a phase which is already running is not restarted
+     * @param {string} phase - The name of the phase
+     */
+    start(phase)
+    {
+        if (this.running.has(phase) || !userTimingAvailable())
+        {
+            return;
+        }
+        this.running.add(phase);
+        window.performance.mark(`${this.prefix}${phase}:start`);
+    }
+
+    /**
+     * Ends a running phase and records its duration
+     * @param {string} phase - The name of the phase
+     */
+    end(phase)
+    {
+        if (!this.running.has(phase))
+        {
+            return;
+        }
+        this.running.delete(phase);
+        const name = this.prefix + phase;
+        window.performance.mark(`${name}:end`);
+        window.performance.measure(name, `${name}:start`, `${name}:end`);
+        const entries = window.performance.getEntriesByName(name, 'measure');
+        this.record(phase, entries[entries.length - 1].duration);
+        window.performance.clearMarks(`${name}:start`);
+        window.performance.clearMarks(`${name}:end`);
+    }
+
+    /**
+     * Stops a running phase without recording it, e.g. if it failed
+     * @param {string} phase - The name of the phase
+     */
+    cancel(phase)
+    {
+        if (this.running.delete(phase))
+        {
+            window.performance.clearMarks(`${this.prefix}${phase}:start`);
+        }
+    }
+
+    /**
+     * Records the duration of a phase which was measured elsewhere
+     * @param {string} phase - The name of the phase
+     * @param {number} duration - The duration in milliseconds
+     */
+    record(phase, duration)
+    {
+        this.durations[phase] = duration;
+    }
+
+    /**
+     * Returns all durations recorded since the last call
+     * @returns {Object} The duration in milliseconds of every phase
+     */
+    take()
+    {
+        const durations = this.durations;
+        this.durations = {};
+        return durations;
+    }
+}
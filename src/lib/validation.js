@@ -0,0 +1,85 @@
+/**
+ * Validation of view ids, features and mimeTypes before the Google Picker is opened.
+ *
+ * The tables are generated from `dash_google_picker/Validation.py` with `npm run build:validation`,
+ * so the python wrapper and the react component always agree on what is valid.
+ */
+import table from './validationTable.json';
+
+const knownViewIds = new Set(table.knownViewIds);
+const deprecatedViewIds = new Set(table.deprecatedViewIds);
+const deprecatedFeatures = new Set(table.deprecatedFeatures);
+const brokenFeatures = new Set(table.brokenFeatures);
+const mimeTypeRegex = new RegExp(table.mimeTypePattern);
+
+/**
+ * Returns a value as array
+ * @param {*} value - A single value, an array or null
+ * @returns {Array} The values
+ */
+function asArray(value)
+{
+    if (value === null || value === undefined)
+    {
+        return [];
+    }
+    return Array.isArray(value) ? value : [value];
+}
+
+/**
+ * Validates a view id, a View or a ViewGroup
+ * @param {*} view - The view id string or the json of a View or ViewGroup
+ * @param {Object} result - The errors and warnings which are extended
+ */
+function validateView(view, result)
+{
+    if (typeof view === 'string')
+    {
+        if (!knownViewIds.has(view))
+        {
+            result.errors.push(`'${view}' is not a valid view id and would return a 500 error`);
+        }
+        else if (deprecatedViewIds.has(view))
+        {
+            result.warnings.push(`The view id '${view}' is deprecated and will return a 403 error`);
+        }
+    }
+    else if (view && view.type === 'View')
+    {
+        validateView(view.viewId, result);
+        asArray(view.mimeTypes).forEach(mimeType =>
+        {
+            if (typeof mimeType !== 'string' || !mimeTypeRegex.test(mimeType))
+            {
+                result.errors.push(`'${mimeType}' is not a valid mimeType`);
+            }
+        });
+    }
+    else if (view && view.type === 'ViewGroup')
+    {
+        view.views.forEach(child => validateView(child, result));
+    }
+}
+
+/**
+ * Validates the configuration of a GooglePicker
+ * @param {Object} props - The properties of the GooglePicker
+ * @returns {Object} The `errors` which prevent the picker from working and `warnings` for configurations which will most likely fail
+ */
+export function validatePickerProps(props)
+{
+    const result = { errors: [], warnings: [] };
+    asArray(props.view_ids).forEach(view => validateView(view, result));
+    asArray(props.enabled_features).forEach(feature =>
+    {
+        if (brokenFeatures.has(feature))
+        {
+            result.errors.push(`Enabling the feature '${feature}' breaks the Google Picker`);
+        }
+        else if (deprecatedFeatures.has(feature))
+        {
+            result.warnings.push(`The feature '${feature}' is deprecated and will return a 403 error if enabled`);
+        }
+    });
+    return result;
+}
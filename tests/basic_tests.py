@@ -39,4 +39,33 @@ def test_google_popup(dash_duo):
         print("No new window was opened.")
         assert False 
 
-# Further tests are not easily possible since google forbids automated logins.
\ No newline at end of file
+# Further tests against Google are not easily possible since google forbids automated logins,
+# the following tests use the local stand-ins for the Google scripts instead.
+
+def test_pick_with_fake_google(dash_duo):
+    """
+    Test opening the picker and picking 5000 documents with the fake Google scripts.
+    """
+    from dash import Dash, html, Input, Output
+    from dash_google_picker import GooglePicker
+    from tests.fake_google.server import FakeGoogleServer
+
+    with FakeGoogleServer(latency=0.05, document_count=5000) as server:
+        app = Dash(__name__)
+        app.layout = html.Div([
+            html.Button('Open Google Picker', id='open-picker-button', n_clicks=0),
+            GooglePicker(id='google-picker', client_id='fake-client-id', developer_key='fake-developer-key', script_urls=server.script_urls),
+            html.Div(id='document-count'),
+        ])
+
+        @app.callback(Output('google-picker', 'open'), Input('open-picker-button', 'n_clicks'), prevent_initial_call=True)
+        def open_picker(n_clicks):
+            return True
+
+        @app.callback(Output('document-count', 'children'), Input('google-picker', 'documents'), prevent_initial_call=True)
+        def count_documents(documents):
+            return str(len(documents))
+
+        dash_duo.start_server(app)
+        dash_duo.find_element('#open-picker-button').click()
+        dash_duo.wait_for_text_to_equal('#document-count', '5000', timeout=10)
\ No newline at end of file
@@ -0,0 +1,175 @@
+import copy
+import pickle
+import pytest
+from array import array
+from dash_google_picker.Documents import GoogleDocuments, GoogleDocument, GoogleDocumentTable, DocumentChunkAccumulator, DocumentSelection, document_fields, to_dataframe, to_arrow
+
+DOCUMENTS = [
+    {"id": "1", "name": "report.pdf", "mimeType": "application/pdf", "sizeBytes": 1024, "lastEditedUtc": 1693900000000},
+    {"id": "2", "name": "notes", "mimeType": "application/vnd.google-apps.document", "lastEditedUtc": 1693900000001},
+    {"id": "3", "name": "invoice.pdf", "mimeType": "application/pdf", "sizeBytes": 2048, "lastEditedUtc": 1693900000002},
+]
+
+def test_list_api():
+    """
+    Test that the list based api keeps working.
+    """
+    docs = GoogleDocuments(DOCUMENTS)
+    assert [doc.id for doc in docs] == ["1", "2", "3"]
+    assert GoogleDocuments(None) == []
+
+def test_table_columns():
+    """
+    Test that the table stores every field in a single compact column.
+    """
+    table = GoogleDocuments.table(DOCUMENTS)
+    assert isinstance(table, GoogleDocumentTable)
+    assert len(table) == 3
+    assert table.column("id") == ["1", "2", "3"]
+    assert isinstance(table.column("lastEditedUtc"), array)
+    assert table.column("sizeBytes") == [1024, None, 2048]
+    assert table.column("mimeType")[0] is table.column("mimeType")[2]
+
+def test_table_rows_projection_and_filter():
+    """
+    Test row views, projection and filtering by mimeType.
+    """
+    table = GoogleDocuments.table(DOCUMENTS)
+    assert [row.name for row in table] == ["report.pdf", "notes", "invoice.pdf"]
+    assert table[-1].id == "3"
+    assert table[1].sizeBytes is None
+
+    projected = table.select("id", "mimeType")
+    assert projected.fields == ["id", "mimeType"]
+    assert sorted(dir(projected[0])) == ["id", "mimeType"]
+
+    pdfs = table.filter_mime_type("application/pdf")
+    assert len(pdfs) == 2
+    assert pdfs.column("id") == ["1", "3"]
+    assert list(pdfs.column("lastEditedUtc")) == [1693900000000, 1693900000002]
+    assert pdfs.to_dicts()[1]["name"] == "invoice.pdf"
+
+def test_table_rows_pickle_and_copy():
+    """
+    Test that rows and tables can be pickled and copied, e.g. by a disk cache or a task queue.
+    """
+    table = GoogleDocuments.table(DOCUMENTS)
+    row = pickle.loads(pickle.dumps(table[2]))
+    assert row.to_dict() == table[2].to_dict() and row.name == "invoice.pdf"
+    assert copy.copy(table[0]).id == "1" and copy.deepcopy(table[1]).sizeBytes is None
+    assert pickle.loads(pickle.dumps(table)).column("id") == ["1", "2", "3"]
+
+def test_empty_table():
+    """
+    Test that empty selections produce an empty table.
+    """
+    assert len(GoogleDocuments.table(None)) == 0
+    assert list(GoogleDocuments.table([])) == []
+
+def test_lazy_documents():
+    """
+    Test that lazy documents wrap the payload and behave like eager documents.
+    """
+    payload = dict(DOCUMENTS[0], thumbnails=[{"url": "https://example.com/thumb.png", "width": 32}])
+    eager = GoogleDocuments([payload])[0]
+    lazy = GoogleDocuments.lazy([payload])[0]
+    assert isinstance(lazy, GoogleDocument)
+    assert lazy._payload is payload
+    assert "name" not in lazy.__dict__
+
+    public = lambda obj: [prop for prop in dir(obj) if not prop.startswith("__")]
+    assert public(lazy) == public(eager)
+    assert {prop: getattr(lazy, prop) for prop in public(lazy)} == {prop: getattr(eager, prop) for prop in public(eager)}
+    assert lazy.__dict__["name"] == "report.pdf"
+    assert getattr(lazy, "parentId", None) is None
+    assert GoogleDocuments.lazy(None) == []
+
+def test_missing_field_suggestion():
+    """
+    Test that a misspelled field suggests the closest Google document field and missing fields still behave like missing attributes.
+    """
+    documents = [GoogleDocuments.lazy(DOCUMENTS)[0], GoogleDocuments.table(DOCUMENTS)[0]]
+    for document in documents:
+        with pytest.raises(AttributeError, match="has no attribute 'mimetype', did you mean 'mimeType'"):
+            document.mimetype
+        assert getattr(document, "unrelated", None) is None and not hasattr(document, "_private")
+    assert str(pytest.raises(AttributeError, getattr, documents[0], "parentId").value).endswith("has no attribute 'parentId'")
+    assert pickle.loads(pickle.dumps(documents[0])).name == "report.pdf"
+
+def test_lazy_documents_equality_and_repr():
+    """
+    Test that lazy documents are compared and represented by their data.
+    """
+    first, second = GoogleDocuments.lazy(DOCUMENTS[:2])
+    assert first != second
+    assert first == GoogleDocuments.lazy([dict(DOCUMENTS[0])])[0] == GoogleDocuments(DOCUMENTS[:1])[0]
+    assert repr(first) == "LazyGoogleDocument({!r})".format(DOCUMENTS[0])
+
+def test_dataframe_export():
+    """
+    Test the conversion into a pandas DataFrame.
+    """
+    pandas = pytest.importorskip("pandas")
+    frame = to_dataframe(DOCUMENTS)
+    assert list(frame["id"]) == ["1", "2", "3"]
+    assert pandas.api.types.is_datetime64_any_dtype(frame["lastEditedUtc"])
+    assert frame["lastEditedUtc"][0] == pandas.Timestamp(1693900000000, unit="ms", tz="UTC")
+    assert frame["sizeBytes"].dtype == "Int64"
+    assert frame["sizeBytes"].isna().tolist() == [False, True, False]
+    assert frame["mimeType"].dtype == "category"
+    assert list(to_dataframe(DOCUMENTS, fields=["id", "name"]).columns) == ["id", "name"]
+    assert len(to_dataframe(None)) == 0
+
+def test_arrow_export():
+    """
+    Test the conversion into an Arrow table.
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+    table = to_arrow(DOCUMENTS)
+    assert table.num_rows == 3
+    assert table.schema.field("lastEditedUtc").type == pyarrow.timestamp("ms", tz="UTC")
+    assert table.schema.field("sizeBytes").type == pyarrow.int64()
+    assert pyarrow.types.is_dictionary(table.schema.field("mimeType").type)
+    assert table.column("sizeBytes").null_count == 1
+
+def test_document_fields():
+    """
+    Test the declaration of the document field projection.
+    """
+    assert document_fields("id", "name", "id") == ["id", "name"]
+    with pytest.warns(UserWarning, match="did you mean 'mimeType'"):
+        assert document_fields("mimetype") == ["mimetype"]
+    with pytest.raises(ValueError):
+        document_fields()
+
+def test_chunk_accumulator():
+    """
+    Test that chunks are reassembled in order and acknowledged.
+    """
+    chunks = [
+        {"selection_id": "a", "sequence": sequence, "total": 3, "final": sequence == 2, "documents": DOCUMENTS[sequence:sequence + 1]}
+        for sequence in range(3)
+    ]
+    accumulator = DocumentChunkAccumulator(max_pending=1)
+    assert accumulator.add(chunks[1]) is None
+    assert accumulator.add(chunks[0]) is None
+    assert accumulator.pending == ["a"]
+    assert accumulator.add(chunks[2]) == DOCUMENTS
+    assert accumulator.pending == []
+    assert DocumentChunkAccumulator.ack(chunks[2]) == {"selection_id": "a", "sequence": 2}
+
+    accumulator.add(chunks[0])
+    accumulator.add(dict(chunks[0], selection_id="b"))
+    assert accumulator.pending == ["b"]
+
+def test_document_selection():
+    """
+    Test that deltas are applied to a server side selection.
+    """
+    selection = DocumentSelection(DOCUMENTS[:2])
+    assert selection.ids == ["1", "2"]
+    selection.apply_delta(added=DOCUMENTS[2:], removed=DOCUMENTS[:1])
+    assert selection.ids == ["2", "3"]
+    assert "1" not in selection and "3" in selection
+    assert len(selection.apply_delta(None, None)) == 2
+    assert [doc["name"] for doc in selection] == ["notes", "invoice.pdf"]
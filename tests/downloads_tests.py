@@ -0,0 +1,104 @@
+import http.client
+import os
+import pytest
+from dash_google_picker.Documents import GoogleDocuments
+from dash_google_picker.Downloads import Downloader, download_documents
+from dash_google_picker._http import HTTPError
+from tests.fake_google.drive_server import ACCESS_TOKEN, FakeDriveServer, FakeFile
+
+def _files(count, size=1000):
+    return [FakeFile("file-{}".format(index), os.urandom(size), name="File {}.bin".format(index)) for index in range(count)]
+
+def test_download_concurrently(tmp_path):
+    """
+    Test that all files are downloaded into the directory and failed requests are retried.
+    """
+    files = _files(20)
+    with FakeDriveServer(files, latency=0.01) as server:
+        server.fail("file-3", status=503, times=2)
+        documents = GoogleDocuments([{"id": file.id, "name": file.name, "mimeType": file.mime_type} for file in files] + [{"id": "missing"}])
+        results = {result.document_id: result for result in download_documents(documents, ACCESS_TOKEN, directory=str(tmp_path),
+                                                                                api_url=server.api_url, max_workers=4, backoff=0.01)}
+    assert len(results) == 21
+    for file in files:
+        assert results[file.id].ok
+        with open(results[file.id].path, "rb") as f:
+            assert f.read() == file.content
+    assert isinstance(results["missing"].error, HTTPError) and results["missing"].error.status == 404
+    assert not any(name.endswith(".part") for name in os.listdir(str(tmp_path)))
+
+def test_download_resumes(tmp_path):
+    """
+    Test that interrupted downloads are resumed with range requests.
+    """
+    file = FakeFile("large", os.urandom(100000), name="large.bin")
+    with FakeDriveServer([file]) as server:
+        server.truncate("large", after=30000)
+        [result] = Downloader(ACCESS_TOKEN, api_url=server.api_url, chunk_size=4096, backoff=0.01).download(["large"], directory=str(tmp_path))
+        ranges = [headers.get("Range") for _, _, headers in server.requests]
+    assert result.ok and result.size == 100000
+    assert ranges == [None, "bytes=30000-"]
+    with open(result.path, "rb") as f:
+        assert f.read() == file.content
+
+def test_download_retries_are_shared(tmp_path):
+    """
+    Test that failed requests and interrupted downloads use up the same retries and resumed ranges are validated.
+    """
+    file = FakeFile("data", os.urandom(10000))
+    with FakeDriveServer([file]) as server:
+        server.fail("data", status=503, times=2)
+        server.truncate("data", after=2500)
+        downloader = Downloader(ACCESS_TOKEN, api_url=server.api_url, retries=2, backoff=0.01)
+        [failed] = downloader.download(["data"], directory=str(tmp_path))
+        assert len(server.requests) == 3
+
+        server.truncate("data", after=2500)
+        server.misrange("data")
+        [misranged] = downloader.download(["data"], directory=str(tmp_path))
+    assert isinstance(failed.error, http.client.IncompleteRead) and not os.path.exists(failed.path)
+    assert "instead of byte 5000" in str(misranged.error)
+
+def test_download_callback_range_ignored():
+    """
+    Test that a callback receives every byte exactly once if the server sends the complete file again while bytes are still skipped.
+    """
+    file = FakeFile("data", os.urandom(3000))
+    chunks = []
+    with FakeDriveServer([file]) as server:
+        server.truncate("data", after=1000)
+        server.ignore_range("data", after=600)
+        server.ignore_range("data")
+        [result] = Downloader(ACCESS_TOKEN, api_url=server.api_url, chunk_size=100, backoff=0.01).download(
+            ["data"], callback=lambda document_id, chunk: chunks.append(chunk))
+        ranges = [headers.get("Range") for _, _, headers in server.requests]
+    assert result.ok and ranges == [None, "bytes=1000-", "bytes=600-"]
+    assert b"".join(chunks) == file.content
+
+def test_download_callback_changed_file():
+    """
+    Test that a callback does not receive the bytes of a file again if it became shorter than the part which was already received.
+    """
+    chunks = []
+    with FakeDriveServer([FakeFile("data", os.urandom(2000))]) as server:
+        downloader = Downloader(ACCESS_TOKEN, api_url=server.api_url, backoff=0.01)
+        with pytest.raises(HTTPError) as error:
+            downloader._fetch("data", chunks.append, None, 5000)
+    assert error.value.status == 416 and chunks == []
+
+def test_download_callback():
+    """
+    Test that chunks are passed to the callback and Google Workspace files are rejected.
+    """
+    file = FakeFile("data", os.urandom(10000))
+    chunks = []
+    with FakeDriveServer([file]) as server:
+        server.truncate("data", after=2500)
+        downloader = Downloader(ACCESS_TOKEN, api_url=server.api_url, chunk_size=1000, backoff=0.01)
+        results = list(downloader.download([{"id": "data"}, {"id": "doc", "mimeType": "application/vnd.google-apps.document"}],
+                                           callback=lambda document_id, chunk: chunks.append(chunk)))
+        with pytest.raises(ValueError):
+            list(downloader.download(["data"]))
+    assert b"".join(chunks) == file.content
+    [error] = [result.error for result in results if not result.ok]
+    assert "has to be exported" in str(error)
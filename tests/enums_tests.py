@@ -0,0 +1,35 @@
+import pickle
+import pytest
+from dash_google_picker.Enums import Feature, FeatureSet
+
+def test_feature_set_deduplicates_aliases():
+    """
+    Test that aliased and duplicated features are only stored once.
+    """
+    features = FeatureSet([Feature.MULTISELECT_ENABLED, Feature.daa, "multiselectEnabled", Feature.NAV_HIDDEN, "someNewFeature"])
+    assert features.enabled_features == ["multiselectEnabled", "navHidden", "someNewFeature"]
+    assert features.is_enabled(Feature.iaa)
+    assert features == FeatureSet(["someNewFeature", Feature.iaa, Feature.daa])
+    assert hash(features) == hash(FeatureSet(["someNewFeature", Feature.iaa, Feature.daa]))
+    assert pickle.loads(pickle.dumps(features)) == features
+
+def test_feature_set_disabled_wins():
+    """
+    Test that a feature which is enabled and disabled is only disabled.
+    """
+    features = FeatureSet([Feature.MINE_ONLY, Feature.SUPPORT_DRIVES, "someNewFeature"], [Feature.T_DOLLAR, "someNewFeature"])
+    assert features.enabled_features == ["sdr"]
+    assert features.disabled_features == ["mineOnly", "someNewFeature"]
+    assert not features.is_enabled(Feature.MINE_ONLY)
+    assert FeatureSet().enabled_features == [] and FeatureSet(disabled="odv").disabled_features == ["odv"]
+
+def test_feature_set_with_disabled_features():
+    """
+    Test that disabled features passed next to a FeatureSet are merged into it instead of replacing its disabled features.
+    """
+    from dash_google_picker import _normalize_features
+    props = {"enabled_features": FeatureSet([Feature.MULTISELECT_ENABLED, Feature.NAV_HIDDEN], ["odv"]), "disabled_features": [Feature.NAV_HIDDEN]}
+    _normalize_features(props)
+    assert props == {"enabled_features": ["multiselectEnabled"], "disabled_features": ["navHidden", "odv"]}
+    with pytest.raises(TypeError, match="only be passed as enabled_features"):
+        _normalize_features({"disabled_features": FeatureSet(disabled=["odv"])})
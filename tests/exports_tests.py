@@ -0,0 +1,71 @@
+import os
+from dash_google_picker.Exports import ExportCache, Exporter, export_documents
+from tests.fake_google.drive_server import ACCESS_TOKEN, FakeDriveServer, FakeFile
+
+PDF = "application/pdf"
+DOCUMENT = "application/vnd.google-apps.document"
+
+def _documents(count, last_edited=1693915200000):
+    return [{"id": "doc-{}".format(index), "name": "Doc {}".format(index), "mimeType": DOCUMENT, "lastEditedUtc": last_edited}
+            for index in range(count)]
+
+def _exports(server):
+    return [path for path, _, _ in server.requests if path.endswith("/export")]
+
+def test_exports_are_cached(tmp_path):
+    """
+    Test that every version of a file is only exported once, even if it is requested twice at the same time.
+    """
+    files = [FakeFile("doc-{}".format(index), mime_type=DOCUMENT, exports={PDF: "pdf {}".format(index).encode()}) for index in range(10)]
+    cache = ExportCache(str(tmp_path))
+    with FakeDriveServer(files, latency=0.05) as server:
+        exporter = Exporter(ACCESS_TOKEN, cache, api_url=server.api_url, max_workers=8)
+        results = list(exporter.export(_documents(10) + _documents(1)))
+        assert len(_exports(server)) == 10
+        assert all(result.ok and result.mime_type == PDF for result in results)
+        assert sorted(result.read() for result in results)[:2] == [b"pdf 0", b"pdf 0"]
+
+        assert all(result.cached for result in exporter.export(_documents(10)))
+        assert len(_exports(server)) == 10
+        list(exporter.export(_documents(2, last_edited=1693915300000)))
+        assert len(_exports(server)) == 12
+
+    # The cache is kept on disk
+    assert len(ExportCache(str(tmp_path))) == 12
+
+def test_export_cache_eviction(tmp_path):
+    """
+    Test that the least recently used exports are removed once the cache is full.
+    """
+    cache = ExportCache(str(tmp_path), max_bytes=250)
+    for index in range(3):
+        cache.put(("doc-{}".format(index), 1, PDF), b"x" * 100)
+    assert ("doc-0", 1, PDF) not in cache and len(cache) == 2 and cache.size == 200
+    assert cache.get(("doc-1", 1, PDF)) is not None
+    cache.put(("doc-3", 1, PDF), b"x" * 100)
+    assert ("doc-1", 1, PDF) in cache and ("doc-2", 1, PDF) not in cache
+    assert sorted(os.listdir(str(tmp_path))) == sorted(cache.filename(("doc-{}".format(index), 1, PDF)) for index in (1, 3))
+
+def test_export_errors(tmp_path):
+    """
+    Test that files which can not be exported are reported in the results.
+    """
+    with FakeDriveServer([FakeFile("doc-0", mime_type=DOCUMENT)]) as server:
+        results = {result.document_id: result for result in export_documents(
+            _documents(1) + [{"id": "binary", "mimeType": "application/pdf"}], ACCESS_TOKEN, ExportCache(str(tmp_path)), api_url=server.api_url)}
+    assert results["doc-0"].error.status == 400
+    assert "can be downloaded instead" in str(results["binary"].error)
+
+def test_cached_exports_check_access(tmp_path):
+    """
+    Test that a cached export is not returned to a user who can not read the file.
+    """
+    file = FakeFile("doc-0", mime_type=DOCUMENT, exports={PDF: b"secret"}, readers=[ACCESS_TOKEN, "other-reader"])
+    cache = ExportCache(str(tmp_path))
+    with FakeDriveServer([file, FakeFile("other", readers=["other-token"])]) as server:
+        [owner] = export_documents(_documents(1), ACCESS_TOKEN, cache, api_url=server.api_url)
+        [other] = export_documents(_documents(1), "other-token", cache, api_url=server.api_url)
+        [reader] = export_documents(_documents(1), "other-reader", cache, api_url=server.api_url)
+    assert owner.ok and not owner.cached
+    assert other.error.status == 404 and other.path is None
+    assert reader.cached and reader.read() == b"secret"
@@ -0,0 +1,151 @@
+/**
+ * Stand-in for https://apis.google.com/js/api.js with the parts of the Google Picker API used by the GooglePicker.
+ *
+ * The picker has no user interface, once it is visible it reports `loaded` and immediately picks
+ * `window.fakeGoogleDocumentCount` documents, one by default.
+ * The time of every step from `performance.now()` is recorded once in `window.fakeGoogleTimings`.
+ */
+(function ()
+{
+    var timings = window.fakeGoogleTimings = window.fakeGoogleTimings || {};
+
+    function mark(name)
+    {
+        if (!(name in timings))
+        {
+            timings[name] = window.performance.now();
+        }
+    }
+
+    function fakeDocuments(count)
+    {
+        var documents = [];
+        for (var index = 0; index < count; index++)
+        {
+            documents.push({
+                id: 'fake-document-' + index,
+                serviceId: 'docs',
+                mimeType: 'application/pdf',
+                name: 'Document ' + index + '.pdf',
+                description: '',
+                type: 'file',
+                lastEditedUtc: 1693900000000 + index,
+                iconUrl: 'https://drive-thirdparty.googleusercontent.com/16/type/application/pdf',
+                url: 'https://drive.google.com/file/d/fake-document-' + index + '/view?usp=drive_web',
+                embedUrl: 'https://drive.google.com/file/d/fake-document-' + index + '/preview?usp=drive_web',
+                sizeBytes: 1024 * index,
+                parentId: 'fake-folder',
+                isShared: false
+            });
+        }
+        return documents;
+    }
+
+    function Picker(callback)
+    {
+        this.callback = callback;
+    }
+
+    Picker.prototype.setVisible = function (visible)
+    {
+        var callback = this.callback;
+        if (!visible || !callback)
+        {
+            return;
+        }
+        mark('picker_visible');
+        setTimeout(function ()
+        {
+            callback({ action: 'loaded' });
+            setTimeout(function ()
+            {
+                mark('picked');
+                callback({ action: 'picked', docs: fakeDocuments(window.fakeGoogleDocumentCount || 1) });
+            }, 0);
+        }, 0);
+    };
+
+    Picker.prototype.dispose = function ()
+    {
+        this.callback = null;
+    };
+
+    function PickerBuilder()
+    {
+        this.callback = null;
+    }
+
+    ['setOAuthToken', 'setDeveloperKey', 'addView', 'addViewGroup', 'enableFeature', 'disableFeature', 'setLocale', 'setOrigin'].forEach(function (method)
+    {
+        PickerBuilder.prototype[method] = function ()
+        {
+            return this;
+        };
+    });
+
+    PickerBuilder.prototype.setCallback = function (callback)
+    {
+        this.callback = callback;
+        return this;
+    };
+
+    PickerBuilder.prototype.build = function ()
+    {
+        return new Picker(this.callback);
+    };
+
+    function View(viewId)
+    {
+        this.viewId = viewId;
+    }
+
+    View.prototype.setMimeTypes = function (mimeTypes)
+    {
+        this.mimeTypes = mimeTypes;
+        return this;
+    };
+
+    View.prototype.setQuery = function (query)
+    {
+        this.query = query;
+        return this;
+    };
+
+    function ViewGroup(view)
+    {
+        this.views = [view];
+    }
+
+    ViewGroup.prototype.addView = function (view)
+    {
+        this.views.push(view);
+        return this;
+    };
+
+    ViewGroup.prototype.addLabel = function (label)
+    {
+        this.label = label;
+        return this;
+    };
+
+    window.google = window.google || {};
+    window.google.picker = {
+        PickerBuilder: PickerBuilder,
+        View: View,
+        ViewGroup: ViewGroup,
+        Action: { CANCEL: 'cancel', LOADED: 'loaded', PICKED: 'picked' },
+        Response: { ACTION: 'action', DOCUMENTS: 'docs' }
+    };
+
+    window.gapi = {
+        load: function (name, options)
+        {
+            mark('gapi_load');
+            setTimeout(function ()
+            {
+                mark('api_loaded');
+                (options.callback || options)();
+            }, 0);
+        }
+    };
+})();
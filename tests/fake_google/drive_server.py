@@ -0,0 +1,233 @@
+"""
+Local stand-in for the parts of the Google Drive API used by dash_google_picker, so downloads can be tested without network access.
+
+Files are served under `/drive/v3/files/{id}?alt=media` with support for `Range` requests, exports of Google Workspace files
+under `/drive/v3/files/{id}/export?mimeType=...`, their metadata under `/drive/v3/files/{id}` and the contents of folders under
+`/drive/v3/files?q='{id}' in parents` in pages. Every file can only be read with the access tokens of its readers. Failures can be injected per file,
+either as error responses, as connections which are dropped after a part of the body was sent or as range requests answered from the start.
+"""
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .server import BackgroundServer
+
+ACCESS_TOKEN = "fake-access-token"
+"""
+The access token which can read all files by default.
+"""
+
+class FakeFile:
+    """
+    A file of the fake Drive.
+
+    :param file_id: The id of the file.
+    :param content: The content of the file.
+    :param name: The name of the file.
+    :param mime_type: The mimeType of the file.
+    :param parents: The ids of the parent folders.
+    :param modified_time: The RFC 3339 time of the last modification.
+    :param exports: The content of the file exported to a mimeType.
+    :param shortcut_target: The id of the file a shortcut points to.
+    :param readers: The access tokens which can read the file.
+    """
+    def __init__(self, file_id: str, content: bytes = b"", name: Optional[str] = None, mime_type: str = "application/octet-stream",
+                 parents: Iterable[str] = (), modified_time: str = "2023-09-05T12:00:00.000Z", exports: Optional[Dict[str, bytes]] = None,
+                 shortcut_target: Optional[str] = None, readers: Iterable[str] = (ACCESS_TOKEN,)):
+        self.id = file_id
+        self.content = content
+        self.name = name or file_id
+        self.mime_type = mime_type
+        self.parents = list(parents)
+        self.modified_time = modified_time
+        self.exports = exports or {}
+        self.shortcut_target = shortcut_target
+        self.readers = frozenset(readers)
+
+class _FakeDriveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, query, dict(self.headers)))
+        time.sleep(self.server.latency)
+        token = self.headers.get("Authorization", "").replace("Bearer ", "", 1)
+        if token != ACCESS_TOKEN and not any(token in file.readers for file in self.server.files.values()):
+            self.send_body(401, b'{"error": "unauthorized"}', "application/json")
+            return
+        if url.path == "/drive/v3/files":
+            self.send_list(query, token)
+            return
+        match = re.match(r"^/drive/v3/files/([^/]+)(/export)?$", url.path)
+        # Like Drive, files without access are not found
+        if not match or unquote(match.group(1)) not in self.server.files or token not in self.server.files[unquote(match.group(1))].readers:
+            self.send_body(404, b'{"error": "not found"}', "application/json")
+            return
+        file = self.server.files[unquote(match.group(1))]
+        failure = self.server.take_failure(file.id)
+        if failure and failure[0] == "status":
+            self.send_body(failure[1], b'{"error": "injected"}', "application/json", {"Retry-After": "0"})
+            return
+        if match.group(2):
+            self.send_export(file, query.get("mimeType"))
+        elif query.get("alt") == "media":
+            self.send_media(file, failure)
+        else:
+            fields = set(re.findall(r"\w+", query.get("fields", "id")))
+            resource = {name: value for name, value in self.resource(file).items() if name in fields}
+            self.send_body(200, json.dumps(resource).encode(), "application/json")
+
+    def send_list(self, query: Dict[str, str], token: str):
+        match = re.match(r"^'([^']+)' in parents", query.get("q", ""))
+        if not match:
+            self.send_body(400, b'{"error": "only listing the children of a folder is supported"}', "application/json")
+            return
+        failure = self.server.take_failure(match.group(1))
+        if failure:
+            self.send_body(failure[1], b'{"error": "injected"}', "application/json", {"Retry-After": "0"})
+            return
+        children = [file for file in self.server.files.values() if match.group(1) in file.parents and token in file.readers]
+        start = int(query.get("pageToken", 0))
+        end = start + int(query.get("pageSize", 100))
+        page = {"files": [self.resource(file) for file in children[start:end]]}
+        if end < len(children):
+            page["nextPageToken"] = str(end)
+        self.send_body(200, json.dumps(page).encode(), "application/json")
+
+    def resource(self, file: FakeFile) -> Dict:
+        resource = {"id": file.id, "name": file.name, "mimeType": file.mime_type, "parents": file.parents,
+                    "modifiedTime": file.modified_time, "size": str(len(file.content))}
+        if file.shortcut_target:
+            target = self.server.files.get(file.shortcut_target)
+            resource["shortcutDetails"] = {"targetId": file.shortcut_target, "targetMimeType": target.mime_type if target else None}
+        return resource
+
+    def send_export(self, file: FakeFile, mime_type: Optional[str]):
+        if mime_type not in file.exports:
+            self.send_body(400, b'{"error": "export not supported"}', "application/json")
+            return
+        self.send_body(200, file.exports[mime_type], mime_type)
+
+    def send_media(self, file: FakeFile, failure: Optional[Tuple[str, Optional[int]]]):
+        kind, truncate_after = failure or (None, None)
+        content = file.content
+        status = 200
+        headers = {}
+        match = re.match(r"^bytes=(\d+)-$", self.headers.get("Range", ""))
+        if match and kind != "ignore_range":
+            start = int(match.group(1))
+            if start >= len(content):
+                self.send_body(416, b"", "text/plain", {"Content-Range": "bytes */{}".format(len(content))})
+                return
+            status = 206
+            if kind == "misrange":
+                start = 0
+            headers["Content-Range"] = "bytes {}-{}/{}".format(start, len(content) - 1, len(content))
+            content = content[start:]
+        if truncate_after is None:
+            self.send_body(status, content, file.mime_type, headers)
+            return
+        # Announce the complete body but drop the connection after a part of it
+        self.send_response(status)
+        self.send_header("Content-Type", file.mime_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content[:truncate_after])
+        self.wfile.flush()
+        self.close_connection = True
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeDriveServer(BackgroundServer):
+    """
+    Serves fake Drive files in a background thread, can be used as context manager.
+
+    :param files: The files of the fake Drive.
+    :param latency: The delay of every response in seconds.
+    """
+    def __init__(self, files: Iterable[FakeFile] = (), latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(_FakeDriveHandler, host, port)
+        self.server.files = {file.id: file for file in files}
+        self.server.latency = latency
+        self.server.requests = []
+        self.server.failures = {}
+        self.server.take_failure = self._take_failure
+
+    @property
+    def api_url(self) -> str:
+        """
+        The base url of the fake Drive API, to be used instead of `https://www.googleapis.com/drive/v3`.
+        """
+        return self.base_url + "/drive/v3"
+
+    @property
+    def requests(self) -> List:
+        """
+        The path, query and headers of every received request.
+        """
+        return self.server.requests
+
+    def add(self, file: FakeFile):
+        """
+        Adds a file to the fake Drive.
+        """
+        self.server.files[file.id] = file
+
+    def fail(self, file_id: str, status: int = 503, times: int = 1):
+        """
+        Answers the next requests of a file or the next listings of a folder with an error status.
+
+        :param file_id: The id of the file or folder.
+        :param status: The status of the error responses.
+        :param times: How many requests fail.
+        """
+        self.server.failures.setdefault(file_id, []).extend([("status", status)] * times)
+
+    def truncate(self, file_id: str, after: int, times: int = 1):
+        """
+        Drops the connection of the next downloads of a file after a part of the body was sent.
+
+        :param file_id: The id of the file.
+        :param after: How many bytes of the body are sent.
+        :param times: How many downloads are dropped.
+        """
+        self.server.failures.setdefault(file_id, []).extend([("truncate", after)] * times)
+
+    def misrange(self, file_id: str, times: int = 1):
+        """
+        Answers the next range requests of a file with the file from its start, but still with a partial content status.
+
+        :param file_id: The id of the file.
+        :param times: How many range requests are answered from the start.
+        """
+        self.server.failures.setdefault(file_id, []).extend([("misrange", None)] * times)
+
+    def ignore_range(self, file_id: str, after: Optional[int] = None, times: int = 1):
+        """
+        Answers the next downloads of a file with the complete file and status 200, even if a range was requested.
+
+        :param file_id: The id of the file.
+        :param after: If set, the connection is dropped after this many bytes of the body.
+        :param times: How many downloads ignore the range.
+        """
+        self.server.failures.setdefault(file_id, []).extend([("ignore_range", after)] * times)
+
+    def _take_failure(self, file_id: str):
+        failures = self.server.failures.get(file_id)
+        return failures.pop(0) if failures else None
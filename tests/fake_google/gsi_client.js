@@ -0,0 +1,45 @@
+/**
+ * Stand-in for https://accounts.google.com/gsi/client which grants a fake access token without any prompt.
+ *
+ * The time of every step from `performance.now()` is recorded once in `window.fakeGoogleTimings`.
+ */
+(function ()
+{
+    var timings = window.fakeGoogleTimings = window.fakeGoogleTimings || {};
+
+    function mark(name)
+    {
+        if (!(name in timings))
+        {
+            timings[name] = window.performance.now();
+        }
+    }
+
+    function TokenClient(config)
+    {
+        this.callback = config.callback;
+        this.scope = config.scope;
+    }
+
+    TokenClient.prototype.requestAccessToken = function ()
+    {
+        var client = this;
+        mark('token_requested');
+        setTimeout(function ()
+        {
+            mark('token_received');
+            client.callback({ access_token: 'fake-access-token', expires_in: 3599, scope: client.scope, token_type: 'Bearer' });
+        }, 0);
+    };
+
+    window.google = window.google || {};
+    window.google.accounts = {
+        oauth2: {
+            initTokenClient: function (config)
+            {
+                mark('gsi_init');
+                return new TokenClient(config);
+            }
+        }
+    };
+})();
@@ -0,0 +1,135 @@
+"""
+Local HTTP server for the stand-ins of the Google scripts, so the GooglePicker can be tested and benchmarked without network access or a Google login.
+
+The scripts are served under the same paths as by Google, `/js/api.js` and `/gsi/client`, so the server can be used as
+`DASH_GOOGLE_PICKER_SCRIPT_BASE` or through the `script_urls` of the GooglePicker. Every response is delayed by the configured latency,
+the fake picker picks the configured number of documents. Both can be overridden per request with the query parameters `latency` and `documents`.
+
+Usage:
+::
+    python tests/fake_google/server.py [--port 8765] [--latency 0.2] [--documents 5000]
+"""
+import argparse
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPTS = {
+    "/js/api.js": "api.js",
+    "/gsi/client": "gsi_client.js",
+}
+"""
+The served paths and the files of the stand-ins.
+"""
+
+_directory = os.path.dirname(os.path.abspath(__file__))
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+class BackgroundServer:
+    """
+    Runs an HTTP server in a background thread, can be used as context manager.
+
+    :param handler: The request handler class.
+    :param host: The host to listen on.
+    :param port: The port to listen on, a free port is chosen by default.
+    """
+    def __init__(self, handler, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        The url of the server.
+        """
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server and waits for the background thread.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class _FakeGoogleHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path not in SCRIPTS:
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+        latency = float(query.get("latency", [self.server.latency])[0])
+        documents = int(query.get("documents", [self.server.document_count])[0])
+        time.sleep(latency)
+        body = "window.fakeGoogleDocumentCount = {};\n{}".format(documents, self.server.scripts[url.path]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/javascript")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeGoogleServer(BackgroundServer):
+    """
+    Serves the stand-ins of the Google scripts in a background thread, can be used as context manager.
+
+    :param latency: The delay of every response in seconds.
+    :param document_count: The number of documents the fake picker picks.
+    :param host: The host to listen on.
+    :param port: The port to listen on, a free port is chosen by default.
+    """
+    def __init__(self, latency: float = 0.0, document_count: int = 1, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(_FakeGoogleHandler, host, port)
+        self.server.latency = latency
+        self.server.document_count = document_count
+        self.server.scripts = {}
+        for path, filename in SCRIPTS.items():
+            with open(os.path.join(_directory, filename)) as f:
+                self.server.scripts[path] = f.read()
+
+    @property
+    def script_urls(self) -> Dict[str, str]:
+        """
+        The urls of the stand-ins, to be used as `script_urls` of the GooglePicker.
+        """
+        return {"api": self.base_url + "/js/api.js", "gsi_client": self.base_url + "/gsi/client"}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--documents", type=int, default=1)
+    args = parser.parse_args()
+    server = FakeGoogleServer(args.latency, args.documents, args.host, args.port)
+    print("Serving the fake Google scripts on {}".format(server.base_url))
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
@@ -0,0 +1,27 @@
+import time
+from urllib.request import urlopen
+import dash_google_picker
+from tests.fake_google.server import FakeGoogleServer
+
+def test_fake_google_server():
+    """
+    Test that the fake server serves the stand-ins with the configured latency and number of documents.
+    """
+    with FakeGoogleServer(latency=0.05, document_count=5000) as server:
+        start = time.perf_counter()
+        api = urlopen(server.script_urls["api"]).read().decode()
+        assert time.perf_counter() - start >= 0.05
+        assert api.startswith("window.fakeGoogleDocumentCount = 5000;") and "window.gapi" in api
+        assert "initTokenClient" in urlopen(server.script_urls["gsi_client"] + "?latency=0&documents=3").read().decode()
+
+def test_script_base_override(monkeypatch):
+    """
+    Test that the environment variable redirects the scripts unless script_urls are set.
+    """
+    monkeypatch.setenv("DASH_GOOGLE_PICKER_SCRIPT_BASE", "http://127.0.0.1:8765/")
+    props = {}
+    dash_google_picker._apply_script_base(props)
+    assert props["script_urls"] == {"api": "http://127.0.0.1:8765/js/api.js", "gsi_client": "http://127.0.0.1:8765/gsi/client"}
+    props = {"script_urls": {"api": "http://localhost/api.js"}}
+    dash_google_picker._apply_script_base(props)
+    assert props["script_urls"] == {"api": "http://localhost/api.js"}
@@ -0,0 +1,49 @@
+from dash_google_picker.Documents import GoogleDocument, GoogleDocuments
+from dash_google_picker.Folders import FOLDER_MIME_TYPE, SHORTCUT_MIME_TYPE, FolderExpander, expand_folders
+from tests.fake_google.drive_server import ACCESS_TOKEN, FakeDriveServer, FakeFile
+
+def _tree():
+    """
+    A picked folder with 250 PDFs, a subfolder with a spreadsheet and a nested folder, a file in both folders and shortcuts.
+    """
+    files = [FakeFile("root", name="Root", mime_type=FOLDER_MIME_TYPE),
+             FakeFile("sub", mime_type=FOLDER_MIME_TYPE, parents=["root"]),
+             FakeFile("nested", mime_type=FOLDER_MIME_TYPE, parents=["sub"]),
+             FakeFile("sheet", mime_type="text/csv", parents=["sub"], content=b"a,b"),
+             FakeFile("deep", mime_type="text/plain", parents=["nested"], modified_time="2023-09-05T12:00:00Z"),
+             FakeFile("both", mime_type="text/plain", parents=["root", "sub"]),
+             FakeFile("shortcut-to-sheet", mime_type=SHORTCUT_MIME_TYPE, parents=["root"], shortcut_target="sheet"),
+             FakeFile("shortcut-to-root", mime_type=SHORTCUT_MIME_TYPE, parents=["nested"], shortcut_target="root"),
+             FakeFile("outside", mime_type="text/plain")]
+    files += [FakeFile("pdf-{}".format(index), mime_type="application/pdf", parents=["root"], modified_time="2023-09-05T12:00:00.500Z")
+              for index in range(250)]
+    return files
+
+def test_expand_folders():
+    """
+    Test that all files are yielded once as GoogleDocument objects, listing is paginated and shortcuts are followed without cycles.
+    """
+    with FakeDriveServer(_tree()) as server:
+        picked = GoogleDocuments([{"id": "root", "mimeType": FOLDER_MIME_TYPE}]) + [{"id": "outside", "mimeType": "text/plain"}, "picked-id"]
+        documents = list(expand_folders(picked, ACCESS_TOKEN, api_url=server.api_url, page_size=100))
+        listings = [query for path, query, _ in server.requests if path == "/drive/v3/files"]
+    ids = [document.id for document in documents]
+    assert len(ids) == len(set(ids)) == 255
+    assert set(ids) >= {"outside", "picked-id", "sheet", "deep", "both", "pdf-0", "pdf-249"}
+    assert all(type(document) is GoogleDocument for document in documents)
+    assert len(listings) == 5
+    pdf = next(document for document in documents if document.id == "pdf-0")
+    assert pdf.parentId == "root" and pdf.lastEditedUtc == 1693915200500 and pdf.sizeBytes == 0
+    assert next(document for document in documents if document.id == "deep").lastEditedUtc == 1693915200000
+
+def test_expand_folders_limits():
+    """
+    Test that the depth, the number of files and the mimeTypes are limited.
+    """
+    with FakeDriveServer(_tree()) as server:
+        expander = FolderExpander(ACCESS_TOKEN, api_url=server.api_url, page_size=100)
+        picked = [{"id": "root", "mimeType": FOLDER_MIME_TYPE}]
+        shallow = {document.id for document in expander.expand(picked, max_depth=1, mime_types=["text/plain", "text/csv"])}
+        assert shallow == {"both", "sheet"}
+        assert len(list(expander.expand(picked, max_files=10))) == 10
+        assert {document.id for document in expander.expand(picked, follow_shortcuts=False, mime_types=["text/csv"])} == {"sheet"}
@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import dash_google_picker
+
+def test_import_is_lazy():
+    """
+    Test that importing the package neither imports dash nor the submodules.
+    """
+    statement = "import sys, dash_google_picker; print(sorted(name for name in ('dash', 'dash_google_picker.Documents', 'dash_google_picker.Views') if name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", statement], stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+    assert output.strip() == "[]"
+
+def test_submodules_and_version():
+    """
+    Test that the submodules are available as attributes and the embedded version matches the package info.
+    """
+    assert dash_google_picker.Views.View is not None
+    assert dash_google_picker.Enums.FeatureSet is not None
+    with open(os.path.join(os.path.dirname(dash_google_picker.__file__), 'package-info.json')) as f:
+        assert dash_google_picker.__version__ == json.load(f)['version'] == dash_google_picker.package['version']
+
+def test_eager_import_without_module_getattr():
+    """
+    Test that the submodules are attributes right after the import on Python 3.6, which has no module level __getattr__.
+    """
+    statement = ("import sys; sys.version_info = (3, 6, 15); import dash_google_picker; "
+                 "print(sorted(set(dash_google_picker._submodules) - set(vars(dash_google_picker))))")
+    result = subprocess.run([sys.executable, "-c", statement], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if "No module named 'dash_google_picker.GooglePicker'" in result.stderr:
+        pytest.skip("The component has not been built")
+    assert result.stdout.strip() == "[]", result.stderr
@@ -0,0 +1,105 @@
+import threading
+import time
+import pytest
+from dash_google_picker.Documents import GoogleDocuments
+from dash_google_picker.Memoize import DiskCache, MemoryCache, documents_key, memoize_documents
+
+DOCUMENTS = [{"id": "a", "lastEditedUtc": 1, "name": "A"}, {"id": "b", "lastEditedUtc": 2, "name": "B"}]
+
+def test_documents_key():
+    """
+    Test that the key only depends on the ids and versions of the documents.
+    """
+    key = documents_key(DOCUMENTS)
+    assert documents_key(list(reversed(DOCUMENTS))) == key
+    assert documents_key(GoogleDocuments(DOCUMENTS)) == key
+    assert documents_key(GoogleDocuments.table(DOCUMENTS)) == key
+    assert documents_key([{"id": "a", "lastEditedUtc": 1}, {"id": "b", "lastEditedUtc": 2}]) == key
+    assert documents_key([{"id": "a", "lastEditedUtc": 1}, {"id": "b", "lastEditedUtc": 3}]) != key
+    assert documents_key(None) == documents_key([])
+    # Tables of documents without lastEditedUtc behave like dictionaries without it
+    without_versions = [{"id": "a", "name": "A"}, {"id": "b"}]
+    assert documents_key(GoogleDocuments.table(without_versions)) == documents_key(without_versions)
+
+def test_disk_cache_broken_files(tmp_path):
+    """
+    Test that results which can not be loaded are misses and removed.
+    """
+    cache = DiskCache(str(tmp_path))
+    cache.set("truncated", list(range(100)))
+    cache.set("stale", 1)
+    with open(cache._path("truncated"), "r+b") as f:
+        f.truncate(10)
+    with open(cache._path("stale"), "wb") as f:
+        f.write(b"\x80\x04\x95\x1b\x00\x00\x00\x00\x00\x00\x00\x8c\x0emissing_module\x94\x8c\x05Thing\x94\x93\x94.")
+    assert cache.get("truncated") == (False, None) and cache.get("stale") == (False, None)
+    assert len(cache) == 0
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_memoize_documents(backend, tmp_path):
+    """
+    Test that results are cached by documents and other arguments and concurrent identical calls are computed once.
+    """
+    cache = MemoryCache(max_entries=2) if backend == "memory" else DiskCache(str(tmp_path), max_entries=2)
+    calls = []
+
+    @memoize_documents(cache)
+    def callback(documents, option=None):
+        calls.append(option)
+        time.sleep(0.05)
+        return len(documents), option
+
+    threads = [threading.Thread(target=callback, args=(DOCUMENTS,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert callback(list(reversed(DOCUMENTS))) == (2, None)
+    assert callback(DOCUMENTS, option="x") == (2, "x")
+    info = callback.cache_info()
+    assert len(calls) == 2 and info.misses == 2 and info.hits + info.coalesced == 4 and info.size == 2
+
+    callback(DOCUMENTS[:1])
+    assert callback.cache_info().size == 2
+    callback.cache_clear()
+    assert callback.cache_info() == (0, 0, 0, 0)
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_memoize_shared_backend(backend, tmp_path):
+    """
+    Test that callbacks sharing a backend do not return each other's results.
+    """
+    cache = MemoryCache() if backend == "memory" else DiskCache(str(tmp_path))
+
+    @memoize_documents(cache)
+    def count(documents):
+        return len(documents)
+
+    @memoize_documents(cache)
+    def names(documents):
+        return [document["name"] for document in documents]
+
+    assert count(DOCUMENTS) == 2
+    assert names(DOCUMENTS) == ["A", "B"]
+    assert count(DOCUMENTS) == 2 and count.cache_info().hits == 1
+
+def test_memoize_ttl_and_exceptions():
+    """
+    Test that results expire and exceptions are not cached.
+    """
+    calls = []
+
+    @memoize_documents(MemoryCache(ttl=0.05), argument="documents")
+    def callback(value, documents=None):
+        calls.append(value)
+        if value is None:
+            raise ValueError("no value")
+        return value
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            callback(None, documents=DOCUMENTS)
+    assert callback(1, documents=DOCUMENTS) == callback(1, documents=DOCUMENTS) == 1
+    time.sleep(0.06)
+    callback(1, documents=DOCUMENTS)
+    assert calls == [None, None, 1, 1]
@@ -0,0 +1,90 @@
+import logging
+from dash_google_picker.Documents import GoogleDocuments
+from dash_google_picker.Metrics import TimingHistogram, InMemorySink, PrometheusSink, LoggingSink, add_sink, remove_sink, document_metrics, record, record_action
+
+def test_timing_histogram():
+    """
+    Test that timings are aggregated into buckets and percentiles per phase.
+    """
+    histogram = TimingHistogram(buckets=(10, 100, 1000))
+    for duration in range(1, 101):
+        histogram.observe({"open": duration, "build": 5})
+    histogram.observe(None)
+    assert histogram.phases() == ["build", "open"]
+    assert histogram.count("open") == 100
+    assert histogram.percentile("open", 50) == 50
+    assert histogram.percentile("open", 95) == 95
+    assert histogram.percentile("token", 95) is None
+    assert histogram.bucket_counts("open") == [(10, 10), (100, 100), (1000, 100), (float("inf"), 100)]
+    assert histogram.summary()["build"] == {"count": 100, "sum": 500, "max": 5, "p50": 5, "p95": 5}
+
+def test_timing_histogram_round_trip():
+    """
+    Test that the time an update was sent at is recorded as the way back to dash.
+    """
+    histogram = TimingHistogram(max_samples=2)
+    histogram.observe({"sent_at": 1000}, received_at=1250)
+    histogram.observe({"sent_at": 1000}, received_at=900)
+    histogram.observe({"sent_at": 1000}, received_at=1100)
+    assert histogram.count("dash_request") == 3
+    assert histogram.percentile("dash_request", 100) == 100
+
+def test_document_metrics_sinks():
+    """
+    Test that parsing documents is recorded into all sinks and nothing is recorded without sinks.
+    """
+    memory = InMemorySink()
+    prometheus = PrometheusSink(buckets={"documents_count": (1, 10)})
+    GoogleDocuments([{"id": "before"}])
+    add_sink(memory)
+    add_sink(prometheus)
+    try:
+        GoogleDocuments([{"id": str(index)} for index in range(3)])
+        GoogleDocuments.table([{"id": "a"}])
+        with document_metrics([{"id": "b"}], "custom", payload_size=2048):
+            pass
+        # The documents are found by name when they are passed as keyword
+        GoogleDocuments(documents_data=[{"id": "c"}, {"id": "d"}])
+        GoogleDocuments.lazy(documents_data=[{"id": "e"}])
+        GoogleDocuments.table(documents_data=[])
+        for action in ("loaded", "picked", "picked", "cancel", "", None, "unknown"):
+            record_action(action)
+    finally:
+        remove_sink(memory)
+        remove_sink(prometheus)
+    GoogleDocuments([{"id": "after"}])
+    record_action("picked")
+
+    assert memory.get("documents_count") == {"count": 6, "sum": 8, "max": 3}
+    assert memory.get("documents_count", representation="objects")["sum"] == 5
+    assert memory.get("documents_count", representation="lazy")["sum"] == 1
+    assert memory.get("documents_parse_seconds", representation="table")["count"] == 2
+    assert memory.get("documents_payload_bytes", representation="custom")["sum"] == 2048
+    assert memory.get("documents_payload_bytes", representation="table")["sum"] == len('[{"id":"a"}]') + len('[]')
+    assert memory.get("picker_actions_total")["sum"] == 5
+    assert memory.get("picker_actions_total", action="picked")["sum"] == 2
+    assert memory.get("picker_actions_total", action="other")["sum"] == 1
+
+    exposition = prometheus.exposition()
+    assert '# TYPE dash_google_picker_documents_count histogram' in exposition
+    assert 'dash_google_picker_documents_count_bucket{representation="objects",le="10"} 2' in exposition
+    assert 'dash_google_picker_documents_count_bucket{representation="objects",le="+Inf"} 2' in exposition
+    assert 'dash_google_picker_documents_count_count{representation="objects"} 2' in exposition
+    assert '# TYPE dash_google_picker_picker_actions_total counter' in exposition
+    assert 'dash_google_picker_picker_actions_total{action="picked"} 2' in exposition
+    assert 'dash_google_picker_picker_actions_total{action="cancel"} 1' in exposition
+
+def test_logging_sink(caplog):
+    """
+    Test that the logging sink logs every recorded value.
+    """
+    sink = LoggingSink()
+    add_sink(sink)
+    try:
+        with caplog.at_level(logging.INFO, logger="dash_google_picker.metrics"):
+            record("documents_count", 1, {"representation": "objects"})
+            record_action("loaded")
+    finally:
+        remove_sink(sink)
+    assert "documents_count 1 {'representation': 'objects'}" in caplog.text
+    assert "picker_actions_total 1 {'action': 'loaded'}" in caplog.text
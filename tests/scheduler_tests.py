@@ -0,0 +1,84 @@
+import threading
+import time
+from dash_google_picker.Downloads import Downloader
+from dash_google_picker.Scheduler import PROJECT, USER, RequestScheduler
+from tests.fake_google.drive_server import ACCESS_TOKEN, FakeDriveServer, FakeFile
+
+def test_token_buckets():
+    """
+    Test that requests wait for the bucket of the access token and of the project.
+    """
+    scheduler = RequestScheduler(user_rate=100, user_burst=5, project_rate=1000, project_burst=1000)
+    start = time.perf_counter()
+    for _ in range(15):
+        scheduler.acquire("a")
+    assert time.perf_counter() - start >= 0.09
+    start = time.perf_counter()
+    for _ in range(5):
+        scheduler.acquire("b")
+    assert time.perf_counter() - start < 0.05
+
+    project = RequestScheduler(user_rate=1000, user_burst=1000, project_rate=100, project_burst=5)
+    start = time.perf_counter()
+    for index in range(15):
+        project.acquire(str(index))
+    assert time.perf_counter() - start >= 0.09
+
+def test_shared_state(tmp_path):
+    """
+    Test that schedulers with the same state file share their buckets.
+    """
+    state_file = str(tmp_path / "state.json")
+    first = RequestScheduler(user_rate=100, user_burst=5, state_file=state_file)
+    second = RequestScheduler(user_rate=100, user_burst=5, state_file=state_file)
+    for _ in range(5):
+        first.acquire("secret-token")
+    start = time.perf_counter()
+    for _ in range(5):
+        second.acquire("secret-token")
+    assert time.perf_counter() - start >= 0.04
+    assert "secret-token" not in open(state_file).read()
+
+def test_throttle_and_coalesce():
+    """
+    Test that rate limited responses halve the rate and duplicate downloads share one request.
+    """
+    scheduler = RequestScheduler(user_rate=100, recovery=1000)
+    with FakeDriveServer([FakeFile("file", b"content")], latency=0.05) as server:
+        server.fail("file", status=429)
+        downloader = Downloader(ACCESS_TOKEN, api_url=server.api_url, scheduler=scheduler, backoff=0.01)
+        chunks = []
+        results = list(downloader.download(["file", "file", "file"], callback=lambda document_id, chunk: chunks.append(chunk)))
+        assert len(server.requests) == 2
+    assert [result.size for result in results] == [7, 7, 7] and chunks == [b"content"]
+    assert 49 < scheduler.rate(ACCESS_TOKEN, USER) < 51 and scheduler.rate(ACCESS_TOKEN, PROJECT) == 200
+
+    calls = []
+    barrier = threading.Barrier(4)
+    def call():
+        barrier.wait()
+        return scheduler.coalesce("key", lambda: calls.append(time.sleep(0.05)) or len(calls))
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+def test_coalesce_per_access_token(tmp_path):
+    """
+    Test that concurrent downloads of the same file with different access tokens are not shared.
+    """
+    scheduler = RequestScheduler()
+    files = [FakeFile("file", b"content"), FakeFile("other", readers=["other-token"])]
+    results = {}
+    with FakeDriveServer(files, latency=0.1) as server:
+        def download(token):
+            [results[token]] = Downloader(token, api_url=server.api_url, scheduler=scheduler).download(["file"], directory=str(tmp_path))
+        threads = [threading.Thread(target=download, args=(token,)) for token in (ACCESS_TOKEN, "other-token")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert results[ACCESS_TOKEN].ok and results[ACCESS_TOKEN].size == 7
+    assert results["other-token"].error.status == 404
@@ -0,0 +1,71 @@
+import json
+import pickle
+import pytest
+from dash_google_picker.Enums import ViewId, Feature
+from dash_google_picker.Validation import PickerConfigurationWarning, validate_features, validate_picker_props
+from dash_google_picker.Views import View, ViewGroup, FrozenView, FrozenViewGroup
+
+def test_frozen_views_are_interned():
+    """
+    Test that identical frozen views and view groups are the same object.
+    """
+    assert FrozenView(ViewId.PDFS, "application/pdf") is FrozenView("pdfs", ["application/pdf"])
+    group = FrozenViewGroup(ViewId.DOCS, FrozenView(ViewId.PDFS, "application/pdf"), label="Files")
+    assert group is ViewGroup(ViewId.DOCS, View(ViewId.PDFS, "application/pdf"), label="Files").freeze()
+    assert group.views[1] is FrozenView(ViewId.PDFS, "application/pdf")
+    assert pickle.loads(pickle.dumps(group)) is group
+    assert len({group, FrozenViewGroup("all", FrozenView("pdfs", ("application/pdf",)), label="Files")}) == 1
+
+def test_frozen_views_are_immutable():
+    """
+    Test that frozen views can not be modified.
+    """
+    with pytest.raises(AttributeError):
+        FrozenView(ViewId.DOCS).query = "report"
+    with pytest.raises(ValueError):
+        FrozenViewGroup(FrozenViewGroup(ViewId.DOCS))
+
+def test_frozen_view_serialization():
+    """
+    Test that the serialized json is cached, nested and contains a stable structural hash.
+    """
+    view = FrozenView(ViewId.PDFS, "application/pdf", "report")
+    group = FrozenViewGroup(ViewId.DOCS, view, label="Files")
+    data = group.to_plotly_json()
+    assert data is group.to_plotly_json()
+    assert data["views"] == ["all", view.to_plotly_json()]
+    assert data["views"][1]["mimeTypes"] == ["application/pdf"]
+    assert data["hash"] == group.structural_hash
+    assert FrozenViewGroup(ViewId.DOCS, label="Files").structural_hash != group.structural_hash
+    # The hash only depends on the structure, not on the process
+    assert view.structural_hash == "517fbfd9b3556b9f"
+    json.dumps(data)
+
+def test_view_validation():
+    """
+    Test that invalid views raise an error and deprecated views emit a warning.
+    """
+    with pytest.raises(ValueError):
+        View("pdf")
+    with pytest.raises(ValueError):
+        View(ViewId.PDFS, "pdf")
+    with pytest.raises(ValueError):
+        ViewGroup(ViewId.DOCS, "unknown")
+    with pytest.raises(ValueError):
+        FrozenView("unknown")
+    with pytest.warns(PickerConfigurationWarning):
+        View(ViewId.YOUTUBE)
+    with pytest.warns(PickerConfigurationWarning):
+        ViewGroup(ViewId.DOCS).add(ViewId.MAPS)
+    assert View(ViewId.DOCS_IMAGES, ["image/*", "image/svg+xml"]).mimeTypes == ["image/*", "image/svg+xml"]
+
+def test_feature_validation():
+    """
+    Test that broken features can not be enabled and deprecated features emit a warning.
+    """
+    with pytest.raises(ValueError):
+        validate_features([Feature.NAV_HIDDEN, Feature.G_DOLLAR])
+    with pytest.warns(PickerConfigurationWarning):
+        validate_picker_props({"enabled_features": Feature.V_DOLLAR})
+    assert validate_features([Feature.G_DOLLAR], enabled=False) == [Feature.G_DOLLAR]
+    assert validate_features(["someNewFeature"]) == ["someNewFeature"]